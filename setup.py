@@ -55,7 +55,10 @@ setup(
     author_email='support@threatconnect.com',
     description='ThreatConnect Exchange App Framework',
     download_url='https://github.com/ThreatConnect-Inc/tcex/tarball/{}'.format(version),
-    extras_require={'development': ['deepdiff', 'jmespath', 'mako', 'pytest', 'pytest-cov']},
+    extras_require={
+        'async': ['aiohttp>=3.5'],
+        'development': ['deepdiff', 'jmespath', 'mako', 'pytest', 'pytest-cov'],
+    },
     include_package_data=True,
     install_requires=install_requires,
     license='Apache License, Version 2',
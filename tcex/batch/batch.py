@@ -2,13 +2,17 @@
 """ThreatConnect Batch Import Module."""
 import hashlib
 import json
-import math
 import os
 import re
-import shelve
 import time
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
+from .batch_poll import BatchPoller, HeuristicPollStrategy
+from .batch_writer import BatchWriter
+from .content_index import ContentIndex
+from .spill_store import open_store, remove_store, SpillStore
 from .indicator import (
     custom_indicator_class_factory,
     Indicator,
@@ -67,15 +71,24 @@ class Batch(object):
         self._action = action or 'Create'
         self._attribute_write_type = attribute_write_type or 'Replace'
         self._batch_max_chunk = 5000
+        self._batch_max_size = 100 * 1024 * 1024
+        self._batch_writer = None
+        self._content_hashes = {}  # content hashes for submitted batch jobs by batch id
+        self._content_index = None
         self._halt_on_error = halt_on_error
         self._hash_collision_mode = None
         self._file_merge_mode = None
+        self._file_max_workers = 4
+        self._file_retries = 2
+        self._file_retry_back_off = 1
+        self._max_in_flight = 1
         self._owner = owner
         self._playbook_triggers_enabled = playbook_triggers_enabled
 
         # shelf settings
         self._group_shelf_fqfn = None
         self._indicator_shelf_fqfn = None
+        self._spill_backend = 'log'
 
         # global overrides on batch/file errors
         self._halt_on_batch_error = None
@@ -90,20 +103,95 @@ class Batch(object):
 
         # default properties
         self._batch_data_count = None
-        self._poll_interval = None
-        self._poll_interval_times = []
+        self._poll_strategy = HeuristicPollStrategy()
+        self._poller = None
         self._poll_timeout = 3600
 
         # containers
+        self._chunk_files = {}  # file data for the groups in the last submitted chunk
         self._files = {}
         self._groups = None
         self._groups_shelf = None
         self._indicators = None
         self._indicators_shelf = None
+        self._spilled_files = {}  # file data for groups saved to a JSON spill store
 
         # build custom indicator classes
         self._gen_indicator_class()
 
+    def _bulk_indicator_data(self, row):
+        """Return batch indicator data for a bulk indicator row.
+
+        Args:
+            row (dict): The indicator row (see :py:meth:`add_indicators_bulk`).
+
+        Returns:
+            dict: The indicator data in batch format.
+        """
+        indicator_data = {}
+        for key, value in row.items():
+            if value is None:
+                continue
+            if key == 'attributes':
+                attributes = [a for a in value if a.get('value') not in [None, '']]
+                if attributes:
+                    indicator_data['attribute'] = attributes
+            elif key == 'confidence':
+                indicator_data['confidence'] = int(value)
+            elif key == 'rating':
+                indicator_data['rating'] = float(value)
+            elif key == 'tags':
+                tags = [{'name': t} for t in value if t]
+                if tags:
+                    indicator_data['tag'] = tags
+            else:
+                indicator_data[key] = value
+
+        if indicator_data.get('xid') is None:
+            indicator_data['xid'] = str(uuid.uuid4())
+        if indicator_data.get('type') not in ['Address', 'EmailAddress', 'File', 'Host', 'URL']:
+            # for custom indicator types the valueX fields are required.
+            for index, value in enumerate(self._indicator_values(indicator_data['summary'])):
+                indicator_data['value{}'.format(index + 1)] = value
+        return indicator_data
+
+    def _bulk_rows(self, columns, valid_types, halt_on_error):
+        """Yield indicator rows from parallel column arrays validating each column once.
+
+        Args:
+            columns (dict): The column name to column array (or single value) mapping.
+            valid_types (set): The valid indicator types.
+            halt_on_error (bool): If True an invalid type will raise an error.
+        """
+        names = list(columns)
+        length = None
+        for name in names:
+            if isinstance(columns[name], (list, tuple)):
+                if length is not None and len(columns[name]) != length:
+                    self.tcex.handle_error(535, [name], True)
+                length = len(columns[name])
+        if length is None:
+            # single values only, the number of rows is unknown
+            self.tcex.handle_error(525, [', '.join(names) or 'none'], True)
+
+        # expand single values into a column
+        arrays = []
+        for name in names:
+            value = columns[name]
+            arrays.append(value if isinstance(value, (list, tuple)) else [value] * length)
+
+        # validate types once for the entire column
+        types = arrays[names.index('type')] if 'type' in names else [None]
+        invalid_types = set(types) - valid_types
+        if invalid_types:
+            self.tcex.handle_error(530, [', '.join(sorted(map(str, invalid_types)))], halt_on_error)
+
+        for values in zip(*arrays):
+            row = dict(zip(names, values))
+            if row.get('type') in invalid_types:
+                continue
+            yield row
+
     @property
     def _critical_failures(self):
         """Return Batch critical failure messages."""
@@ -191,7 +279,7 @@ class Batch(object):
         if self.groups.get(xid) is not None:
             # return existing group from memory
             group_data = self.groups.get(xid)
-        elif self.groups_shelf.get(xid) is not None:
+        elif xid in self.groups_shelf:
             # return existing group from shelf
             group_data = self.groups_shelf.get(xid)
         else:
@@ -219,7 +307,7 @@ class Batch(object):
         if self.indicators.get(xid) is not None:
             # return existing indicator from memory
             indicator_data = self.indicators.get(xid)
-        elif self.indicators_shelf.get(xid) is not None:
+        elif xid in self.indicators_shelf:
             # return existing indicator from shelf
             indicator_data = self.indicators_shelf.get(xid)
         else:
@@ -356,6 +444,68 @@ class Batch(object):
                 indicator_data['flag2'] = whois_active
         return self._indicator(indicator_data)
 
+    def add_indicators_bulk(self, indicators=None, halt_on_error=True, **columns):
+        """Add many indicators to the Batch Job without building Indicator objects.
+
+        Indicators can be provided as an iterable of dicts or as parallel column arrays. Each
+        indicator is serialized directly into the batch spill store. Indicator types are
+        validated once per column. Dict rows are checked individually (a set lookup) and an
+        invalid type is reported once. At least one column must be an array, single values are
+        repeated for each row of the column arrays.
+
+        .. code-block:: python
+
+            batch.add_indicators_bulk(
+                type='Address',
+                summary=['1.1.1.1', '1.1.1.2'],
+                rating=[5, 3],
+                confidence=[90, 50],
+                tags=[['PyTest'], []],
+                attributes=[[{'type': 'Description', 'value': 'Example'}], []],
+            )
+
+        Args:
+            indicators (iterable, optional): An iterable of indicator dicts with keys matching the
+                column names below (additional keys are passed through as batch fields).
+            halt_on_error (bool, default:True): If True an invalid type will raise an error,
+                otherwise the invalid rows are skipped.
+            type (str|list, kwargs): The indicator type column or a single type for all rows.
+            summary (list, kwargs): The indicator summary column.
+            rating (list, kwargs): The threat rating column.
+            confidence (list, kwargs): The threat confidence column.
+            tags (list, kwargs): A column of tag name lists.
+            attributes (list, kwargs): A column of attribute dict lists (type, value, displayed).
+            xid (list, kwargs): The external id column.
+
+        Returns:
+            int: The number of indicators added.
+        """
+        valid_types = set(self.tcex.indicator_types_data.keys())
+        if indicators is None:
+            indicators = self._bulk_rows(columns, valid_types, halt_on_error)
+            valid_types = None  # already validated per column
+
+        count = 0
+        invalid_types = set()
+        for row in indicators:
+            if valid_types is not None and row.get('type') not in valid_types:
+                # report each invalid type once
+                if row.get('type') not in invalid_types:
+                    invalid_types.add(row.get('type'))
+                    self.tcex.handle_error(530, [row.get('type')], halt_on_error)
+                continue
+            indicator_data = self._bulk_indicator_data(row)
+            xid = indicator_data['xid']
+            if xid in self.indicators or xid in self.indicators_shelf:
+                # indicator already in batch
+                continue
+            if isinstance(self.indicators_shelf, SpillStore):
+                self.indicators_shelf[xid] = json.dumps(indicator_data).encode('utf-8')
+            else:
+                self.indicators_shelf[xid] = indicator_data
+            count += 1
+        return count
+
     def address(self, ip, **kwargs):
         """Add Address data to Batch object.
 
@@ -459,10 +609,27 @@ class Batch(object):
                     fh.write('{}\n'.format(xid))
         else:
             # delete saved files
-            if os.path.isfile(self.group_shelf_fqfn):
-                os.remove(self.group_shelf_fqfn)
-            if os.path.isfile(self.group_shelf_fqfn):
-                os.remove(self.indicator_shelf_fqfn)
+            remove_store(self.group_shelf_fqfn)
+            remove_store(self.indicator_shelf_fqfn)
+
+    @property
+    def content_index(self):
+        """Return the content index used to skip unchanged entities (None when disabled)."""
+        return self._content_index
+
+    @content_index.setter
+    def content_index(self, content_index):
+        """Set the content index used to skip entities unchanged since the last successful submit.
+
+        Set to True to use an index file per owner in the tc_temp_path directory which submits
+        unchanged entities again after 24 hours, or provide a ContentIndex instance to control the
+        location and max age. Only applies to the Create action.
+        """
+        if content_index is True:
+            owner = re.sub(r'[^\w.-]', '_', self.owner)
+            fqfn = os.path.join(self.tcex.args.tc_temp_path, 'content-index-{}'.format(owner))
+            content_index = ContentIndex(fqfn, max_age=86400)
+        self._content_index = content_index or None
 
     @property
     def data(self):
@@ -513,11 +680,9 @@ class Batch(object):
 
         # get group data from one of the arrays
         if self.groups.get(xid) is not None:
-            group_data = self.groups.get(xid)
-            del self.groups[xid]
-        elif self.groups_shelf.get(xid) is not None:
-            group_data = self.groups_shelf.get(xid)
-            del self.groups_shelf[xid]
+            group_data = self.groups.pop(xid)
+        elif xid in self.groups_shelf:
+            group_data = self.groups_shelf.pop(xid)
 
         if group_data is not None:
             # convert any obj into dict and process file data
@@ -548,6 +713,9 @@ class Batch(object):
                     'fileName': group_data.get('fileName'),
                     'type': group_data.get('type'),
                 }
+            elif group_data.get('xid') in self._spilled_files:
+                # file data held in memory when the group was saved to the spill store
+                self._files[group_data.get('xid')] = self._spilled_files.pop(group_data.get('xid'))
         else:
             GROUPS_STRINGS_WITH_FILE_CONTENTS = ['Document', 'Report']
             # process file content
@@ -592,6 +760,37 @@ class Batch(object):
                 break
         return data, entity_count
 
+    def data_units(self):
+        """Yield all batch data as units of entities to be submitted together.
+
+        Each unit is a tuple of the entity type ("group" or "indicator") and a list of entity
+        dicts (or serialized entity JSON followed by the list of xids). A group unit contains the
+        group and all of its associated groups. The processing order is the same as
+        :py:meth:`data` and each entity is removed from memory and/or shelf as it is yielded.
+        """
+        for groups in [self.groups, self.groups_shelf]:
+            for xid in list(groups.keys()):
+                # groups may already have been processed as an association of another group
+                assoc_group_data = self.data_group_association(xid)
+                if assoc_group_data:
+                    yield 'group', assoc_group_data
+
+        for xid in list(self.indicators.keys()):
+            indicator_data = self.indicators.pop(xid)
+            if not isinstance(indicator_data, dict):
+                indicator_data = indicator_data.data
+            yield 'indicator', [indicator_data]
+
+        for xid in list(self.indicators_shelf.keys()):
+            if isinstance(self.indicators_shelf, SpillStore):
+                # already serialized JSON is passed through without decoding
+                yield 'indicator', [self.indicators_shelf.pop_raw(xid)], [xid]
+                continue
+            indicator_data = self.indicators_shelf.pop(xid)
+            if not isinstance(indicator_data, dict):
+                indicator_data = indicator_data.data
+            yield 'indicator', [indicator_data]
+
     @property
     def debug(self):
         """Return debug setting"""
@@ -655,6 +854,16 @@ class Batch(object):
         indicator_obj = EmailAddress(address, **kwargs)
         return self._indicator(indicator_obj)
 
+    @property
+    def batch_max_size(self):
+        """Return the maximum size in bytes of a single batch request."""
+        return self._batch_max_size
+
+    @batch_max_size.setter
+    def batch_max_size(self, value):
+        """Set the maximum size in bytes of a single batch request (None to disable)."""
+        self._batch_max_size = int(value) if value is not None else None
+
     @property
     def error_codes(self):
         """Static list of Batch error codes and short description"""
@@ -763,6 +972,36 @@ class Batch(object):
         """
         self._file_merge_mode = value
 
+    @property
+    def file_max_workers(self):
+        """Return the maximum number of concurrent Document/Report file uploads."""
+        return self._file_max_workers
+
+    @file_max_workers.setter
+    def file_max_workers(self, value):
+        """Set the maximum number of concurrent Document/Report file uploads."""
+        self._file_max_workers = max(int(value), 1)
+
+    @property
+    def file_retries(self):
+        """Return the number of retries for a failed file upload."""
+        return self._file_retries
+
+    @file_retries.setter
+    def file_retries(self, value):
+        """Set the number of retries for a failed file upload."""
+        self._file_retries = max(int(value), 0)
+
+    @property
+    def file_retry_back_off(self):
+        """Return the base number of seconds between file upload retries."""
+        return self._file_retry_back_off
+
+    @file_retry_back_off.setter
+    def file_retry_back_off(self, value):
+        """Set the base number of seconds between file upload retries."""
+        self._file_retry_back_off = float(value)
+
     @property
     def files(self):
         """Return dictionary containing all of the file content or callbacks."""
@@ -833,7 +1072,7 @@ class Batch(object):
     def groups_shelf(self):
         """Return dictionary of all Groups data."""
         if self._groups_shelf is None:
-            self._groups_shelf = shelve.open(self.group_shelf_fqfn, writeback=False)
+            self._groups_shelf = open_store(self.spill_backend, self.group_shelf_fqfn)
         return self._groups_shelf
 
     @property
@@ -973,7 +1212,7 @@ class Batch(object):
     def indicators_shelf(self):
         """Return dictionary of all Indicator data."""
         if self._indicators_shelf is None:
-            self._indicators_shelf = shelve.open(self.indicator_shelf_fqfn, writeback=False)
+            self._indicators_shelf = open_store(self.spill_backend, self.indicator_shelf_fqfn)
         return self._indicators_shelf
 
     def intrusion_set(self, name, **kwargs):
@@ -1041,88 +1280,80 @@ class Batch(object):
         if self.halt_on_poll_error is not None:
             halt_on_error = self.halt_on_poll_error
 
-        # initial poll interval
-        if self._poll_interval is None and self._batch_data_count is not None:
-            # calculate poll_interval base off the number of entries in the batch data
-            # with a minimum value of 5 seconds.
-            self._poll_interval = max(math.ceil(self._batch_data_count / 300), 5)
-        elif self._poll_interval is None:
-            # if not able to calculate poll_interval default to 15 seconds
-            self._poll_interval = 15
-
-        # poll retry back_off factor
-        if back_off is None:
-            poll_interval_back_off = 2.5
-        else:
-            poll_interval_back_off = float(back_off)
-
-        # poll retry seconds
-        if retry_seconds is None:
-            poll_retry_seconds = 5
-        else:
-            poll_retry_seconds = int(retry_seconds)
-
         # poll timeout
         if timeout is None:
             timeout = self.poll_timeout
         else:
             timeout = int(timeout)
-        params = {'includeAdditional': 'true'}
 
-        poll_count = 0
-        poll_time_total = 0
-        data = {}
-        while True:
-            poll_count += 1
-            poll_time_total += self._poll_interval
-            time.sleep(self._poll_interval)
-            self.tcex.log.info('Batch poll time: {} seconds'.format(poll_time_total))
-            try:
-                # retrieve job status
-                r = self.tcex.session.get('/v2/batch/{}'.format(batch_id), params=params)
-                if not r.ok or 'application/json' not in r.headers.get('content-type', ''):
-                    self.tcex.handle_error(545, [r.status_code, r.text], halt_on_error)
-                    return data
-                data = r.json()
-                if data.get('status') != 'Success':
-                    self.tcex.handle_error(545, [r.status_code, r.text], halt_on_error)
-            except Exception as e:
-                self.tcex.handle_error(540, [e], halt_on_error)
+        return self.poller.poll(
+            [batch_id],
+            batch_count=self._batch_data_count,
+            timeout=timeout,
+            halt_on_error=halt_on_error,
+            retry_seconds=retry_seconds,
+            back_off=back_off,
+        ).get(batch_id)
 
-            if data.get('data', {}).get('batchStatus', {}).get('status') == 'Completed':
-                # store last 5 poll times to use in calculating average poll time
-                modifier = poll_time_total * 0.7
-                self._poll_interval_times = self._poll_interval_times[-4:] + [modifier]
+    def poll_many(self, batch_ids, timeout=None, halt_on_error=True):
+        """Poll the status of multiple Batch jobs in a single loop.
 
-                weights = [1]
-                poll_interval_time_weighted_sum = 0
-                for poll_interval_time in self._poll_interval_times:
-                    poll_interval_time_weighted_sum += poll_interval_time * weights[-1]
-                    # weights will be [1, 1.5, 2.25, 3.375, 5.0625] for all 5 poll times depending
-                    # on how many poll times are available.
-                    weights.append(weights[-1] * 1.5)
+        Each job is polled according to the poll strategy until all jobs are completed.
 
-                # pop off the last weight so its not added in to the sum
-                weights.pop()
+        Args:
+            batch_ids (list): The IDs returned from the ThreatConnect API for the batch jobs.
+            timeout (int, optional): The number of seconds before the poll should timeout.
+            halt_on_error (bool, default:True): If True any exception will raise an error.
 
-                # calculate the weighted average of the last 5 poll times
-                self._poll_interval = math.floor(poll_interval_time_weighted_sum / sum(weights))
+        Returns:
+            dict: The batch status returned from the ThreatConnect API for each batch id.
+        """
+        # check global setting for override
+        if self.halt_on_poll_error is not None:
+            halt_on_error = self.halt_on_poll_error
 
-                if poll_count == 1:
-                    # if completed on first poll, reduce poll interval.
-                    self._poll_interval = self._poll_interval * 0.85
+        if timeout is None:
+            timeout = self.poll_timeout
+        return self.poller.poll(
+            batch_ids,
+            batch_count=self._batch_data_count,
+            timeout=int(timeout),
+            halt_on_error=halt_on_error,
+        )
 
-                self.tcex.log.debug('Batch Status: {}'.format(data))
-                return data
+    @property
+    def poll_metrics(self):
+        """Return batch poll latency metrics (count, errors, average, min, max, total)."""
+        return self.poller.metrics.data
 
-            # update poll_interval for retry with max poll time of 20 seconds
-            self._poll_interval = min(
-                poll_retry_seconds + int(poll_count * poll_interval_back_off), 20
-            )
+    @property
+    def poll_strategy(self):
+        """Return the poll strategy."""
+        return self._poll_strategy
 
-            # time out poll to prevent App running indefinitely
-            if poll_time_total >= timeout:
-                self.tcex.handle_error(550, [timeout], True)
+    @poll_strategy.setter
+    def poll_strategy(self, strategy):
+        """Set the poll strategy (an instance of tcex.batch.batch_poll.PollStrategy)."""
+        self._poll_strategy = strategy
+        if self._poller is not None:
+            self._poller.strategy = strategy
+
+    @property
+    def poller(self):
+        """Return the batch poller."""
+        if self._poller is None:
+            self._poller = BatchPoller(self.tcex, self.poll_strategy)
+        return self._poller
+
+    @property
+    def max_in_flight(self):
+        """Return the maximum number of batch jobs in flight for submit_all."""
+        return self._max_in_flight
+
+    @max_in_flight.setter
+    def max_in_flight(self, value):
+        """Set the maximum number of batch jobs in flight for submit_all."""
+        self._max_in_flight = max(int(value), 1)
 
     @property
     def poll_timeout(self):
@@ -1171,8 +1402,35 @@ class Batch(object):
         group_obj = Report(name, **kwargs)
         return self._group(group_obj)
 
+    def _spill_data(self, resource, xid):
+        """Return the JSON serializable data for a resource to be saved in a spill store.
+
+        File content (which can be a callback) can't be serialized and is held in memory until
+        the group is processed.
+
+        Args:
+            resource (dict|obj): The Group or Indicator dict or object.
+            xid (str): The xid of the resource.
+
+        Returns:
+            dict: The resource data.
+        """
+        if isinstance(resource, dict):
+            if resource.get('fileContent') is not None:
+                resource = dict(resource)
+                self._spilled_files[xid] = {
+                    'fileContent': resource.pop('fileContent'),
+                    'fileName': resource.get('fileName'),
+                    'type': resource.get('type'),
+                }
+            return resource
+
+        if resource.type in ['Document', 'Report']:
+            self._spilled_files[xid] = resource.file_data
+        return resource.data
+
     def save(self, resource):
-        """Save group|indicator dict or object to shelve.
+        """Save group|indicator dict or object to the spill store.
 
         Best effort to save group/indicator data to disk.  If for any reason the save fails
         the data will still be accessible from list in memory.
@@ -1194,7 +1452,10 @@ class Batch(object):
             if resource_type in self.tcex.group_types:
                 try:
                     # groups
-                    self.groups_shelf[xid] = resource
+                    if isinstance(self.groups_shelf, SpillStore):
+                        self.groups_shelf[xid] = self._spill_data(resource, xid)
+                    else:
+                        self.groups_shelf[xid] = resource
                 except Exception:
                     saved = False
 
@@ -1207,7 +1468,10 @@ class Batch(object):
             elif resource_type in self.tcex.indicator_types_data.keys():
                 try:
                     # indicators
-                    self.indicators_shelf[xid] = resource
+                    if isinstance(self.indicators_shelf, SpillStore):
+                        self.indicators_shelf[xid] = self._spill_data(resource, xid)
+                    else:
+                        self.indicators_shelf[xid] = resource
                 except Exception:
                     saved = False
 
@@ -1252,14 +1516,29 @@ class Batch(object):
     def saved_xids(self):
         """Return previously saved xids."""
         if self._saved_xids is None:
-            self._saved_xids = []
+            self._saved_xids = set()
             if self.debug:
                 fpfn = os.path.join(self.tcex.args.tc_temp_path, 'xids-saved')
                 if os.path.isfile(fpfn) and os.access(fpfn, os.R_OK):
                     with open(fpfn) as fh:
-                        self._saved_xids = fh.read().splitlines()
+                        self._saved_xids = set(fh.read().splitlines())
         return self._saved_xids
 
+    @property
+    def spill_backend(self):
+        """Return the spill store backend for saved groups and indicators."""
+        return self._spill_backend
+
+    @spill_backend.setter
+    def spill_backend(self, backend):
+        """Set the spill store backend for saved groups and indicators.
+
+        Must be set before any data is saved. Valid values are "log" (default, an append-only
+        JSON log with an in-memory xid index), "shelve", or a callable that accepts a filename
+        and returns a dict-like object.
+        """
+        self._spill_backend = backend
+
     @property
     def settings(self):
         """Return batch job settings."""
@@ -1346,6 +1625,7 @@ class Batch(object):
                     .get('data', {})
                     .get('batchStatus')
                 )
+                self._commit_content_hashes(batch_id, batch_data)
                 if errors:
                     # retrieve errors
                     error_groups = batch_data.get('errorGroupCount', 0)
@@ -1355,14 +1635,17 @@ class Batch(object):
                         batch_data['errors'] = self.errors(batch_id)
             else:
                 # can't process files if status is unknown (polling must be enabled)
+                self._content_hashes.pop(batch_id, None)
                 process_files = False
 
         if process_files:
             # submit file data after batch job is complete
-            batch_data['uploadStatus'] = self.submit_files(halt_on_error)
+            batch_data['uploadStatus'] = self.submit_files(halt_on_error, files=self._pop_files())
         return batch_data
 
-    def submit_all(self, poll=True, errors=True, process_files=True, halt_on_error=True):
+    def submit_all(
+        self, poll=True, errors=True, process_files=True, halt_on_error=True, max_in_flight=None
+    ):
         """Submit Batch request to ThreatConnect API.
 
         By default this method will submit the job request and data and if the size of the data
@@ -1377,69 +1660,202 @@ class Batch(object):
         Each of these methods can also be called on their own for greater control of the submit
         process.
 
+        When **max_in_flight** is greater than 1 the submit is pipelined. The next chunk of data
+        is built and uploaded while previous batch jobs are still being polled, with at most
+        max_in_flight jobs outstanding. The status, errors and file upload results for each job
+        are still returned in submit order.
+
         Args:
             poll (bool, default:True): Poll for status.
             errors (bool, default:True): Retrieve any batch errors (only if poll is True).
             process_files (bool, default:True): Send any document or report attachments to the API.
             halt_on_error (bool, default:True): If True any exception will raise an error.
+            max_in_flight (int, optional): The maximum number of batch jobs to have submitted
+                and not yet completed. Defaults to the **max_in_flight** property.
 
         Returns.
             dict: The Batch Status from the ThreatConnect API.
         """
+        if max_in_flight is None:
+            max_in_flight = self.max_in_flight
+
+        if max_in_flight > 1 and poll:
+            return self._submit_all_pipelined(errors, process_files, halt_on_error, max_in_flight)
+
         batch_data_array = []
         while True:
+            batch_id, batch_data = self._submit_chunk(halt_on_error)
+            if not batch_data:
+                break
+
+            batch_data = self._process_batch_job(
+                batch_id,
+                batch_data,
+                self._pop_files(),
+                poll,
+                errors,
+                process_files,
+                halt_on_error,
+            )
+            batch_data_array.append(batch_data)
+
+        return batch_data_array
+
+    def _submit_all_pipelined(self, errors, process_files, halt_on_error, max_in_flight):
+        """Submit all batch data keeping up to max_in_flight batch jobs outstanding.
+
+        The calling thread builds and submits each chunk while a pool of worker threads poll,
+        retrieve errors and upload files for previously submitted jobs.  When the limit is reached
+        the oldest job is waited on before the next chunk is submitted so results are collected in
+        submit order.
+
+        Args:
+            errors (bool): Retrieve any batch errors.
+            process_files (bool): Send any document or report attachments to the API.
+            halt_on_error (bool): If True any exception will raise an error.
+            max_in_flight (int): The maximum number of outstanding batch jobs.
+
+        Returns.
+            list: The Batch Status for each batch job in submit order.
+        """
+        batch_data_array = []
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            try:
+                while True:
+                    while len(in_flight) >= max_in_flight:
+                        # wait for the oldest job to free a slot
+                        batch_data_array.append(in_flight.popleft().result())
+
+                    batch_id, batch_data = self._submit_chunk(halt_on_error)
+                    if not batch_data:
+                        break
+
+                    in_flight.append(
+                        executor.submit(
+                            self._process_batch_job,
+                            batch_id,
+                            batch_data,
+                            self._pop_files(),
+                            True,
+                            errors,
+                            process_files,
+                            halt_on_error,
+                        )
+                    )
+
+                while in_flight:
+                    batch_data_array.append(in_flight.popleft().result())
+            except Exception:
+                # don't start any jobs that are still queued when a job has failed
+                for future in in_flight:
+                    future.cancel()
+                raise
+
+        return batch_data_array
+
+    def _submit_chunk(self, halt_on_error=True):
+        """Submit the next chunk of batch data to the ThreatConnect API.
+
+        Args:
+            halt_on_error (bool, default:True): If True any exception will raise an error.
+
+        Returns:
+            tuple: The batch id (or None) and the batch status data (empty if no data remains).
+        """
+        batch_id = None
+        if self.action.lower() == 'delete':
+            # while waiting of FR for delete support in createAndUpload submit delete request
+            # the old way (submit job + submit data), still using V2.
             batch_data = {}
-            batch_id = None
-            if self.action.lower() == 'delete':
-                # while waiting of FR for delete support in createAndUpload submit delete request
-                # the old way (submit job + submit data), still using V2.
-                if len(self) > 0:  # pylint: disable=C1801
-                    batch_id = self.submit_job(halt_on_error)
-                    if batch_id is not None:
-                        batch_data = self.submit_data(batch_id, halt_on_error)
-                else:
-                    batch_data = {}
-            else:
+            if len(self) > 0:  # pylint: disable=C1801
+                batch_id = self.submit_job(halt_on_error)
+                if batch_id is not None:
+                    batch_data = self.submit_data(batch_id, halt_on_error)
+        else:
+            batch_data = (
+                self.submit_create_and_upload(halt_on_error).get('data', {}).get('batchStatus', {})
+            )
+            batch_id = batch_data.get('id')
+        return batch_id, batch_data
+
+    def _process_batch_job(
+        self, batch_id, batch_data, files, poll, errors, process_files, halt_on_error
+    ):
+        """Poll status, retrieve errors, and upload files for a submitted batch job.
+
+        Args:
+            batch_id (str): The ID returned from the ThreatConnect API for the batch job.
+            batch_data (dict): The batch status returned on submit.
+            files (dict): The file content for Documents and Reports included in the batch job.
+            poll (bool): Poll for status.
+            errors (bool): Retrieve any batch errors (only if poll is True).
+            process_files (bool): Send any document or report attachments to the API.
+            halt_on_error (bool): If True any exception will raise an error.
+
+        Returns.
+            dict: The Batch Status from the ThreatConnect API.
+        """
+        if batch_id is not None:
+            self.tcex.log.info('Batch ID: {}'.format(batch_id))
+            # job hit queue
+            if poll:
+                # poll for status
                 batch_data = (
-                    self.submit_create_and_upload(halt_on_error)
+                    self.poll(batch_id, halt_on_error=halt_on_error)
                     .get('data', {})
-                    .get('batchStatus', {})
+                    .get('batchStatus')
                 )
-                batch_id = batch_data.get('id')
+                self._commit_content_hashes(batch_id, batch_data)
+                if errors:
+                    # retrieve errors
+                    error_count = batch_data.get('errorCount', 0)
+                    error_groups = batch_data.get('errorGroupCount', 0)
+                    error_indicators = batch_data.get('errorIndicatorCount', 0)
+                    if error_count > 0 or error_groups > 0 or error_indicators > 0:
+                        self.tcex.log.debug('retrieving batch errors')
+                        batch_data['errors'] = self.errors(batch_id)
+            else:
+                # can't process files if status is unknown (polling must be enabled)
+                self._content_hashes.pop(batch_id, None)
+                process_files = False
 
-            if not batch_data:
-                break
-            elif batch_id is not None:
-                self.tcex.log.info('Batch ID: {}'.format(batch_id))
-                # job hit queue
-                if poll:
-                    # poll for status
-                    batch_data = (
-                        self.poll(batch_id, halt_on_error=halt_on_error)
-                        .get('data', {})
-                        .get('batchStatus')
-                    )
-                    if errors:
-                        # retrieve errors
-                        error_count = batch_data.get('errorCount', 0)
-                        error_groups = batch_data.get('errorGroupCount', 0)
-                        error_indicators = batch_data.get('errorIndicatorCount', 0)
-                        if error_count > 0 or error_groups > 0 or error_indicators > 0:
-                            self.tcex.log.debug('retrieving batch errors')
-                            batch_data['errors'] = self.errors(batch_id)
-                else:
-                    # can't process files if status is unknown (polling must be enabled)
-                    process_files = False
-
-            if process_files:
-                # submit file data after batch job is complete
-                batch_data['uploadStatus'] = self.submit_files(halt_on_error)
-            batch_data_array.append(batch_data)
+        if process_files:
+            # submit file data after batch job is complete
+            batch_data['uploadStatus'] = self.submit_files(halt_on_error, files=files)
 
-            if self.debug:
-                self.write_error_json(batch_data.get('errors'))
+        if self.debug:
+            self.write_error_json(batch_data.get('errors'))
 
-        return batch_data_array
+        return batch_data
+
+    def _commit_content_hashes(self, batch_id, batch_data):
+        """Record the content hashes for a batch job in the content index if it had no errors.
+
+        Args:
+            batch_id (str): The ID returned from the ThreatConnect API for the batch job.
+            batch_data (dict): The batch status returned from poll.
+        """
+        hashes = self._content_hashes.pop(batch_id, None)
+        if not hashes or self.content_index is None or not batch_data:
+            return
+        error_count = (
+            batch_data.get('errorCount', 0)
+            + batch_data.get('errorGroupCount', 0)
+            + batch_data.get('errorIndicatorCount', 0)
+        )
+        if batch_data.get('status') == 'Completed' and error_count == 0:
+            self.content_index.commit(hashes)
+
+    def _pop_files(self):
+        """Return the file data for the groups in the last submitted chunk."""
+        if self.action.lower() == 'delete':
+            # the delete chunk contains all groups collected by data
+            files = dict(self._files)
+            self._files.clear()
+            return files
+        files, self._chunk_files = self._chunk_files, {}
+        return files
 
     def write_error_json(self, errors):
         """Writes the errors for debuging purposes"""
@@ -1460,26 +1876,49 @@ class Batch(object):
         if self.halt_on_batch_error is not None:
             halt_on_error = self.halt_on_batch_error
 
-        content = self.data
-        if content.get('group') or content.get('indicator'):
-            if self.debug:
-                # special code for debugging App using batchV2.
-                self.write_batch_json(content)
+        if self._batch_writer is None:
+            content_index = None
+            if self.action.lower() == 'create':
+                content_index = self.content_index
+            self._batch_writer = BatchWriter(self.data_units(), content_index, self._files)
+
+        body = self._batch_writer.next_body(
+            self.settings, self._batch_max_chunk, self._batch_max_size
+        )
+        if body is None:
+            # all data has been consumed, new data added later will use a new writer
+            self._batch_writer = None
+            if self.content_index is not None:
+                self.tcex.log.info(
+                    'Batch Unchanged Entities Skipped: {:,}.'.format(self.content_index.skipped)
+                )
+            return {}
 
-            # store the length of the batch data to use for poll interval calculations
-            self.tcex.log.info('Batch Group Size: {:,}.'.format(len(content.get('group'))))
-            self.tcex.log.info('Batch Indicator Size {:,}.'.format(len(content.get('indicator'))))
+        if self.debug:
+            # special code for debugging App using batchV2.
+            self.write_batch_json(body)
 
-            try:
-                files = (('config', json.dumps(self.settings)), ('content', json.dumps(content)))
-                params = {'includeAdditional': 'true'}
-                r = self.tcex.session.post('/v2/batch/createAndUpload', files=files, params=params)
-                self.tcex.log.debug('Batch Status Code: {}'.format(r.status_code))
-                if not r.ok or 'application/json' not in r.headers.get('content-type', ''):
-                    self.tcex.handle_error(10510, [r.status_code, r.text], halt_on_error)
-                return r.json()
-            except Exception as e:
-                self.tcex.handle_error(10505, [e], halt_on_error)
+        self._chunk_files = body.files
+        self.tcex.log.info('Batch Group Size: {:,}.'.format(body.group_count))
+        self.tcex.log.info('Batch Indicator Size {:,}.'.format(body.indicator_count))
+        self.tcex.log.debug('Batch Request Size: {:,} bytes.'.format(len(body)))
+
+        try:
+            params = {'includeAdditional': 'true'}
+            r = self.tcex.session.post(
+                '/v2/batch/createAndUpload', data=body, headers=body.headers, params=params
+            )
+            self.tcex.log.debug('Batch Status Code: {}'.format(r.status_code))
+            if not r.ok or 'application/json' not in r.headers.get('content-type', ''):
+                self.tcex.handle_error(10510, [r.status_code, r.text], halt_on_error)
+            data = r.json()
+            batch_id = data.get('data', {}).get('batchStatus', {}).get('id')
+            if body.hashes and batch_id is not None:
+                # committed to the content index once the job completes without errors
+                self._content_hashes[batch_id] = body.hashes
+            return data
+        except Exception as e:
+            self.tcex.handle_error(10505, [e], halt_on_error)
         return {}
 
     def submit_data(self, batch_id, halt_on_error=True):
@@ -1508,15 +1947,24 @@ class Batch(object):
             return r.json()
         return {}
 
-    def submit_files(self, halt_on_error=True):
+    def submit_files(self, halt_on_error=True, files=None, max_workers=None):
         """Submit Files for Documents and Reports to ThreatConnect API.
 
+        Files are uploaded concurrently on a bounded thread pool. Each upload is retried on
+        connection errors and 5xx responses. When the fileContent is a callback it is called
+        for each attempt, so a callback returning a file object or generator is streamed to the
+        API instead of being buffered in memory.
+
         Critical Errors
 
         * There is insufficient document storage allocated to this account.
 
         Args:
             halt_on_error (bool, default:True): If True any exception will raise an error.
+            files (dict, optional): The file data to upload. Defaults to all files collected
+                for the batch job.
+            max_workers (int, optional): The maximum number of concurrent uploads. Defaults to
+                the **file_max_workers** property.
 
         Returns:
             dict: The upload status for each xid.
@@ -1525,58 +1973,128 @@ class Batch(object):
         if self.halt_on_file_error is not None:
             halt_on_error = self.halt_on_file_error
 
-        upload_status = []
-        for xid, content_data in self._files.items():
-            del self._files[xid]  # win or loose remove the entry
-            status = True
+        if files is None:
+            files = self._files
 
-            # used for debug/testing to prevent upload of previously uploaded file
-            if self.debug and xid in self.saved_xids:
-                self.tcex.log.debug('skipping previously saved file {}.'.format(xid))
-                continue
+        if max_workers is None:
+            max_workers = self.file_max_workers
 
-            # process the file content
-            content = content_data.get('fileContent')
-            if callable(content):
-                content = content_data.get('fileContent')(xid)
-            if content is None:
-                upload_status.append({'uploaded': False, 'xid': xid})
-                self.tcex.log.warning('File content was null for xid {}.'.format(xid))
-                continue
-            if content_data.get('type') == 'Document':
-                api_branch = 'documents'
-            elif content_data.get('type') == 'Report':
-                api_branch = 'reports'
-
-            if self.debug and content_data.get('fileName'):
-                # special code for debugging App using batchV2.
-                fqfn = os.path.join(
-                    self.tcex.args.tc_temp_path,
-                    '{}--{}--{}'.format(
-                        api_branch, xid, content_data.get('fileName').replace('/', ':')
-                    ),
-                )
-                with open(fqfn, 'wb') as fh:
-                    fh.write(content)
+        # win or loose remove the entries
+        uploads = [(xid, files.pop(xid)) for xid in list(files)]
+        if not uploads:
+            return []
 
-            # Post File
-            url = '/v2/groups/{}/{}/upload'.format(api_branch, xid)
-            headers = {'Content-Type': 'application/octet-stream'}
-            params = {'owner': self._owner, 'updateIfExists': 'true'}
-            r = self.submit_file_content('POST', url, content, headers, params, halt_on_error)
-            if r.status_code == 401:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._submit_file, xid, content_data, halt_on_error)
+                for xid, content_data in uploads
+            ]
+            # collect results in submit order
+            upload_status = [f.result() for f in futures]
+        return [status for status in upload_status if status is not None]
+
+    def _file_content(self, xid, content_data, attempt):
+        """Return the file content for an upload attempt.
+
+        Args:
+            xid (str): The xid of the Document or Report.
+            content_data (dict): The file data for the group.
+            attempt (int): The upload attempt (0 for the first attempt).
+
+        Returns:
+            bytes|file|generator: The file content or None if no content is available.
+        """
+        content = content_data.get('fileContent')
+        if callable(content):
+            # a fresh (possibly streamed) body for each attempt
+            return content(xid)
+        if attempt > 0 and hasattr(content, 'seek'):
+            # rewind file objects for retries
+            content.seek(0)
+        return content
+
+    def _submit_file(self, xid, content_data, halt_on_error=True):
+        """Upload the file content for a single Document or Report.
+
+        Args:
+            xid (str): The xid of the Document or Report.
+            content_data (dict): The file data for the group.
+            halt_on_error (bool, default:True): If True any exception will raise an error.
+
+        Returns:
+            dict: The upload status for the xid or None if the file was skipped.
+        """
+        # used for debug/testing to prevent upload of previously uploaded file
+        if self.debug and xid in self.saved_xids:
+            self.tcex.log.debug('skipping previously saved file {}.'.format(xid))
+            return None
+
+        # process the file content
+        content = self._file_content(xid, content_data, 0)
+        if content is None:
+            self.tcex.log.warning('File content was null for xid {}.'.format(xid))
+            return {'uploaded': False, 'xid': xid}
+        if content_data.get('type') == 'Document':
+            api_branch = 'documents'
+        elif content_data.get('type') == 'Report':
+            api_branch = 'reports'
+
+        if self.debug and content_data.get('fileName'):
+            # special code for debugging App using batchV2 (streamed content is buffered).
+            if hasattr(content, 'read'):
+                content = content.read()
+            elif not isinstance(content, (bytes, str)):
+                content = b''.join(content)
+            content_data = dict(content_data, fileContent=content)
+            fqfn = os.path.join(
+                self.tcex.args.tc_temp_path,
+                '{}--{}--{}'.format(
+                    api_branch, xid, content_data.get('fileName').replace('/', ':')
+                ),
+            )
+            with open(fqfn, 'wb') as fh:
+                fh.write(content)
+
+        # Post File
+        url = '/v2/groups/{}/{}/upload'.format(api_branch, xid)
+        headers = {'Content-Type': 'application/octet-stream'}
+        params = {'owner': self._owner, 'updateIfExists': 'true'}
+        method = 'POST'
+        r = None
+        for attempt in range(self.file_retries + 1):
+            if attempt > 0:
+                time.sleep(self.file_retry_back_off * 2 ** (attempt - 1))
+                content = self._file_content(xid, content_data, attempt)
+            last_attempt = attempt == self.file_retries
+            r = self.submit_file_content(
+                method, url, content, headers, params, halt_on_error and last_attempt
+            )
+            if r is not None and r.status_code == 401 and method == 'POST':
                 # use PUT method if file already exists
                 self.tcex.log.info('Received 401 status code using POST. Trying PUT to update.')
-                r = self.submit_file_content('PUT', url, content, headers, params, halt_on_error)
-            self.tcex.log.debug('{} Upload URL: {}.'.format(content_data.get('type'), r.url))
-            if not r.ok:
-                status = False
-                self.tcex.handle_error(585, [r.status_code, r.text], halt_on_error)
-            elif self.debug:
-                self.saved_xids.append(xid)
-            self.tcex.log.info('Status {} for file upload with xid {}.'.format(r.status_code, xid))
-            upload_status.append({'uploaded': status, 'xid': xid})
-        return upload_status
+                method = 'PUT'
+                content = self._file_content(xid, content_data, attempt + 1)
+                r = self.submit_file_content(
+                    method, url, content, headers, params, halt_on_error and last_attempt
+                )
+            if r is not None and r.status_code < 500:
+                break
+            self.tcex.log.warning(
+                'File upload for xid {} failed (attempt {}).'.format(xid, attempt + 1)
+            )
+
+        if r is None:
+            return {'uploaded': False, 'xid': xid}
+
+        status = True
+        self.tcex.log.debug('{} Upload URL: {}.'.format(content_data.get('type'), r.url))
+        if not r.ok:
+            status = False
+            self.tcex.handle_error(585, [r.status_code, r.text], halt_on_error)
+        elif self.debug:
+            self.saved_xids.add(xid)
+        self.tcex.log.info('Status {} for file upload with xid {}.'.format(r.status_code, xid))
+        return {'uploaded': status, 'xid': xid}
 
     def submit_file_content(self, method, url, data, headers, params, halt_on_error=True):
         """Submit File Content for Documents and Reports to ThreatConnect API.
@@ -1584,7 +2102,7 @@ class Batch(object):
         Args:
             method (str): The HTTP method for the request (POST, PUT).
             url (str): The URL for the request.
-            data (str;bytes;file): The body (data) for the request.
+            data (str;bytes;file;generator): The body (data) for the request.
             headers (dict): The headers for the request.
             params (dict): The query string parameters for the request.
             halt_on_error (bool, default:True): If True any exception will raise an error.
@@ -1666,14 +2184,22 @@ class Batch(object):
         return self._indicator(indicator_obj)
 
     def write_batch_json(self, content):
-        """Write batch json data to a file."""
+        """Write batch json data to a file.
+
+        Args:
+            content (dict|BatchBody): The batch data or the streamed batch request body.
+        """
         # TODO: don't write empty data
         timestamp = str(time.time()).replace('.', '')
         batch_json_file = os.path.join(
             self.tcex.args.tc_temp_path, 'batch-{}.json'.format(timestamp)
         )
-        with open(batch_json_file, 'w') as fh:
-            json.dump(content, fh, indent=2)
+        if isinstance(content, dict):
+            with open(batch_json_file, 'w') as fh:
+                json.dump(content, fh, indent=2)
+        else:
+            with open(batch_json_file, 'wb') as fh:
+                content.write_content(fh)
 
     @property
     def file_len(self):
@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+"""ThreatConnect Batch Poll Module."""
+import math
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+
+from six import with_metaclass
+
+
+class PollMetrics(object):
+    """Latency metrics for batch status poll requests."""
+
+    def __init__(self):
+        """Initialize Class Properties."""
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.max = 0
+        self.min = None
+        self.total = 0
+
+    def add(self, latency, error=False):
+        """Record the latency of a single poll request.
+
+        Args:
+            latency (float): The request time in seconds.
+            error (bool, default:False): If True the poll request failed.
+        """
+        with self._lock:
+            self.count += 1
+            self.total += latency
+            self.max = max(self.max, latency)
+            self.min = latency if self.min is None else min(self.min, latency)
+            if error:
+                self.errors += 1
+
+    @property
+    def average(self):
+        """Return the average poll latency."""
+        if not self.count:
+            return 0
+        return self.total / self.count
+
+    @property
+    def data(self):
+        """Return the metrics as a dict."""
+        return {
+            'average': self.average,
+            'count': self.count,
+            'errors': self.errors,
+            'max': self.max,
+            'min': self.min or 0,
+            'total': self.total,
+        }
+
+
+class PollStrategy(with_metaclass(ABCMeta)):
+    """Base class for batch poll strategies.
+
+    A strategy decides how long to wait before the first poll and between subsequent polls of a
+    batch job. The same strategy instance is used for all jobs of a Batch so it can learn from
+    previous jobs. Subclasses must implement initial_interval and next_interval.
+    """
+
+    def completed(self, batch_id, elapsed, poll_count):
+        """Record that a batch job completed.
+
+        Args:
+            batch_id (str): The batch job id.
+            elapsed (float): The total seconds spent waiting on the job.
+            poll_count (int): The number of polls for the job.
+        """
+
+    @abstractmethod
+    def initial_interval(self, batch_id, batch_count=None):
+        """Return the seconds to wait before the first poll.
+
+        Args:
+            batch_id (str): The batch job id.
+            batch_count (int, optional): The number of entities submitted in the job.
+        """
+
+    @abstractmethod
+    def next_interval(self, batch_id, batch_status, elapsed, poll_count, **kwargs):
+        """Return the seconds to wait before the next poll.
+
+        Args:
+            batch_id (str): The batch job id.
+            batch_status (dict): The batchStatus returned on the last poll.
+            elapsed (float): The total seconds spent waiting on the job.
+            poll_count (int): The number of polls for the job.
+        """
+
+
+class HeuristicPollStrategy(PollStrategy):
+    """The default TcEx poll strategy.
+
+    The initial interval is based on the number of entities in the batch (1 second per 300
+    entities, minimum of 5 seconds), retries back off linearly up to a max of 20 seconds, and on
+    completion the initial interval for the next job is a weighted average of the last 5 jobs.
+
+    Args:
+        retry_seconds (int, default:5): The base number of seconds used for retries.
+        back_off (float, default:2.5): A multiplier for backing off on each poll attempt.
+        max_interval (int, default:20): The maximum number of seconds between polls.
+    """
+
+    def __init__(self, retry_seconds=5, back_off=2.5, max_interval=20):
+        """Initialize Class Properties."""
+        self.back_off = back_off
+        self.max_interval = max_interval
+        self.poll_interval = None
+        self.poll_interval_times = []
+        self.retry_seconds = retry_seconds
+
+    def completed(self, batch_id, elapsed, poll_count):
+        """Update the initial interval using a weighted average of the last 5 poll times."""
+        # store last 5 poll times to use in calculating average poll time
+        modifier = elapsed * 0.7
+        self.poll_interval_times = self.poll_interval_times[-4:] + [modifier]
+
+        weights = [1]
+        poll_interval_time_weighted_sum = 0
+        for poll_interval_time in self.poll_interval_times:
+            poll_interval_time_weighted_sum += poll_interval_time * weights[-1]
+            # weights will be [1, 1.5, 2.25, 3.375, 5.0625] for all 5 poll times depending
+            # on how many poll times are available.
+            weights.append(weights[-1] * 1.5)
+
+        # pop off the last weight so its not added in to the sum
+        weights.pop()
+
+        # calculate the weighted average of the last 5 poll times
+        poll_interval = math.floor(poll_interval_time_weighted_sum / sum(weights))
+
+        if poll_count == 1:
+            # if completed on first poll, reduce poll interval.
+            poll_interval = poll_interval * 0.85
+        self.poll_interval = poll_interval
+
+    def initial_interval(self, batch_id, batch_count=None):
+        """Return the learned interval or an interval based on the batch size."""
+        if self.poll_interval is None and batch_count is not None:
+            # calculate poll_interval base off the number of entries in the batch data
+            # with a minimum value of 5 seconds.
+            self.poll_interval = max(math.ceil(batch_count / 300), 5)
+        elif self.poll_interval is None:
+            # if not able to calculate poll_interval default to 15 seconds
+            self.poll_interval = 15
+        return self.poll_interval
+
+    def next_interval(self, batch_id, batch_status, elapsed, poll_count, **kwargs):
+        """Return a linear back off interval.
+
+        Args:
+            retry_seconds (int, kwargs): Override the base number of seconds for retries.
+            back_off (float, kwargs): Override the back off multiplier.
+        """
+        retry_seconds = kwargs.get('retry_seconds')
+        if retry_seconds is None:
+            retry_seconds = self.retry_seconds
+        back_off = kwargs.get('back_off')
+        if back_off is None:
+            back_off = self.back_off
+        return min(int(retry_seconds) + int(poll_count * float(back_off)), self.max_interval)
+
+
+class ProgressPollStrategy(PollStrategy):
+    """Poll strategy that estimates time to completion from the observed progress rate.
+
+    The processed count (successCount + errorCount) and unprocessCount returned on each poll are
+    used to calculate the rate the server is processing the job. The next poll is scheduled for
+    the estimated completion time, bounded by min_interval and max_interval. When no progress
+    has been observed yet the interval backs off from the initial interval.
+
+    Args:
+        initial (float, default:5): The seconds to wait before the first poll.
+        min_interval (float, default:1): The minimum number of seconds between polls.
+        max_interval (float, default:20): The maximum number of seconds between polls.
+        back_off (float, default:1.5): The multiplier used when no progress is observed.
+    """
+
+    def __init__(self, initial=5, min_interval=1, max_interval=20, back_off=1.5):
+        """Initialize Class Properties."""
+        self.back_off = back_off
+        self.initial = initial
+        self.max_interval = max_interval
+        self.min_interval = min_interval
+        self._progress = {}
+
+    def _bound(self, interval):
+        """Return the interval bounded by the min and max interval."""
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def completed(self, batch_id, elapsed, poll_count):
+        """Remove the progress state for the completed job."""
+        self._progress.pop(batch_id, None)
+
+    def estimate(self, batch_id):
+        """Return the estimated seconds until the batch job completes or None if unknown.
+
+        Args:
+            batch_id (str): The batch job id.
+        """
+        progress = self._progress.get(batch_id)
+        if progress is None or not progress.get('rate'):
+            return None
+        return progress.get('unprocessed') / progress.get('rate')
+
+    def initial_interval(self, batch_id, batch_count=None):
+        """Return the initial interval."""
+        self._progress[batch_id] = {'interval': self.initial}
+        return self.initial
+
+    def next_interval(self, batch_id, batch_status, elapsed, poll_count, **kwargs):
+        """Return the estimated seconds to completion bounded by the min and max interval."""
+        progress = self._progress.setdefault(batch_id, {'interval': self.initial})
+        processed = batch_status.get('successCount', 0) + batch_status.get('errorCount', 0)
+        unprocessed = batch_status.get('unprocessCount', 0)
+
+        last_elapsed = progress.get('elapsed')
+        last_processed = progress.get('processed')
+        if last_elapsed is not None and processed > last_processed and elapsed > last_elapsed:
+            progress['rate'] = (processed - last_processed) / (elapsed - last_elapsed)
+        progress.update({'elapsed': elapsed, 'processed': processed, 'unprocessed': unprocessed})
+
+        estimate = self.estimate(batch_id)
+        if estimate is None:
+            interval = self._bound(progress.get('interval') * self.back_off)
+        else:
+            interval = self._bound(estimate)
+        progress['interval'] = interval
+        return interval
+
+
+class BatchPoller(object):
+    """Poll one or more batch jobs until they are completed.
+
+    All outstanding jobs are polled in a single loop. Each job is polled when the strategy
+    interval for that job has elapsed, so one thread can wait on several jobs. The strategy calls
+    are serialized with a lock, so the poller (and its strategy) can be shared by the threads
+    polling the jobs of a pipelined submit_all.
+
+    Args:
+        tcex (obj): An instance of TcEx object.
+        strategy (PollStrategy): The poll strategy.
+        session (requests.Session, optional): The session to use (defaults to tcex.session).
+    """
+
+    def __init__(self, tcex, strategy, session=None):
+        """Initialize Class Properties."""
+        self.tcex = tcex
+        self._lock = threading.Lock()
+        self.metrics = PollMetrics()
+        self.strategy = strategy
+        self._session = session
+
+    @property
+    def session(self):
+        """Return the session used to poll batch status."""
+        return self._session or self.tcex.session
+
+    def _poll_status(self, batch_id, halt_on_error):
+        """Request the status for a single batch job.
+
+        Returns:
+            tuple: The status data and a bool that is True if the job should no longer be polled.
+        """
+        params = {'includeAdditional': 'true'}
+        start = time.time()
+        try:
+            # retrieve job status
+            r = self.session.get('/v2/batch/{}'.format(batch_id), params=params)
+            self.metrics.add(time.time() - start, not r.ok)
+            if not r.ok or 'application/json' not in r.headers.get('content-type', ''):
+                self.tcex.handle_error(545, [r.status_code, r.text], halt_on_error)
+                return None, True
+            data = r.json()
+            if data.get('status') != 'Success':
+                self.tcex.handle_error(545, [r.status_code, r.text], halt_on_error)
+            return data, False
+        except RuntimeError:
+            raise
+        except Exception as e:
+            self.metrics.add(time.time() - start, True)
+            self.tcex.handle_error(540, [e], halt_on_error)
+        return None, False
+
+    def poll(self, batch_ids, batch_count=None, timeout=3600, halt_on_error=True, **kwargs):
+        """Poll the provided batch jobs until all are completed.
+
+        Args:
+            batch_ids (list): The batch job ids.
+            batch_count (int, optional): The number of entities submitted per job.
+            timeout (int, default:3600): The number of seconds before the poll should timeout.
+            halt_on_error (bool, default:True): If True any exception will raise an error.
+            kwargs: Additional options passed to the strategy next_interval method.
+
+        Returns:
+            dict: The last status data returned from the API for each batch id.
+        """
+        results = {}
+        state = {}
+        now = time.time()
+        for batch_id in batch_ids:
+            results[batch_id] = {}
+            with self._lock:
+                interval = self.strategy.initial_interval(batch_id, batch_count)
+            state[batch_id] = {'count': 0, 'elapsed': 0, 'next': now + interval, 'start': now}
+
+        while state:
+            # wait until the next job is due
+            next_poll = min(s.get('next') for s in state.values())
+            delay = next_poll - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+            now = time.time()
+            for batch_id in [b for b, s in state.items() if s.get('next') <= now]:
+                job = state[batch_id]
+                job['count'] += 1
+                job['elapsed'] = now - job.get('start')
+                self.tcex.log.info(
+                    'Batch poll time for ID {}: {:.0f} seconds'.format(batch_id, job['elapsed'])
+                )
+                data, done = self._poll_status(batch_id, halt_on_error)
+                if data is not None:
+                    results[batch_id] = data
+                batch_status = results[batch_id].get('data', {}).get('batchStatus', {})
+                if done:
+                    del state[batch_id]
+                elif batch_status.get('status') == 'Completed':
+                    with self._lock:
+                        self.strategy.completed(batch_id, job['elapsed'], job['count'])
+                    self.tcex.log.debug('Batch Status: {}'.format(results[batch_id]))
+                    del state[batch_id]
+                elif job['elapsed'] >= timeout:
+                    # time out poll to prevent App running indefinitely
+                    self.tcex.handle_error(550, [timeout], True)
+                else:
+                    with self._lock:
+                        interval = self.strategy.next_interval(
+                            batch_id, batch_status, job['elapsed'], job['count'], **kwargs
+                        )
+                    job['next'] = time.time() + interval
+
+        self.tcex.log.debug('Batch poll metrics: {}'.format(self.metrics.data))
+        return results
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""ThreatConnect Batch Streaming Writer Module."""
+import json
+import uuid
+
+
+class BatchBody(object):
+    """File-like multipart/form-data body for the batch createAndUpload endpoint.
+
+    The body is held as a list of already encoded byte segments which are handed to the HTTP
+    connection one read at a time, so no combined copy of the batch content is ever built.
+
+    Args:
+        segments (list): The list of bytes segments that make up the body.
+        boundary (str): The multipart boundary used to build the segments.
+        group_count (int): The number of groups in the body.
+        indicator_count (int): The number of indicators in the body.
+        hashes (dict, optional): The xid to content hash mapping for the entities in the body.
+        files (dict, optional): The file data for the Documents and Reports in the body.
+    """
+
+    def __init__(self, segments, boundary, group_count, indicator_count, hashes=None, files=None):
+        """Initialize Class Properties."""
+        self._buffer = b''
+        self._length = sum(len(s) for s in segments)
+        self._segments = segments
+        self._segment_iter = iter(segments)
+        self.boundary = boundary
+        self.files = files or {}
+        self.group_count = group_count
+        self.hashes = hashes or {}
+        self.indicator_count = indicator_count
+
+    @property
+    def content_type(self):
+        """Return the Content-Type header value for the body."""
+        return 'multipart/form-data; boundary={}'.format(self.boundary)
+
+    @property
+    def headers(self):
+        """Return the headers required to send the body."""
+        return {'Content-Type': self.content_type}
+
+    def read(self, size=-1):
+        """Read up to size bytes from the body.
+
+        Args:
+            size (int, default:-1): The maximum number of bytes to return (-1 for all).
+
+        Returns:
+            bytes: The next block of the body.
+        """
+        if size is None or size < 0:
+            data = self._buffer + b''.join(self._segment_iter)
+            self._buffer = b''
+            return data
+
+        while len(self._buffer) < size:
+            segment = next(self._segment_iter, None)
+            if segment is None:
+                break
+            self._buffer += segment
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def write_content(self, fh):
+        """Write the JSON content part of the body to a file handle (used for debugging).
+
+        Args:
+            fh (file): A file handle opened in binary mode.
+        """
+        for segment in self._segments[1:-1]:
+            fh.write(segment)
+
+    def __len__(self):
+        """Return the total length of the body in bytes."""
+        return self._length
+
+
+class BatchWriter(object):
+    """Serialize batch entities into byte-budgeted createAndUpload request bodies.
+
+    Entities are pulled from an iterator of (entity type, entity list) units and serialized one
+    at a time directly into the body segments. A body is closed when either the max entity count
+    or the max byte size is reached. Units are never split across bodies, so a Group and its
+    associated Groups are always submitted together.  A unit that does not fit in the current body
+    is carried over to the next body.
+
+    When a content index is provided, entities whose serialized content matches the hash
+    recorded on a previous successful submit are dropped and the hashes of the remaining entities
+    are returned on the body so they can be committed once the batch job has completed.
+
+    The file data of Documents and Reports is added to the files dict while the entities are
+    generated. It is moved to the unit as soon as the unit is read, so the files are returned on
+    the body that contains the group even when the unit is carried over to the next body. The
+    files of unchanged groups that are dropped are not uploaded again.
+
+    Args:
+        entities (iterator): An iterator of tuples containing the entity type ("group" or
+            "indicator"), a list of entity dicts or already serialized entity JSON, and
+            optionally a list of the entity xids (required for serialized entities).
+        content_index (ContentIndex, optional): The index of previously submitted content.
+        files (dict, optional): The file data keyed by group xid, filled as entities are
+            generated.
+    """
+
+    # the JSON framing of the content part: start, between groups and indicators, and end
+    _content_frame = [b'{"group": [', b'], "indicator": [', b']}']
+
+    def __init__(self, entities, content_index=None, files=None):
+        """Initialize Class Properties."""
+        self._carry = None
+        self.content_index = content_index
+        self._entities = iter(entities)
+        self.files = files if files is not None else {}
+
+    @staticmethod
+    def _encode(entity):
+        """Return the JSON encoded bytes for a single entity (bytes are already encoded)."""
+        if isinstance(entity, bytes):
+            return entity
+        return json.dumps(entity).encode('utf-8')
+
+    def _next_unit(self):
+        """Return the next encoded unit, starting with any unit carried from the previous body."""
+        if self._carry is not None:
+            unit, self._carry = self._carry, None
+            return unit
+
+        for unit in self._entities:
+            entity_type, entities = unit[0], unit[1]
+            encoded = [self._encode(e) for e in entities]
+            xids = unit[2] if len(unit) > 2 else [e.get('xid') for e in entities]
+            files = {xid: self.files.pop(xid) for xid in xids if xid in self.files}
+            if self.content_index is None:
+                return entity_type, encoded, {}, files
+
+            changed = []
+            hashes = {}
+            for xid, data in zip(xids, encoded):
+                if xid is not None:
+                    content_hash = self.content_index.content_hash(data)
+                    if self.content_index.unchanged(xid, content_hash):
+                        files.pop(xid, None)
+                        continue
+                    hashes[xid] = content_hash
+                changed.append(data)
+            if changed:
+                return entity_type, changed, hashes, files
+        return None
+
+    def next_body(self, settings, max_chunk, max_size=None):
+        """Return the next BatchBody or None when no entities remain.
+
+        Args:
+            settings (dict): The batch job settings for the config part of the body.
+            max_chunk (int): The maximum number of entities in the body.
+            max_size (int, optional): The maximum size in bytes of the body.
+
+        Returns:
+            BatchBody: The multipart body for the next batch job.
+        """
+        boundary = uuid.uuid4().hex
+        head = (
+            '--{0}\r\n'
+            'Content-Disposition: form-data; name="config"; filename="config"\r\n\r\n'
+            '{1}\r\n'
+            '--{0}\r\n'
+            'Content-Disposition: form-data; name="content"; filename="content"\r\n\r\n'
+        ).format(boundary, json.dumps(settings))
+        head = head.encode('utf-8')
+        tail = '\r\n--{}--\r\n'.format(boundary).encode('utf-8')
+
+        body_size = sum(len(s) for s in [head, tail] + self._content_frame)
+        entities = {'group': [], 'indicator': []}
+        files = {}
+        hashes = {}
+        entity_count = 0
+        while entity_count < max_chunk:
+            unit = self._next_unit()
+            if unit is None:
+                break
+            entity_type, encoded, unit_hashes, unit_files = unit
+            # count a ", " separator for every entity (over by 2 bytes for the first entry)
+            unit_size = sum(len(e) for e in encoded) + 2 * len(encoded)
+            if entity_count > 0 and max_size is not None and body_size + unit_size > max_size:
+                # unit would exceed the byte budget, submit it with the next body
+                self._carry = unit
+                break
+            entities[entity_type].extend(encoded)
+            files.update(unit_files)
+            hashes.update(unit_hashes)
+            body_size += unit_size
+            entity_count += len(encoded)
+
+        if entity_count == 0:
+            return None
+
+        segments = [head, self._content_frame[0]]
+        segments.extend(self._join(entities['group']))
+        segments.append(self._content_frame[1])
+        segments.extend(self._join(entities['indicator']))
+        segments.append(self._content_frame[2])
+        segments.append(tail)
+        return BatchBody(
+            segments, boundary, len(entities['group']), len(entities['indicator']), hashes, files
+        )
+
+    @staticmethod
+    def _join(encoded):
+        """Return the encoded entities with separators, without creating a joined copy."""
+        segments = []
+        for index, entity in enumerate(encoded):
+            if index > 0:
+                segments.append(b', ')
+            segments.append(entity)
+        return segments
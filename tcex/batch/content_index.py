@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""ThreatConnect Batch Content Index Module."""
+import hashlib
+import os
+import threading
+import time
+
+
+class ContentIndex(object):
+    """Persistent index of xid to content hash for previously submitted batch entities.
+
+    The index is stored as an append-only file of ``xid<TAB>hash<TAB>timestamp`` lines and loaded
+    into a dict on first use. Hashes are only written after the batch job containing the entity
+    has completed successfully, so a failed run never marks an entity as submitted.
+
+    Args:
+        fqfn (str): The fully qualified filename of the index file.
+        max_age (int, optional): The number of seconds after which an unchanged entity is
+            submitted again. If None, unchanged entities are always skipped.
+    """
+
+    def __init__(self, fqfn, max_age=None):
+        """Initialize Class Properties."""
+        self.fqfn = fqfn
+        self._lock = threading.Lock()
+        self.max_age = max_age
+        self._index = None
+        self._lines = 0
+        self.skipped = 0
+
+    @staticmethod
+    def content_hash(content):
+        """Return the hash for the serialized entity content.
+
+        Args:
+            content (bytes): The JSON serialized entity.
+
+        Returns:
+            str: The hex digest of the content.
+        """
+        return hashlib.sha256(content).hexdigest()[:32]
+
+    @property
+    def index(self):
+        """Return the xid to (hash, timestamp) index, loading it from disk on first use."""
+        if self._index is None:
+            self._index = {}
+            if os.path.isfile(self.fqfn):
+                with open(self.fqfn, 'r') as fh:
+                    for line in fh:
+                        try:
+                            xid, content_hash, timestamp = line.rstrip('\n').split('\t')
+                            self._index[xid] = (content_hash, float(timestamp))
+                        except ValueError:
+                            # skip partially written lines
+                            continue
+                        self._lines += 1
+        return self._index
+
+    def commit(self, hashes):
+        """Persist the content hashes for successfully submitted entities.
+
+        Args:
+            hashes (dict): The xid to content hash mapping.
+        """
+        if not hashes:
+            return
+        timestamp = time.time()
+        # jobs may complete concurrently when batch submits are pipelined
+        with self._lock:
+            with open(self.fqfn, 'a') as fh:
+                for xid, content_hash in hashes.items():
+                    self.index[xid] = (content_hash, timestamp)
+                    fh.write('{}\t{}\t{}\n'.format(xid, content_hash, timestamp))
+            self._lines += len(hashes)
+
+            if self._lines > 2 * len(self.index) + 10000:
+                self.compact()
+
+    def compact(self):
+        """Rewrite the index file with only the latest entry for each xid."""
+        tmp_fqfn = '{}.tmp'.format(self.fqfn)
+        with open(tmp_fqfn, 'w') as fh:
+            for xid, (content_hash, timestamp) in self.index.items():
+                fh.write('{}\t{}\t{}\n'.format(xid, content_hash, timestamp))
+        os.rename(tmp_fqfn, self.fqfn)
+        self._lines = len(self.index)
+
+    def unchanged(self, xid, content_hash):
+        """Return True if the entity was previously submitted with the same content.
+
+        Args:
+            xid (str): The xid of the entity.
+            content_hash (str): The hash of the serialized entity.
+        """
+        entry = self.index.get(xid)
+        if entry is None or entry[0] != content_hash:
+            return False
+        if self.max_age is not None and time.time() - entry[1] > self.max_age:
+            return False
+        self.skipped += 1
+        return True
@@ -8,21 +8,34 @@ from .attribute import Attribute
 from .security_label import SecurityLabel
 from .tag import Tag
 
+# shared by all batch group objects (Utils holds no per object state)
+_utils = Utils()
+
+# map of snake case arg names to batch field names
+_metadata_map = {
+    'date_added': 'dateAdded',
+    'event_date': 'eventDate',
+    'file_name': 'fileName',
+    'file_text': 'fileText',
+    'file_type': 'fileType',
+    'first_seen': 'firstSeen',
+    'from_addr': 'from',
+    'publish_date': 'publishDate',
+    'to_addr': 'to',
+}
+
 
 class Group(object):
     """ThreatConnect Batch Group Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = [
-    #     '_attributes',
-    #     '_file_content',
-    #     '_group_data',
-    #     '_labels',
-    #     '_name',
-    #     '_processed',
-    #     '_type',
-    #     '_tags',
-    #     '_utils']
+    __slots__ = [
+        '_attributes',
+        '_file_content',
+        '_group_data',
+        '_labels',
+        '_processed',
+        '_tags',
+    ]
 
     def __init__(self, group_type, name, **kwargs):
         """Initialize Class Properties.
@@ -32,9 +45,6 @@ class Group(object):
             name (str): The name for this Group.
             xid (str, kwargs): The external id for this Group.
         """
-        self._utils = Utils()
-        self._name = name
-        self._type = group_type
         self._group_data = {'name': name, 'type': group_type}
         # process all kwargs and update metadata field names
         for arg, value in kwargs.items():
@@ -42,27 +52,13 @@ class Group(object):
         # set xid to random and unique uuid4 value if not provided
         if kwargs.get('xid') is None:
             self._group_data['xid'] = str(uuid.uuid4())
-        self._attributes = []
-        self._labels = []
+        # child object lists are only created when a child is added
+        self._attributes = None
+        self._labels = None
         self._file_content = None
-        self._tags = []
+        self._tags = None
         self._processed = False
 
-    @property
-    def _metadata_map(self):
-        """Return metadata map for Group objects."""
-        return {
-            'date_added': 'dateAdded',
-            'event_date': 'eventDate',
-            'file_name': 'fileName',
-            'file_text': 'fileText',
-            'file_type': 'fileType',
-            'first_seen': 'firstSeen',
-            'from_addr': 'from',
-            'publish_date': 'publishDate',
-            'to_addr': 'to',
-        }
-
     def add_file(self, filename, file_content):
         """Add a file for Document and Report types.
 
@@ -92,10 +88,10 @@ class Group(object):
             key (str): The field key to add to the JSON batch data.
             value (str): The field value to add to the JSON batch data.
         """
-        key = self._metadata_map.get(key, key)
+        key = _metadata_map.get(key, key)
         if key in ['dateAdded', 'eventDate', 'firstSeen', 'publishDate']:
             if value is not None:
-                self._group_data[key] = self._utils.format_datetime(
+                self._group_data[key] = _utils.format_datetime(
                     value, date_format='%Y-%m-%dT%H:%M:%SZ'
                 )
         elif key == 'file_content':
@@ -136,6 +132,8 @@ class Group(object):
             obj: An instance of Attribute.
         """
         attr = Attribute(attr_type, attr_value, displayed, source, formatter)
+        if self._attributes is None:
+            self._attributes = []
         if unique == 'Type':
             for attribute_data in self._attributes:
                 if attribute_data.type == attr_type:
@@ -183,7 +181,7 @@ class Group(object):
     @date_added.setter
     def date_added(self, date_added):
         """Set Indicator dateAdded."""
-        self._group_data['dateAdded'] = self._utils.format_datetime(
+        self._group_data['dateAdded'] = _utils.format_datetime(
             date_added, date_format='%Y-%m-%dT%H:%M:%SZ'
         )
 
@@ -229,6 +227,8 @@ class Group(object):
             obj: An instance of SecurityLabel.
         """
         label = SecurityLabel(name, description, color)
+        if self._labels is None:
+            self._labels = []
         for label_data in self._labels:
             if label_data.name == name:
                 label = label_data
@@ -249,6 +249,8 @@ class Group(object):
             obj: An instance of Tag.
         """
         tag = Tag(name, formatter)
+        if self._tags is None:
+            self._tags = []
         for tag_data in self._tags:
             if tag_data.name == name:
                 tag = tag_data
@@ -275,8 +277,7 @@ class Group(object):
 class Adversary(Group):
     """ThreatConnect Batch Adversary Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, name, **kwargs):
         """Initialize Class Properties.
@@ -292,8 +293,7 @@ class Adversary(Group):
 class Campaign(Group):
     """ThreatConnect Batch Campaign Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, name, **kwargs):
         """Initialize Class Properties.
@@ -314,7 +314,7 @@ class Campaign(Group):
     @first_seen.setter
     def first_seen(self, first_seen):
         """Set Document first seen."""
-        self._group_data['firstSeen'] = self._utils.format_datetime(
+        self._group_data['firstSeen'] = _utils.format_datetime(
             first_seen, date_format='%Y-%m-%dT%H:%M:%SZ'
         )
 
@@ -322,8 +322,7 @@ class Campaign(Group):
 class Document(Group):
     """ThreatConnect Batch Document Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = ['_file_data', '_group_data']
+    __slots__ = []
 
     def __init__(self, name, file_name, **kwargs):
         """Initialize Class Properties.
@@ -386,8 +385,7 @@ class Document(Group):
 class Email(Group):
     """ThreatConnect Batch Email Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, name, subject, header, body, **kwargs):
         """Initialize Class Properties.
@@ -442,8 +440,7 @@ class Email(Group):
 class Event(Group):
     """ThreatConnect Batch Event Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, name, **kwargs):
         """Initialize Class Properties.
@@ -471,7 +468,7 @@ class Event(Group):
     @event_date.setter
     def event_date(self, event_date):
         """Set the Events "event date" value."""
-        self._group_data['eventDate'] = self._utils.format_datetime(
+        self._group_data['eventDate'] = _utils.format_datetime(
             event_date, date_format='%Y-%m-%dT%H:%M:%SZ'
         )
 
@@ -489,8 +486,7 @@ class Event(Group):
 class Incident(Group):
     """ThreatConnect Batch Incident Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, name, **kwargs):
         """Initialize Class Properties.
@@ -523,7 +519,7 @@ class Incident(Group):
     @event_date.setter
     def event_date(self, event_date):
         """Set Incident event_date."""
-        self._group_data['eventDate'] = self._utils.format_datetime(
+        self._group_data['eventDate'] = _utils.format_datetime(
             event_date, date_format='%Y-%m-%dT%H:%M:%SZ'
         )
 
@@ -553,8 +549,7 @@ class Incident(Group):
 class IntrusionSet(Group):
     """ThreatConnect Batch Adversary Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, name, **kwargs):
         """Initialize Class Properties.
@@ -570,8 +565,7 @@ class IntrusionSet(Group):
 class Report(Group):
     """ThreatConnect Batch Report Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, name, **kwargs):
         """Initialize Class Properties.
@@ -616,7 +610,7 @@ class Report(Group):
     @publish_date.setter
     def publish_date(self, publish_date):
         """Set Report publish date"""
-        self._group_data['publishDate'] = self._utils.format_datetime(
+        self._group_data['publishDate'] = _utils.format_datetime(
             publish_date, date_format='%Y-%m-%dT%H:%M:%SZ'
         )
 
@@ -624,8 +618,7 @@ class Report(Group):
 class Signature(Group):
     """ThreatConnect Batch Signature Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, name, file_name, file_type, file_text, **kwargs):
         """Initialize Class Properties.
@@ -658,8 +651,7 @@ class Signature(Group):
 class Threat(Group):
     """ThreatConnect Batch Threat Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, name, **kwargs):
         """Initialize Class Properties.
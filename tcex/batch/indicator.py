@@ -11,52 +11,61 @@ from .tag import Tag
 # import local modules for dynamic reference
 module = __import__(__name__)
 
+# shared by all batch indicator objects (Utils holds no per object state)
+_utils = Utils()
+
+# map of snake case arg names to batch field names
+_metadata_map = {
+    'date_added': 'dateAdded',
+    'dnsActive': 'flag1',
+    'dns_active': 'flag1',
+    'last_modified': 'lastModified',
+    'private_flag': 'privateFlag',
+    'size': 'intValue1',
+    'whoisActive': 'flag2',
+    'whois_active': 'flag2',
+}
+
 
 def custom_indicator_class_factory(indicator_type, base_class, class_dict, value_fields):
     """Internal method for dynamically building Custom Indicator Class."""
     value_count = len(value_fields)
 
-    def init_1(self, tcex, value1, xid, **kwargs):  # pylint: disable=W0641
+    def init_1(self, value1, xid, **kwargs):  # pylint: disable=W0641
         """Init method for Custom Indicator Types with one value"""
         summary = self.build_summary(value1)  # build the indicator summary
-        base_class.__init__(self, tcex, indicator_type, summary, xid, **kwargs)
-        for k, v in class_dict.items():
-            setattr(self, k, v)
+        base_class.__init__(self, indicator_type, summary, xid=xid, **kwargs)
 
-    def init_2(self, tcex, value1, value2, xid, **kwargs):  # pylint: disable=W0641
+    def init_2(self, value1, value2, xid, **kwargs):  # pylint: disable=W0641
         """Init method for Custom Indicator Types with two values."""
         summary = self.build_summary(value1, value2)  # build the indicator summary
-        base_class.__init__(self, tcex, indicator_type, summary, xid, **kwargs)
-        for k, v in class_dict.items():
-            setattr(self, k, v)
+        base_class.__init__(self, indicator_type, summary, xid=xid, **kwargs)
 
-    def init_3(self, tcex, value1, value2, value3, xid, **kwargs):  # pylint: disable=W0641
+    def init_3(self, value1, value2, value3, xid, **kwargs):  # pylint: disable=W0641
         """Init method for Custom Indicator Types with three values."""
         summary = self.build_summary(value1, value2, value3)  # build the indicator summary
-        base_class.__init__(self, tcex, indicator_type, summary, xid, **kwargs)
-        for k, v in class_dict.items():
-            setattr(self, k, v)
+        base_class.__init__(self, indicator_type, summary, xid=xid, **kwargs)
 
     class_name = indicator_type.replace(' ', '')
     init_method = locals()['init_{}'.format(value_count)]
-    newclass = type(str(class_name), (base_class,), {'__init__': init_method})
+    # class_dict values are shared class attributes, instances remain slotted
+    class_attrs = dict(class_dict)
+    class_attrs.update({'__init__': init_method, '__slots__': []})
+    newclass = type(str(class_name), (base_class,), class_attrs)
     return newclass
 
 
 class Indicator(object):
     """ThreatConnect Batch Indicator Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = [
-    #     '_attributes',
-    #     '_file_actions',
-    #     '_indicator_data',
-    #     '_labels',
-    #     '_occurrences',
-    #     '_summary',
-    #     '_tags',
-    #     '_type',
-    #     '_utils']
+    __slots__ = [
+        '_attributes',
+        '_file_actions',
+        '_indicator_data',
+        '_labels',
+        '_occurrences',
+        '_tags',
+    ]
 
     def __init__(self, indicator_type, summary, **kwargs):
         """Initialize Class Properties.
@@ -72,9 +81,6 @@ class Indicator(object):
             rating (str, kwargs): The threat rating for this Indicator.
             xid (str, kwargs): The external id for this Indicator.
         """
-        self._utils = Utils()
-        self._summary = summary
-        self._type = indicator_type
         self._indicator_data = {'summary': summary, 'type': indicator_type}
         # process all kwargs and update metadata field names
         for arg, value in kwargs.items():
@@ -82,25 +88,12 @@ class Indicator(object):
         # set xid to random and unique uuid4 value if not provided
         if kwargs.get('xid') is None:
             self._indicator_data['xid'] = str(uuid.uuid4())
-        self._attributes = []
-        self._file_actions = []
-        self._labels = []
-        self._occurrences = []
-        self._tags = []
-
-    @property
-    def _metadata_map(self):
-        """Return metadata map for Indicator objects."""
-        return {
-            'date_added': 'dateAdded',
-            'dnsActive': 'flag1',
-            'dns_active': 'flag1',
-            'last_modified': 'lastModified',
-            'private_flag': 'privateFlag',
-            'size': 'intValue1',
-            'whoisActive': 'flag2',
-            'whois_active': 'flag2',
-        }
+        # child object lists are only created when a child is added
+        self._attributes = None
+        self._file_actions = None
+        self._labels = None
+        self._occurrences = None
+        self._tags = None
 
     def add_key_value(self, key, value):
         """Add custom field to Indicator object.
@@ -116,9 +109,9 @@ class Indicator(object):
             key (str): The field key to add to the JSON batch data.
             value (str): The field value to add to the JSON batch data.
         """
-        key = self._metadata_map.get(key, key)
+        key = _metadata_map.get(key, key)
         if key in ['dateAdded', 'lastModified']:
-            self._indicator_data[key] = self._utils.format_datetime(
+            self._indicator_data[key] = _utils.format_datetime(
                 value, date_format='%Y-%m-%dT%H:%M:%SZ'
             )
         elif key == 'confidence':
@@ -136,7 +129,7 @@ class Indicator(object):
     @active.setter
     def active(self, active):
         """Set Indicator active."""
-        self._indicator_data['active'] = self._utils.to_bool(active)
+        self._indicator_data['active'] = _utils.to_bool(active)
 
     def association(self, group_xid):
         """Add association using xid value.
@@ -171,6 +164,8 @@ class Indicator(object):
             obj: An instance of Attribute.
         """
         attr = Attribute(attr_type, attr_value, displayed, source, formatter)
+        if self._attributes is None:
+            self._attributes = []
         if unique == 'Type':
             for attribute_data in self._attributes:
                 if attribute_data.type == attr_type:
@@ -255,7 +250,7 @@ class Indicator(object):
     @date_added.setter
     def date_added(self, date_added):
         """Set Indicator dateAdded."""
-        self._indicator_data['dateAdded'] = self._utils.format_datetime(
+        self._indicator_data['dateAdded'] = _utils.format_datetime(
             date_added, date_format='%Y-%m-%dT%H:%M:%SZ'
         )
 
@@ -267,7 +262,7 @@ class Indicator(object):
     @last_modified.setter
     def last_modified(self, last_modified):
         """Set Indicator lastModified."""
-        self._indicator_data['lastModified'] = self._utils.format_datetime(
+        self._indicator_data['lastModified'] = _utils.format_datetime(
             last_modified, date_format='%Y-%m-%dT%H:%M:%SZ'
         )
 
@@ -287,6 +282,8 @@ class Indicator(object):
             return None
 
         occurrence_obj = FileOccurrence(file_name, path, date)
+        if self._occurrences is None:
+            self._occurrences = []
         self._occurrences.append(occurrence_obj)
         return occurrence_obj
 
@@ -298,7 +295,7 @@ class Indicator(object):
     @private_flag.setter
     def private_flag(self, private_flag):
         """Set Indicator private flag."""
-        self._indicator_data['privateFlag'] = self._utils.to_bool(private_flag)
+        self._indicator_data['privateFlag'] = _utils.to_bool(private_flag)
 
     @property
     def rating(self):
@@ -330,6 +327,8 @@ class Indicator(object):
             obj: An instance of SecurityLabel.
         """
         label = SecurityLabel(name, description, color)
+        if self._labels is None:
+            self._labels = []
         for label_data in self._labels:
             if label_data.name == name:
                 label = label_data
@@ -350,6 +349,8 @@ class Indicator(object):
             obj: An instance of Tag.
         """
         tag = Tag(name, formatter)
+        if self._tags is None:
+            self._tags = []
         for tag_data in self._tags:
             if tag_data.name == name:
                 tag = tag_data
@@ -376,8 +377,7 @@ class Indicator(object):
 class Address(Indicator):
     """ThreatConnect Batch Address Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, ip, **kwargs):
         """Initialize Class Properties.
@@ -398,8 +398,7 @@ class Address(Indicator):
 class ASN(Indicator):
     """ThreatConnect Batch ASN Object."""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, as_number, **kwargs):
         """Initialize Class Properties.
@@ -420,8 +419,7 @@ class ASN(Indicator):
 class CIDR(Indicator):
     """ThreatConnect Batch CIDR Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, block, **kwargs):
         """Initialize Class Properties.
@@ -442,8 +440,7 @@ class CIDR(Indicator):
 class EmailAddress(Indicator):
     """ThreatConnect Batch EmailAddress Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, address, **kwargs):
         """Initialize Class Properties.
@@ -464,8 +461,7 @@ class EmailAddress(Indicator):
 class File(Indicator):
     """ThreatConnect Batch File Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, md5=None, sha1=None, sha256=None, **kwargs):
         """Initialize Class Properties.
@@ -490,6 +486,8 @@ class File(Indicator):
     def action(self, relationship):
         """Add a File Action."""
         action_obj = FileAction(self._indicator_data.get('xid'), relationship)
+        if self._file_actions is None:
+            self._file_actions = []
         self._file_actions.append(action_obj)
         return action_obj
 
@@ -537,8 +535,7 @@ class File(Indicator):
 class Host(Indicator):
     """ThreatConnect Batch Host Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, hostname, **kwargs):
         """Initialize Class Properties.
@@ -581,8 +578,7 @@ class Host(Indicator):
 class Mutex(Indicator):
     """ThreatConnect Batch Mutex Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, mutex, **kwargs):
         """Initialize Class Properties.
@@ -603,8 +599,7 @@ class Mutex(Indicator):
 class RegistryKey(Indicator):
     """ThreatConnect Batch Registry Key Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, key_name, value_name, value_type, **kwargs):
         """Initialize Class Properties.
@@ -628,8 +623,7 @@ class RegistryKey(Indicator):
 class URL(Indicator):
     """ThreatConnect Batch URL Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, text, **kwargs):
         """Initialize Class Properties.
@@ -650,8 +644,7 @@ class URL(Indicator):
 class UserAgent(Indicator):
     """ThreatConnect Batch User Agent Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = []
+    __slots__ = []
 
     def __init__(self, text, **kwargs):
         """Initialize Class Properties.
@@ -672,8 +665,7 @@ class UserAgent(Indicator):
 class FileAction(object):
     """ThreatConnect Batch FileAction Object"""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = ['_action_data', '_children', 'xid']
+    __slots__ = ['_action_data', '_children', 'xid']
 
     def __init__(self, parent_xid, relationship):
         """Initialize Class Properties.
@@ -690,7 +682,7 @@ class FileAction(object):
             'relationship': relationship,
             'parentIndicatorXid': parent_xid,
         }
-        self._children = []
+        self._children = None
 
     @property
     def data(self):
@@ -703,6 +695,8 @@ class FileAction(object):
     def action(self, relationship):
         """Add a nested File Action."""
         action_obj = FileAction(self.xid, relationship)
+        if self._children is None:
+            self._children = []
         self._children.append(action_obj)
 
     def __str__(self):
@@ -713,8 +707,7 @@ class FileAction(object):
 class FileOccurrence(object):
     """ThreatConnect Batch FileAction Object."""
 
-    # TODO: enable when support for py2 is dropped.
-    # __slots__ = ['_occurrence_data', '_utils']
+    __slots__ = ['_occurrence_data']
 
     def __init__(self, file_name=None, path=None, date=None):
         """Initialize Class Properties
@@ -724,14 +717,13 @@ class FileOccurrence(object):
             path (str, optional): The file path for this occurrence.
             date (str, optional): The datetime expression for this occurrence.
         """
-        self._utils = Utils()
         self._occurrence_data = {}
         if file_name is not None:
             self._occurrence_data['fileName'] = file_name
         if path is not None:
             self._occurrence_data['path'] = path
         if date is not None:
-            self._occurrence_data['date'] = self._utils.format_datetime(
+            self._occurrence_data['date'] = _utils.format_datetime(
                 date, date_format='%Y-%m-%dT%H:%M:%SZ'
             )
 
@@ -748,7 +740,7 @@ class FileOccurrence(object):
     @date.setter
     def date(self, date):
         """Set File Occurrence date."""
-        self._occurrence_data['date'] = self._utils.format_datetime(
+        self._occurrence_data['date'] = _utils.format_datetime(
             date, date_format='%Y-%m-%dT%H:%M:%SZ'
         )
 
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""ThreatConnect Batch Spill Store Module."""
+import dbm
+import json
+import os
+import shelve
+
+
+class SpillStore(object):
+    """Append-only log of serialized batch entities with an in-memory xid index.
+
+    Each entity is written once as a line of JSON and an index of xid to file offset/length is
+    kept in memory, giving O(1) lookup by xid and sequential reads in insertion order. Deleting
+    an entity appends a small tombstone record so that a saved log can be reopened (debugging)
+    with the same contents.
+
+    Record format (one per line)::
+
+        S\\t{"xid": "...", "type": "...", ...}
+        D\\t"<xid>"
+
+    Args:
+        fqfn (str): The fully qualified filename of the log file.
+    """
+
+    def __init__(self, fqfn):
+        """Initialize Class Properties."""
+        self.fqfn = fqfn
+        self._index = {}
+        self._fh = open(self.fqfn, 'a+b')
+        self._size = 0
+        self._load()
+
+    def _load(self):
+        """Rebuild the index from an existing log file."""
+        self._fh.seek(0)
+        offset = 0
+        for line in self._fh:
+            op, payload = line[:2], line[2:-1]
+            if op == b'S\t':
+                xid = json.loads(payload.decode('utf-8')).get('xid')
+                self._index[xid] = (offset + 2, len(payload))
+            elif op == b'D\t':
+                self._index.pop(json.loads(payload.decode('utf-8')), None)
+            offset += len(line)
+        self._size = offset
+
+    def _append(self, record):
+        """Append a record to the end of the log and return its offset."""
+        offset = self._size
+        self._fh.write(record)
+        self._size += len(record)
+        return offset
+
+    def close(self):
+        """Close the log file."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def get(self, xid, default=None):
+        """Return the entity dict for the provided xid.
+
+        Args:
+            xid (str): The xid of the entity.
+            default (any, optional): The value to return if the xid is not found.
+
+        Returns:
+            dict: The entity data.
+        """
+        raw = self.get_raw(xid)
+        if raw is None:
+            return default
+        return json.loads(raw.decode('utf-8'))
+
+    def get_raw(self, xid):
+        """Return the serialized entity JSON for the provided xid.
+
+        Args:
+            xid (str): The xid of the entity.
+
+        Returns:
+            bytes: The entity JSON or None if the xid is not found.
+        """
+        location = self._index.get(xid)
+        if location is None:
+            return None
+        offset, length = location
+        self._fh.seek(offset)
+        return self._fh.read(length)
+
+    def items(self):
+        """Yield xid and entity dict for all entities in insertion order."""
+        for xid in list(self._index):
+            yield xid, self.get(xid)
+
+    def keys(self):
+        """Return all xids in insertion order."""
+        return self._index.keys()
+
+    def pop(self, xid, *default):
+        """Remove and return the entity dict for the provided xid."""
+        if xid not in self._index and default:
+            return default[0]
+        data = self[xid]
+        del self[xid]
+        return data
+
+    def pop_raw(self, xid):
+        """Remove and return the serialized entity JSON for the provided xid."""
+        raw = self.get_raw(xid)
+        if raw is not None:
+            del self[xid]
+        return raw
+
+    def values(self):
+        """Yield the entity dict for all entities in insertion order."""
+        for _, data in self.items():
+            yield data
+
+    def __contains__(self, xid):
+        """Return True if the xid is in the store."""
+        return xid in self._index
+
+    def __delitem__(self, xid):
+        """Delete the entity with the provided xid."""
+        del self._index[xid]
+        self._append('D\t{}\n'.format(json.dumps(xid)).encode('utf-8'))
+
+    def __getitem__(self, xid):
+        """Return the entity dict for the provided xid."""
+        data = self.get(xid)
+        if data is None:
+            raise KeyError(xid)
+        return data
+
+    def __len__(self):
+        """Return the number of entities in the store."""
+        return len(self._index)
+
+    def __setitem__(self, xid, data):
+        """Serialize and append the entity data for the provided xid.
+
+        Args:
+            xid (str): The xid of the entity.
+            data (dict|bytes): The entity dict or already serialized entity JSON.
+        """
+        if not isinstance(data, bytes):
+            data = json.dumps(data).encode('utf-8')
+        offset = self._append(b'S\t' + data + b'\n')
+        self._index[xid] = (offset + 2, len(data))
+
+
+def open_store(backend, fqfn):
+    """Return a spill store for the provided backend.
+
+    A store previously written by the shelve backend (e.g. a groups-saved or indicators-saved
+    file from an earlier debug run) is always reopened with shelve, so that it is not misread
+    as a log by the "log" backend.
+
+    Args:
+        backend (str|callable): The backend name ("log" or "shelve") or a callable that accepts
+            the filename and returns a dict-like object.
+        fqfn (str): The fully qualified filename for the store.
+
+    Returns:
+        object: A dict-like spill store.
+    """
+    if callable(backend):
+        return backend(fqfn)
+    if backend == 'shelve' or dbm.whichdb(fqfn):
+        return shelve.open(fqfn, writeback=False)
+    if backend == 'log':
+        return SpillStore(fqfn)
+    raise RuntimeError('Invalid spill store backend ({}).'.format(backend))
+
+
+def remove_store(fqfn):
+    """Remove any files created for the store (shelve may add a file extension)."""
+    directory, filename = os.path.split(fqfn)
+    if not os.path.isdir(directory):
+        return
+    for fn in os.listdir(directory):
+        if fn == filename or fn.startswith('{}.'.format(filename)):
+            os.remove(os.path.join(directory, fn))
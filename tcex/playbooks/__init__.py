@@ -2,3 +2,4 @@
 """Playbooks module for TcEx Framework"""
 # flake8: noqa
 from .playbooks import Playbooks
+from .playbooks_cache import PlaybookCache
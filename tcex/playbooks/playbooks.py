@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
 """TcEx Framework Playbook module"""
 import base64
+import io
 import json
 import re
 from collections import OrderedDict
+from contextlib import contextmanager
+
+from .playbooks_stream import MANIFEST_KEY, BinaryStreamReader, chunk_field, chunks, stream_manifest
 
 
 class Playbooks(object):
@@ -19,12 +23,15 @@ class Playbooks(object):
         self._db = None
         self._output_variables = {}
         self._output_variables_type = None
+        self._prefetched = None
         self.output_data = {}
 
         # match full variable
         self._variable_match = re.compile(r'^{}$'.format(self._variable_pattern))
         # capture variable parts (exactly a variable)
         self._variable_parse = re.compile(self._variable_pattern)
+        # JSON string escapes for embedded values
+        self._json_escapes = re.compile(r'\\(["\\bfnrt]|u[0-9a-fA-F]{4})')
         # match embedded variables without quotes (#App:7979:variable_name!StringArray)
         self._vars_keyvalue_embedded = re.compile(
             r'(?:\"\:\s?)[^\"]?{}'.format(self._variable_pattern)
@@ -57,6 +64,144 @@ class Playbooks(object):
             vt_key = '{}-{}'.format(variable_name, variable_type)
             self._output_variables_type[vt_key] = {'variable': o}
 
+    @contextmanager
+    def _prefetch(self, variables):
+        """Read the variables, and the variables embedded in their values, in batched reads.
+
+        The raw values are returned by _read_db until the block exits. Each level of nesting
+        (e.g. a String embedded in a KeyValue embedded in the input) is a single read_many call
+        (HMGET for Redis). Nested calls use the outer prefetch.
+
+        Args:
+            variables (list): The variables to read.
+        """
+        if self._prefetched is not None:
+            yield
+            return
+
+        self._prefetched = {}
+        try:
+            pending = list(variables)
+            while pending:
+                values = self.db.read_many(pending)
+                self._prefetched.update(zip(pending, values))
+                pending = list(
+                    OrderedDict.fromkeys(
+                        v.group(0)
+                        for value in values
+                        if value
+                        for v in re.finditer(self._variable_parse, value)
+                        if v.group(0) not in self._prefetched
+                    )
+                )
+            yield
+        finally:
+            self._prefetched = None
+
+    def _read_db(self, key):
+        """Return the raw value for the key from the prefetched values or the DB."""
+        if self._prefetched is not None and key in self._prefetched:
+            return self._prefetched.get(key)
+        return self.db.read(key)
+
+    def _write_db(self, key, value):
+        """Write the value for the key to the DB invalidating the cached values."""
+        self._invalidate()
+        return self.db.create(key, value)
+
+    def _embedded_value(self, key_type, val):
+        """Return the value to embed for a variable and whether surrounding quotes are replaced.
+
+        Args:
+            key_type (string): The embedded variable type.
+            val (any): The embedded variable value.
+
+        Returns:
+            (tuple): The string to embed and True if the surrounding quotes are replaced.
+        """
+        if val is None:
+            return '', False
+        if key_type == 'String':
+            # SUP-5067 - embedded string needs to have double quotes escaped (control characters
+            # are kept as is, e.g. a newline in the value is a newline in the result)
+            return val.replace('"', '\\"'), False
+        # JSON encode the value keeping control characters and backslashes as is
+        val = json.dumps(val, ensure_ascii=False)
+        return re.sub(self._json_escapes, self._json_unescape, val), True
+
+    def _invalidate(self):
+        """Remove the cached variable values for the current DB context."""
+        if self.tcex.playbook_cache is not None:
+            self.tcex.playbook_cache.invalidate(self._context)
+
+    @property
+    def _context(self):
+        """Return the current DB context (e.g. the Redis hash or service session id)."""
+        return getattr(self.db, 'key', None)
+
+    def _create_stream(self, key, values, chunk_size):
+        """Write the values in chunks followed by the manifest."""
+        previous = stream_manifest(self.db.read(key))
+        items = []
+        for item, value in enumerate(values):
+            if value is None:
+                items.append(None)
+                continue
+            count = 0
+            size = 0
+            for chunk in chunks(value, chunk_size):
+                field = chunk_field(key, item, count)
+                self._write_db(field, base64.b64encode(chunk).decode('utf-8'))
+                count += 1
+                size += len(chunk)
+            items.append({'chunks': count, 'size': size})
+
+        # the manifest is written last so the chunks of a new value are never read partially
+        manifest = {MANIFEST_KEY: 1, 'items': items}
+        data = self._write_db(key, json.dumps(manifest))
+        self._delete_chunks(key, previous, manifest)
+        return data
+
+    @staticmethod
+    def _decode_binary(data):
+        """Decode bytes to a string."""
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:
+            # for data written an upstream java App
+            return data.decode('latin-1')
+
+    @staticmethod
+    def _chunk_fields(key, manifest):
+        """Return the DB fields of all chunks in the manifest."""
+        fields = []
+        for item, value in enumerate((manifest or {}).get('items', [])):
+            if value is not None:
+                fields.extend(chunk_field(key, item, index) for index in range(value['chunks']))
+        return fields
+
+    def _delete_chunks(self, key, manifest, keep=None):
+        """Delete the chunks of a streamed value that are not part of the keep manifest."""
+        delete = getattr(self.db, 'delete', None)
+        if delete is None:
+            # the key/value API does not support deletes
+            return
+        kept = set(self._chunk_fields(key, keep))
+        for field in self._chunk_fields(key, manifest):
+            if field not in kept:
+                delete(field)
+
+    def _stream_readers(self, key, manifest):
+        """Return a reader for each value in the manifest (None for None values)."""
+        readers = []
+        for item, value in enumerate(manifest.get('items', [])):
+            if value is None:
+                readers.append(None)
+                continue
+            fields = [chunk_field(key, item, index) for index in range(value['chunks'])]
+            readers.append(BinaryStreamReader(self.db.read, fields, value['size']))
+        return readers
+
     @property
     def _variable_pattern(self):
         """Regex pattern to match and parse a playbook variable."""
@@ -322,6 +467,10 @@ class Playbooks(object):
         """
         data = None
         if key is not None:
+            self._invalidate()
+            if self.variable_type(key) in ['Binary', 'BinaryArray']:
+                # remove the chunks of a streamed value
+                self._delete_chunks(key.strip(), stream_manifest(self.db.read(key.strip())))
             data = self.db.delete(key.strip())
         else:
             self.tcex.log.warning(u'The key field was None.')
@@ -410,19 +559,26 @@ class Playbooks(object):
         data = key
         if key is not None:
             key = key.strip()
-            key_type = self.variable_type(key)
             if re.match(self._variable_match, key):
-                # only log key if it's a variable
-                self.tcex.log.debug('read variable {}'.format(key))
-                if key_type in self.read_data_types:
-                    # handle types with embedded variable
-                    if key_type in ['Binary', 'BinaryArray']:
-                        data = self.read_data_types[key_type](key)
-                    else:
-                        data = self.read_data_types[key_type](key, embedded)
+                # only variables are cached (literal values are returned as is)
+                cache = self.tcex.playbook_cache
+                cached = None
+                if cache is not None:
+                    # decoded values are cached per DB context (execution or service session)
+                    cached = cache.get(self._context, (key, embedded))
+
+                if cached is not None:
+                    data = cached
                 else:
-                    data = self.read_raw(key)
+                    data = self._read_variable(key, embedded)
+                    if cache is not None and self.variable_type(key) not in [
+                        'Binary',
+                        'BinaryArray',
+                    ]:
+                        # binary values can be large, only the decoded text values are cached
+                        cache.set(self._context, (key, embedded), data)
             else:
+                key_type = self.variable_type(key)
                 if key_type == 'String':
                     # replace "\s" with a space only for user input.
                     # using '\\s' will prevent replacement.
@@ -445,6 +601,26 @@ class Playbooks(object):
         # self.tcex.log.debug(u'read data {}'.format(self.tcex.s(data)))
         return data
 
+    def _read_variable(self, key, embedded):
+        """Read the variable from the DB using the read method for the variable type.
+
+        Args:
+            key (string): The variable to read from the DB.
+            embedded (boolean): Resolve embedded variables.
+
+        Returns:
+            (any): Results retrieved from DB
+        """
+        key_type = self.variable_type(key)
+        # only log key if it's a variable
+        self.tcex.log.debug('read variable {}'.format(key))
+        if key_type in ['Binary', 'BinaryArray']:
+            return self.read_data_types[key_type](key)
+        if key_type in self.read_data_types:
+            # handle types with embedded variable
+            return self.read_data_types[key_type](key, embedded)
+        return self.read_raw(key)
+
     def read_array(self, key, embedded=True):
         """Read playbook variable and return array for any variable type.
 
@@ -521,25 +697,38 @@ class Playbooks(object):
         if data is None:
             return data
 
-        # iterate all matching variables
-        for var in (v.group(0) for v in re.finditer(self._variable_parse, str(data))):
-            self.tcex.log.debug(
-                'embedded variable: {}, parent_var_type: {}'.format(var, parent_var_type)
-            )
-            key_type = self.variable_type(var)
-            val = self.read(var)
-
-            if val is None:
-                val = ''
-            elif key_type == 'String':
-                # SUP-5067 - embedded string needs to have newline escaped and double quotes removed
-                val = json.dumps(val)[1:-1]
-            elif key_type != 'String':
-                var = r'"?{}"?'.format(var)  # replace quotes if they exist
-                val = json.dumps(val)
-
-            data = re.sub(var, val, data)
-        return data
+        # tokenize the data once, then stream the literal segments and the resolved values
+        text = str(data)
+        matches = list(re.finditer(self._variable_parse, text))
+        if not matches:
+            return data
+
+        # resolve each unique variable once using batched reads
+        values = {}
+        variables = OrderedDict((m.group(0), m.group(4)) for m in matches)
+        with self._prefetch(list(variables)):
+            for var, key_type in variables.items():
+                self.tcex.log.debug(
+                    'embedded variable: {}, parent_var_type: {}'.format(var, parent_var_type)
+                )
+                values[var] = self._embedded_value(key_type, self.read(var))
+
+        segments = []
+        position = 0
+        for m in matches:
+            val, unquote = values[m.group(0)]
+            start, end = m.span()
+            if unquote:
+                # replace quotes if they exist
+                if start > position and text[start - 1] == '"':
+                    start -= 1
+                if end < len(text) and text[end] == '"':
+                    end += 1
+            segments.append(text[position:start])
+            segments.append(val)
+            position = end
+        segments.append(text[position:])
+        return ''.join(segments)
 
     def variable_type(self, variable):
         """Get the Type from the variable string or default to String type.
@@ -599,9 +788,14 @@ class Playbooks(object):
         return data
 
     def write_output(self):
-        """Write all stored output data to storage."""
-        for data in self.output_data.values():
-            self.create_output(data.get('key'), data.get('value'), data.get('type'))
+        """Write all stored output data to storage.
+
+        The requested outputs are buffered and written in a single batch (one pipelined round
+        trip for Redis).
+        """
+        with self.db.batch():
+            for data in self.output_data.values():
+                self.create_output(data.get('key'), data.get('value'), data.get('type'))
 
     #
     # db methods
@@ -627,14 +821,14 @@ class Playbooks(object):
                 # py2
                 # convert to bytes as required for b64encode
                 # decode bytes for json serialization as required for json dumps
-                data = self.db.create(
+                data = self._write_db(
                     key.strip(), json.dumps(base64.b64encode(bytes(value)).decode('utf-8'))
                 )
             except TypeError:
                 # py3
                 # set encoding on string and convert to bytes as required for b64encode
                 # decode bytes for json serialization as required for json dumps
-                data = self.db.create(
+                data = self._write_db(
                     key.strip(), json.dumps(base64.b64encode(bytes(value, 'utf-8')).decode('utf-8'))
                 )
         else:
@@ -654,19 +848,23 @@ class Playbooks(object):
         """
         data = None
         if key is not None:
-            data = self.db.read(key.strip())
-            if data is not None:
+            data = self._read_db(key.strip())
+            manifest = stream_manifest(data)
+            if manifest is not None:
+                # streamed value, join the chunks
+                data = self._stream_readers(key.strip(), manifest)[0].readall()
+                if not b64decode:
+                    data = base64.b64encode(data).decode('utf-8')
+                elif decode:
+                    data = self._decode_binary(data)
+            elif data is not None:
                 data = json.loads(data)
                 if b64decode:
                     # if requested decode the base64 string
                     data = base64.b64decode(data)
                     if decode:
-                        try:
-                            # if requested decode bytes to a string
-                            data = data.decode('utf-8')
-                        except UnicodeDecodeError:
-                            # for data written an upstream java App
-                            data = data.decode('latin-1')
+                        # if requested decode bytes to a string
+                        data = self._decode_binary(data)
         else:
             self.tcex.log.warning(u'The key field was None.')
         return data
@@ -697,7 +895,7 @@ class Playbooks(object):
                         # decode bytes for json serialization as required for json dumps
                         v = base64.b64encode(bytes(v, 'utf-8')).decode('utf-8')
                 value_encoded.append(v)
-            data = self.db.create(key.strip(), json.dumps(value_encoded))
+            data = self._write_db(key.strip(), json.dumps(value_encoded))
         else:
             self.tcex.log.warning(u'The key or value field was None.')
         return data
@@ -715,8 +913,19 @@ class Playbooks(object):
         """
         data = None
         if key is not None:
-            data = self.db.read(key.strip())
-            if data is not None:
+            data = self._read_db(key.strip())
+            manifest = stream_manifest(data)
+            if manifest is not None:
+                # streamed value, join the chunks of each value
+                data = []
+                for reader in self._stream_readers(key.strip(), manifest):
+                    d = reader.readall() if reader is not None else None
+                    if d is not None and not b64decode:
+                        d = base64.b64encode(d).decode('utf-8')
+                    elif d is not None and decode:
+                        d = self._decode_binary(d)
+                    data.append(d)
+            elif data is not None:
                 data_decoded = []
                 for d in json.loads(data, object_pairs_hook=OrderedDict):
                     if d is not None and b64decode:
@@ -724,17 +933,111 @@ class Playbooks(object):
                         d = base64.b64decode(d)
                         if decode:
                             # if requested decode bytes to a string
-                            try:
-                                d = d.decode('utf-8')
-                            except UnicodeDecodeError:
-                                # for data written an upstream java App
-                                d = d.decode('latin-1')
+                            d = self._decode_binary(d)
                     data_decoded.append(d)
                 data = data_decoded
         else:
             self.tcex.log.warning(u'The key field was None.')
         return data
 
+    def create_binary_stream(self, key, value, chunk_size=1048576):
+        """Create method of CRUD operation for binary data written in chunks.
+
+        The value is read and base64 encoded one chunk at a time and each chunk is written to its
+        own DB field, followed by a manifest in the variable field. Streamed variables can only be
+        read by TcEx Apps (read_binary or read_binary_stream).
+
+        .. code-block:: python
+            :linenos:
+            :lineno-start: 1
+
+            with open('capture.pcap', 'rb') as fh:
+                tcex.playbook.create_binary_stream('#App:1234:pcap!Binary', fh)
+
+        Args:
+            key (string): The variable to write to the DB.
+            value (bytes|memoryview|file): A bytes-like value or file-like object opened in binary
+                mode.
+            chunk_size (int, default:1048576): The maximum number of bytes per chunk.
+
+        Returns:
+            (string): Result of DB write.
+        """
+        data = None
+        if key is not None and value is not None:
+            data = self._create_stream(key.strip(), [value], chunk_size)
+        else:
+            self.tcex.log.warning(u'The key or value field was None.')
+        return data
+
+    def create_binary_array_stream(self, key, value, chunk_size=1048576):
+        """Create method of CRUD operation for binary array data written in chunks.
+
+        Args:
+            key (string): The variable to write to the DB.
+            value (list): The bytes-like values or file-like objects opened in binary mode.
+            chunk_size (int, default:1048576): The maximum number of bytes per chunk.
+
+        Returns:
+            (string): Result of DB write.
+        """
+        data = None
+        if key is not None and value is not None:
+            data = self._create_stream(key.strip(), value, chunk_size)
+        else:
+            self.tcex.log.warning(u'The key or value field was None.')
+        return data
+
+    def read_binary_stream(self, key):
+        """Read method of CRUD operation for binary data returning a file-like object.
+
+        Streamed variables are read and decoded one chunk at a time as the data is consumed,
+        other Binary variables are decoded when read.
+
+        .. code-block:: python
+            :linenos:
+            :lineno-start: 1
+
+            reader = tcex.playbook.read_binary_stream('#App:1234:pcap!Binary')
+            with open('capture.pcap', 'wb') as fh:
+                shutil.copyfileobj(reader, fh)
+
+        Args:
+            key (string): The variable to read from the DB.
+
+        Returns:
+            (io.RawIOBase): The reader or None if the variable is not set.
+        """
+        readers = self.read_binary_array_stream(key)
+        if readers:
+            return readers[0]
+        return None
+
+    def read_binary_array_stream(self, key):
+        """Read method of CRUD operation for binary array data returning file-like objects.
+
+        Args:
+            key (string): The variable to read from the DB.
+
+        Returns:
+            (list): The readers (None for None values) or None if the variable is not set.
+        """
+        data = None
+        if key is not None:
+            data = self._read_db(key.strip())
+            manifest = stream_manifest(data)
+            if manifest is not None:
+                data = self._stream_readers(key.strip(), manifest)
+            elif data is not None:
+                # regular value, decode the whole value
+                data = json.loads(data, object_pairs_hook=OrderedDict)
+                if not isinstance(data, list):
+                    data = [data]
+                data = [io.BytesIO(base64.b64decode(d)) if d is not None else None for d in data]
+        else:
+            self.tcex.log.warning(u'The key field was None.')
+        return data
+
     def create_key_value(self, key, value):
         """Create method of CRUD operation for key/value data.
 
@@ -748,10 +1051,10 @@ class Playbooks(object):
         data = None
         if key is not None and value is not None:
             if isinstance(value, (dict, list)):
-                data = self.db.create(key.strip(), json.dumps(value))
+                data = self._write_db(key.strip(), json.dumps(value))
             else:
                 # used to save raw value with embedded variables
-                data = self.db.create(key.strip(), value)
+                data = self._write_db(key.strip(), value)
             # TODO: update for env servers
             # self.tcex.log.trace(
             #     'pb create: context: {}, key: {}, value: {}'.format(self.db.key, key, value)
@@ -773,7 +1076,7 @@ class Playbooks(object):
         data = None
         if key is not None:
             key_type = self.variable_type(key)
-            data = self.db.read(key.strip())
+            data = self._read_db(key.strip())
             # embedded variable can be unquoted, which breaks JSON.
             data = self.wrap_embedded_keyvalue(data)
             if embedded:
@@ -803,10 +1106,10 @@ class Playbooks(object):
         data = None
         if key is not None and value is not None:
             if isinstance(value, (dict, list)):
-                data = self.db.create(key.strip(), json.dumps(value))
+                data = self._write_db(key.strip(), json.dumps(value))
             else:
                 # used to save raw value with embedded variables
-                data = self.db.create(key.strip(), value)
+                data = self._write_db(key.strip(), value)
             # for MEO server there is no key value
             # self.tcex.log.trace(
             #     'pb create: context: {}, key: {}, value: {}'.format(self.db.key, key, value)
@@ -828,7 +1131,7 @@ class Playbooks(object):
         data = None
         if key is not None:
             key_type = self.variable_type(key)
-            data = self.db.read(key.strip())
+            data = self._read_db(key.strip())
             # embedded variable can be unquoted, which breaks JSON.
             data = self.wrap_embedded_keyvalue(data)
             if embedded:
@@ -857,7 +1160,7 @@ class Playbooks(object):
         """
         data = None
         if key is not None and value is not None:
-            data = self.db.create(key.strip(), value)
+            data = self._write_db(key.strip(), value)
         else:
             self.tcex.log.warning(u'The key or value field was None.')
         return data
@@ -873,7 +1176,7 @@ class Playbooks(object):
         """
         data = None
         if key is not None:
-            data = self.db.read(key.strip())
+            data = self._read_db(key.strip())
         else:
             self.tcex.log.warning(u'The key field was None.')
         return data
@@ -893,8 +1196,8 @@ class Playbooks(object):
             if isinstance(value, (bool, list, int, dict)):
                 # value = str(value)
                 value = u'{}'.format(value)
-            # data = self.db.create(key.strip(), str(json.dumps(value)))
-            data = self.db.create(key.strip(), u'{}'.format(json.dumps(value)))
+            # data = self._write_db(key.strip(), str(json.dumps(value)))
+            data = self._write_db(key.strip(), u'{}'.format(json.dumps(value)))
             # TODO: update for env servers
             # self.tcex.log.trace(
             #     'pb create: context: {}, key: {}, value: {}'.format(self.db.key, key, value)
@@ -916,7 +1219,7 @@ class Playbooks(object):
         data = None
         if key is not None:
             key_type = self.variable_type(key)
-            data = self.db.read(key.strip())
+            data = self._read_db(key.strip())
             if data is not None:
                 # handle improperly saved string
                 try:
@@ -948,10 +1251,10 @@ class Playbooks(object):
         data = None
         if key is not None and value is not None:
             if isinstance(value, (list)):
-                data = self.db.create(key.strip(), json.dumps(value))
+                data = self._write_db(key.strip(), json.dumps(value))
             else:
                 # used to save raw value with embedded variables
-                data = self.db.create(key.strip(), value)
+                data = self._write_db(key.strip(), value)
             # TODO: update for env servers
             # self.tcex.log.trace(
             #     'pb create: context: {}, key: {}, value: {}'.format(self.db.key, key, value)
@@ -973,7 +1276,7 @@ class Playbooks(object):
         data = None
         if key is not None:
             key_type = self.variable_type(key)
-            data = self.db.read(key.strip())
+            data = self._read_db(key.strip())
             if embedded:
                 data = self.read_embedded(data, key_type)
             if data is not None:
@@ -1001,7 +1304,7 @@ class Playbooks(object):
         """
         data = None
         if key is not None and value is not None:
-            data = self.db.create(key.strip(), json.dumps(value))
+            data = self._write_db(key.strip(), json.dumps(value))
             # TODO: update for env servers
             # self.tcex.log.trace(
             #     'pb create: context: {}, key: {}, value: {}'.format(self.db.key, key, value)
@@ -1023,7 +1326,7 @@ class Playbooks(object):
         data = None
         if key is not None:
             key_type = self.variable_type(key)
-            data = self.db.read(key.strip())
+            data = self._read_db(key.strip())
             if embedded:
                 # untested. this is not a current use case.
                 data = self.read_embedded(data, key_type)
@@ -1052,7 +1355,7 @@ class Playbooks(object):
         """
         data = None
         if key is not None and value is not None:
-            data = self.db.create(key.strip(), json.dumps(value))
+            data = self._write_db(key.strip(), json.dumps(value))
             # TODO: update for env servers
             # self.tcex.log.trace(
             #     'pb create: context: {}, key: {}, value: {}'.format(self.db.key, key, value)
@@ -1074,7 +1377,7 @@ class Playbooks(object):
         data = None
         if key is not None:
             key_type = self.variable_type(key)
-            data = self.db.read(key.strip())
+            data = self._read_db(key.strip())
             if embedded:
                 # untested. this is not a current use case.
                 data = self.read_embedded(data, key_type)
@@ -1094,6 +1397,15 @@ class Playbooks(object):
     # Static Methods
     #
 
+    @staticmethod
+    def _json_unescape(escape):
+        """Return the embedded text for a JSON string escape match (e.g. \\n as a newline)."""
+        char = escape.group(1)
+        if char[0] == 'u':
+            return chr(int(char[1:], 16))
+        escapes = {'"': '\\"', '\\': '\\', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+        return escapes[char]
+
     @staticmethod
     def entity_to_bulk(entities, resource_type_parent):
         """Convert Single TC Entity to Bulk format.
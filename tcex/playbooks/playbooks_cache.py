@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""TcEx Framework Playbook Variable Cache"""
+import json
+import threading
+from collections import OrderedDict
+
+
+class PlaybookCache(object):
+    """Size bounded LRU cache for decoded playbook variable values.
+
+    Values read with :py:meth:`Playbooks.read` are cached per DB context (the Redis hash for the
+    execution, or the session id in service Apps), so sessions sharing a Playbooks instance never
+    see each other's values. Any write or delete through Playbooks invalidates all cached values
+    for its context, since the cached values of other variables may embed the changed variable.
+
+    Strings are cached as is. Lists and dicts are cached JSON encoded and decoded on each hit,
+    so the caller can modify the returned value (json.loads is considerably faster than
+    copy.deepcopy for large arrays).
+
+    .. code-block:: python
+
+        tcex.playbook.read('#App:1234:input!String')  # HGET and json.loads
+        tcex.playbook.read('#App:1234:input!String')  # cached
+        tcex.log.debug('cache stats: {}'.format(tcex.playbook_cache.stats))
+
+    Args:
+        maxsize (int, default:1000): The maximum number of cached values.
+    """
+
+    def __init__(self, maxsize=1000):
+        """Initialize the Class properties."""
+        self._cache = OrderedDict()
+        self._contexts = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.maxsize = maxsize
+        self.misses = 0
+
+    def __len__(self):
+        """Return the number of cached values."""
+        return len(self._cache)
+
+    def _remove(self, key):
+        """Remove the key from the cache and the context index (lock must be held)."""
+        self._cache.pop(key, None)
+        keys = self._contexts.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._contexts[key[0]]
+
+    def clear(self):
+        """Remove all cached values."""
+        with self._lock:
+            self._cache.clear()
+            self._contexts.clear()
+
+    def get(self, context, key):
+        """Return the cached value (a new list or dict for JSON values) or None.
+
+        Args:
+            context (str): The DB context (e.g. the Redis hash).
+            key (tuple): The variable and read options.
+
+        Returns:
+            any: The cached value or None if not cached.
+        """
+        with self._lock:
+            entry = self._cache.get((context, key))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end((context, key))
+            self.hits += 1
+
+        value, object_pairs_hook = entry
+        if object_pairs_hook is False:
+            return value
+        # the caller may modify the returned list or dict
+        return json.loads(value, object_pairs_hook=object_pairs_hook)
+
+    def invalidate(self, context):
+        """Remove all cached values for the DB context.
+
+        Args:
+            context (str): The DB context (e.g. the Redis hash).
+        """
+        with self._lock:
+            for key in list(self._contexts.get(context, [])):
+                self._remove(key)
+
+    def set(self, context, key, value):
+        """Cache the value.
+
+        Args:
+            context (str): The DB context (e.g. the Redis hash).
+            key (tuple): The variable and read options.
+            value (any): The decoded variable value (None is not cached).
+        """
+        if value is None:
+            return
+        if isinstance(value, (bytes, str)):
+            # immutable values are returned as is
+            entry = (value, False)
+        else:
+            # KeyValue values are decoded with OrderedDict, keep the same type on a hit
+            items = value if isinstance(value, list) else [value]
+            object_pairs_hook = None
+            if any(isinstance(item, OrderedDict) for item in items):
+                object_pairs_hook = OrderedDict
+            try:
+                entry = (json.dumps(value), object_pairs_hook)
+            except (TypeError, ValueError):
+                # not a JSON value, don't cache
+                return
+        with self._lock:
+            self._remove((context, key))
+            self._cache[(context, key)] = entry
+            self._contexts.setdefault(context, set()).add((context, key))
+            while len(self._cache) > self.maxsize:
+                self._remove(next(iter(self._cache)))
+
+    @property
+    def stats(self):
+        """Return the cache hits, misses, and size."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache)}
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""TcEx Framework Playbook Binary Streams"""
+import base64
+import io
+import json
+
+# the key in the manifest identifying a streamed Binary or BinaryArray variable
+MANIFEST_KEY = 'tcexBinaryStream'
+
+
+def chunk_field(key, item, index):
+    """Return the DB field for a chunk of a streamed variable.
+
+    Args:
+        key (str): The variable (e.g. #App:1234:pcap!Binary).
+        item (int): The array index of the value (0 for Binary).
+        index (int): The chunk index.
+
+    Returns:
+        str: The field name.
+    """
+    return '{}:chunk:{}:{}'.format(key, item, index)
+
+
+def chunks(value, chunk_size):
+    """Yield the chunks of a value without copying the source data.
+
+    Args:
+        value (bytes|bytearray|memoryview|str|file): A bytes-like value, a string (UTF-8
+            encoded), or a file-like object opened in binary mode.
+        chunk_size (int): The maximum number of bytes per chunk.
+
+    Yields:
+        memoryview: The next chunk (only valid until the next chunk is requested).
+    """
+    if hasattr(value, 'readinto'):
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while True:
+            count = value.readinto(buffer)
+            if not count:
+                break
+            yield view[:count]
+    elif hasattr(value, 'read'):
+        while True:
+            data = value.read(chunk_size)
+            if not data:
+                break
+            if isinstance(data, str):
+                data = data.encode('utf-8')
+            yield memoryview(data)
+    else:
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        view = memoryview(value)
+        for start in range(0, len(view), chunk_size):
+            yield view[start : start + chunk_size]
+
+
+def stream_manifest(data):
+    """Return the manifest for a raw DB value or None for a regular (non streamed) value.
+
+    **Example Manifest**::
+
+        {"tcexBinaryStream": 1, "items": [{"chunks": 100, "size": 104857600}, null]}
+
+    Args:
+        data (str): The raw DB value.
+
+    Returns:
+        dict: The manifest or None.
+    """
+    # regular Binary values are a JSON string and BinaryArray values are a JSON array
+    if not isinstance(data, str) or not data.startswith('{'):
+        return None
+    try:
+        manifest = json.loads(data)
+    except ValueError:
+        return None
+    if isinstance(manifest, dict) and MANIFEST_KEY in manifest:
+        return manifest
+    return None
+
+
+class BinaryStreamReader(io.RawIOBase):
+    """Read only file-like object for a streamed Binary value.
+
+    The chunks are read from the DB and decoded one at a time as the data is consumed.
+
+    .. code-block:: python
+
+        reader = tcex.playbook.read_binary_stream('#App:1234:pcap!Binary')
+        with open('capture.pcap', 'wb') as fh:
+            shutil.copyfileobj(reader, fh)
+
+    Args:
+        read (callable): The DB read method returning the base64 encoded chunk for a field.
+        fields (list): The DB fields of the chunks in order.
+        size (int): The total number of bytes.
+    """
+
+    def __init__(self, read, fields, size):
+        """Initialize the Class properties."""
+        super(BinaryStreamReader, self).__init__()
+        self._buffer = memoryview(b'')
+        self._fields = list(fields)
+        self._index = 0
+        self._read = read
+        self.size = size
+
+    def _next_chunk(self):
+        """Return the next decoded chunk or None when all chunks have been read."""
+        if self._index >= len(self._fields):
+            return None
+        field = self._fields[self._index]
+        self._index += 1
+        data = self._read(field)
+        if data is None:
+            raise IOError('Missing chunk {} of streamed variable.'.format(field))
+        return base64.b64decode(data)
+
+    def readable(self):
+        """Return True as the stream supports reading."""
+        return True
+
+    def readall(self):
+        """Return all remaining bytes."""
+        data = [self._buffer.tobytes()]
+        self._buffer = memoryview(b'')
+        chunk = self._next_chunk()
+        while chunk is not None:
+            data.append(chunk)
+            chunk = self._next_chunk()
+        return b''.join(data)
+
+    def readinto(self, b):
+        """Read bytes into a pre-allocated, writable bytes-like object.
+
+        Args:
+            b (bytearray|memoryview): The buffer to fill.
+
+        Returns:
+            int: The number of bytes read (0 at the end of the stream).
+        """
+        while not self._buffer:
+            chunk = self._next_chunk()
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+        count = min(len(b), len(self._buffer))
+        b[:count] = self._buffer[:count]
+        self._buffer = self._buffer[count:]
+        return count
@@ -9,6 +9,8 @@ import re
 import shutil
 import uuid
 
+from ..utils import JsonArrayStream
+
 
 class Resources(object):
     """Common settings for All ThreatConnect API Endpoints"""
@@ -36,6 +38,7 @@ class Resources(object):
         self._http_method = 'GET'
         self._filters = []
         self._filter_or = False
+        self._incremental = False
         self._name = None
         self._parsable = False
         self._paginate = True
@@ -66,6 +69,10 @@ class Resources(object):
     def _request_bulk(self, response):
         """
         """
+        if self._incremental:
+            # decode the entities as they arrive instead of loading the entire download
+            return JsonArrayStream(response.iter_content(65536), [self.request_entity])
+
         try:
             # write bulk download to disk with unique ID
             temp_file = os.path.join(
@@ -178,16 +185,43 @@ class Resources(object):
     def _request_process_json_bulk(self, response_data):
         """Handle bulk JSON response
 
+        For incremental downloads the response data is a JsonArrayStream. The download is
+        decoded up to the first entity to check the status and the data is an iterator of the
+        entities.
+
         Return:
             (string): The response data
             (string): The response status
         """
         status = 'Failure'
+        if isinstance(response_data, JsonArrayStream):
+            data = []
+            # the array is empty or the download is an error response
+            if not response_data.start():
+                return data, status
+            if response_data.metadata.get('status', 'Success') == 'Success':
+                data = self._request_process_json_bulk_stream(response_data)
+                status = 'Success'
+            return data, status
+
         data = response_data.get(self.request_entity, [])
-        if data:
+        if data and response_data.get('status', 'Success') == 'Success':
             status = 'Success'
         return data, status
 
+    def _request_process_json_bulk_stream(self, entities):
+        """Yield the entities of an incremental bulk download.
+
+        Decode errors before the first entity are returned as a Failure status, errors after
+        the first entity are raised the same as a failed non incremental download.
+        """
+        try:
+            for entity in entities:
+                yield entity
+        except ValueError as e:
+            self.tcex.log.error(u'Error: ({})'.format(e))
+            self.tcex.handle_error(300, [e])
+
     def _request_process_json_standard(self, response_data):
         """Handle JSON response
 
@@ -1506,15 +1540,20 @@ class Bulk(Indicator):
         if ondemand:
             self._request.add_payload('runNow', True)
 
-    def json(self, ondemand=False):
+    def json(self, ondemand=False, incremental=False):
         """Update request URI to return JSON data.
 
         For onDemand bulk generation to work it must first be enabled in the
         ThreatConnect platform under System settings.
 
+        When incremental is enabled the request data is an iterator that decodes each
+        indicator as it is read from the response instead of a list of all indicators.
+
         Args:
             ondemand (boolean): Enable on demand bulk generation.
+            incremental (boolean): Decode the indicators incrementally.
         """
+        self._incremental = incremental
         self._request_entity = 'indicator'
         self._request_uri = '{}/{}'.format(self._api_uri, 'json')
         self._stream = True
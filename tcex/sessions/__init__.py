@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
 """Session module for TcEx Framework"""
 # flake8: noqa
+from .connection_pool import ConnectionPool
+from .instrumentation import Instrumentation
+from .rate_limiter import RateLimiter, TokenBucket
 from .tc_session import TcSession
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""ThreatConnect asyncio Session"""
+import asyncio
+
+import aiohttp
+import yarl
+from requests.models import PreparedRequest
+
+from .tc_session import TcSession
+
+
+class AsyncTcSession(object):
+    """ThreatConnect REST API asyncio Session.
+
+    Provides the same authorization, proxy, verify, and URL handling as :py:class:`TcSession`
+    using an aiohttp client, so a single thread can have many API requests in flight. The
+    response body is read before the response is returned, so ``await r.json()`` and ``r.text()``
+    can be used after the connection has been released.
+
+    .. code-block:: python
+
+        async with tcex.async_session as session:
+            r = await session.get('/v2/owners/mine')
+            data = await r.json()
+
+    Args:
+        tcex (TcEx): An instance of TcEx.
+        limit (int, default:100): The maximum number of simultaneous connections.
+        retries (int, default:3): The number of retries on connection errors or retry status codes.
+        backoff_factor (float, default:0.3): The back off factor between retries.
+        status_forcelist (tuple, default:(500, 502, 504)): The status codes to retry.
+        method_whitelist (frozenset, optional): The HTTP methods to retry, defaults to the
+            idempotent methods retried by urllib3 (a POST may have been processed before the
+            connection error or error status).
+    """
+
+    DEFAULT_METHOD_WHITELIST = frozenset(['DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT', 'TRACE'])
+
+    # share the authorization selection with the synchronous session
+    _configure_auth = TcSession._configure_auth
+    _service_app = TcSession._service_app
+    _token_available = TcSession._token_available
+
+    def __init__(
+        self,
+        tcex,
+        limit=100,
+        retries=3,
+        backoff_factor=0.3,
+        status_forcelist=(500, 502, 504),
+        method_whitelist=DEFAULT_METHOD_WHITELIST,
+    ):
+        """Initialize the Class properties."""
+        self.tcex = tcex
+        self._client = None
+
+        # properties
+        self.args = self.tcex.default_args
+        self.auth = None
+        self.backoff_factor = backoff_factor
+        self.headers = {'User-Agent': 'TcEx'}
+        self.limit = limit
+        self.method_whitelist = method_whitelist
+        self.proxy = None
+        self.retries = retries
+        self.status_forcelist = status_forcelist
+        self.token = self.tcex.token
+
+        # Set Proxy
+        if self.args.tc_proxy_tc:
+            self.proxy = self.tcex.proxies.get('https')
+            self.tcex.log.trace(
+                'Using proxy host {}:{} for ThreatConnect API.'.format(
+                    self.args.tc_proxy_host, self.args.tc_proxy_port
+                )
+            )
+
+        # Set Verify
+        self.verify = self.args.tc_verify
+
+    async def __aenter__(self):
+        """Enter the async context."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Close the client on exit of the async context."""
+        await self.close()
+
+    @property
+    def client(self):
+        """Return the aiohttp client session (created in the running event loop)."""
+        if self._client is None or self._client.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit)
+            self._client = aiohttp.ClientSession(connector=connector, headers=self.headers)
+        return self._client
+
+    async def close(self):
+        """Close the aiohttp client session."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def request(self, method, url, params=None, headers=None, retry=None, **kwargs):
+        """Send an API request.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The API path (e.g. /v2/owners) or full URL.
+            params (dict, optional): The query parameters.
+            headers (dict, optional): Additional request headers.
+            retry (bool, optional): If True retry the request regardless of the method (e.g. for
+                a POST that is safe to repeat), if False never retry. Defaults to retrying the
+                methods in the method whitelist.
+            kwargs: Additional arguments passed to aiohttp (e.g. json or data).
+
+        Returns:
+            aiohttp.ClientResponse: The response with the body already read.
+        """
+        if self.auth is None:
+            self._configure_auth()
+
+        if not url.startswith('https'):
+            url = '{}{}'.format(self.args.tc_api_path, url)
+
+        # encode the url the same as requests so the signed path matches the sent path
+        prepared = PreparedRequest()
+        prepared.prepare_url(url, params)
+        url = yarl.URL(prepared.url, encoded=True)
+
+        if not self.verify:
+            kwargs['ssl'] = False
+
+        retries = 0
+        if retry or (retry is None and method.upper() in self.method_whitelist):
+            retries = self.retries
+
+        attempt = 0
+        while True:
+            request_headers = dict(headers or {})
+            request_headers.update(self.auth.authorization(prepared.path_url, method.upper()))
+            try:
+                r = await self.client.request(
+                    method, url, headers=request_headers, proxy=self.proxy, **kwargs
+                )
+                await r.read()
+                if r.status not in self.status_forcelist or attempt >= retries:
+                    return r
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= retries:
+                    raise
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+            attempt += 1
+
+    async def delete(self, url, **kwargs):
+        """Send a DELETE request."""
+        return await self.request('DELETE', url, **kwargs)
+
+    async def get(self, url, **kwargs):
+        """Send a GET request."""
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        """Send a POST request."""
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        """Send a PUT request."""
+        return await self.request('PUT', url, **kwargs)
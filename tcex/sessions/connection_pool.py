@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""ThreatConnect Shared Connection Pool"""
+import threading
+
+from requests import adapters
+from urllib3 import PoolManager
+
+from .instrumentation import pool_classes_by_scheme
+
+
+class ConnectionPool(object):
+    """Connection pools shared by all TcEx sessions.
+
+    Each session mounts its own :py:class:`PooledHTTPAdapter` (so retries can differ per
+    session), but all adapters use the same urllib3 PoolManager, so keep-alive connections to
+    the ThreatConnect API are reused across TcSession, session_external, and TcExRequest.
+
+    Args:
+        pool_connections (int, default:10): The number of host pools to cache.
+        pool_maxsize (int, default:10): The maximum number of connections kept per host.
+        pool_block (bool, default:False): If True requests wait for a free connection instead of
+            opening a connection that is discarded after use when the pool is full.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False):
+        """Initialize the Class properties."""
+        self._lock = threading.Lock()
+        self._poolmanager = None
+        self.active = 0
+        self.peak = 0
+        self.pool_block = pool_block
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.requests = 0
+
+    def acquire(self):
+        """Record the start of a request."""
+        with self._lock:
+            self.active += 1
+            self.requests += 1
+            self.peak = max(self.peak, self.active)
+
+    def adapter(self, max_retries=0):
+        """Return an adapter that uses the shared pools.
+
+        Args:
+            max_retries (int|Retry, default:0): The retry configuration for the adapter.
+
+        Returns:
+            PooledHTTPAdapter: The adapter to mount on a session.
+        """
+        return PooledHTTPAdapter(self, max_retries=max_retries)
+
+    def configure(self, pool_connections=None, pool_maxsize=None, pool_block=None):
+        """Update the pool sizes.
+
+        Pools that already exist are closed and recreated with the new size on next use.
+
+        Args:
+            pool_connections (int, optional): The number of host pools to cache.
+            pool_maxsize (int, optional): The maximum number of connections kept per host.
+            pool_block (bool, optional): If True requests wait for a free connection.
+        """
+        with self._lock:
+            if pool_connections is not None:
+                self.pool_connections = pool_connections
+            if pool_maxsize is not None:
+                self.pool_maxsize = pool_maxsize
+            if pool_block is not None:
+                self.pool_block = pool_block
+            if self._poolmanager is not None:
+                self._poolmanager.clear()
+                self._poolmanager = None
+
+    @property
+    def poolmanager(self):
+        """Return the shared urllib3 PoolManager."""
+        if self._poolmanager is None:
+            with self._lock:
+                if self._poolmanager is None:
+                    self._poolmanager = PoolManager(
+                        num_pools=self.pool_connections,
+                        maxsize=self.pool_maxsize,
+                        block=self.pool_block,
+                    )
+                    # record connect and TLS timings for instrumented requests
+                    self._poolmanager.pool_classes_by_scheme = pool_classes_by_scheme
+        return self._poolmanager
+
+    def release(self):
+        """Record the end of a request."""
+        with self._lock:
+            self.active -= 1
+
+    @property
+    def stats(self):
+        """Return the pool utilization counters.
+
+        **Example Response**
+        ::
+
+            {
+                "active": 2,
+                "peak": 12,
+                "requests": 1250,
+                "pools": [
+                    {
+                        "host": "api.threatconnect.com",
+                        "connections": 12,
+                        "idle": 10,
+                        "maxsize": 10,
+                        "port": 443,
+                        "requests": 1250,
+                        "scheme": "https"
+                    }
+                ]
+            }
+
+        The connections value is the number of connections opened for the host. When it is much
+        larger than maxsize, connections are being discarded because the pool is full and
+        pool_maxsize should be increased.
+
+        Returns:
+            dict: The utilization counters.
+        """
+        pools = []
+        if self._poolmanager is not None:
+            for key in list(self._poolmanager.pools.keys()):
+                pool = self._poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                pools.append(
+                    {
+                        'connections': pool.num_connections,
+                        'host': pool.host,
+                        'idle': pool.pool.qsize() if pool.pool is not None else 0,
+                        'maxsize': pool.pool.maxsize if pool.pool is not None else 0,
+                        'port': pool.port,
+                        'requests': pool.num_requests,
+                        'scheme': pool.scheme,
+                    }
+                )
+        return {'active': self.active, 'peak': self.peak, 'pools': pools, 'requests': self.requests}
+
+
+class PooledHTTPAdapter(adapters.HTTPAdapter):
+    """Requests HTTPAdapter that uses the shared ConnectionPool.
+
+    Args:
+        connection_pool (ConnectionPool): The shared connection pool.
+        max_retries (int|Retry, default:0): The retry configuration for the adapter.
+    """
+
+    def __init__(self, connection_pool, max_retries=0):
+        """Initialize the Class properties."""
+        self.connection_pool = connection_pool
+        super(PooledHTTPAdapter, self).__init__(
+            pool_connections=connection_pool.pool_connections,
+            pool_maxsize=connection_pool.pool_maxsize,
+            max_retries=max_retries,
+            pool_block=connection_pool.pool_block,
+        )
+
+    def close(self):
+        """Close the proxy managers owned by this adapter (the shared pools stay open)."""
+        for proxy in self.proxy_manager.values():
+            proxy.clear()
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        """Use the shared PoolManager instead of creating one per adapter."""
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+
+    @property
+    def poolmanager(self):
+        """Return the shared PoolManager (the pool may be recreated by configure)."""
+        return self.connection_pool.poolmanager
+
+    @poolmanager.setter
+    def poolmanager(self, poolmanager):
+        """Ignore the PoolManager set by HTTPAdapter (used when unpickling)."""
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """Send the request while tracking the number of active requests."""
+        self.connection_pool.acquire()
+        try:
+            return super(PooledHTTPAdapter, self).send(request, **kwargs)
+        finally:
+            self.connection_pool.release()
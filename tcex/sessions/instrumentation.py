@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""ThreatConnect API Request Instrumentation"""
+import atexit
+import json
+import re
+import threading
+import time
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    from urllib.parse import urlparse  # Python 3
+except ImportError:
+    from urlparse import urlparse  # Python 2
+
+# the connection timings for the request being sent on the current thread
+_local = threading.local()
+
+# path segments that are always followed by a value (e.g. /tags/<name>)
+_NAMED_SEGMENTS = ['attributes', 'securityLabels', 'tags']
+
+
+def endpoint_template(url):
+    """Return the endpoint template for the url with the ids and values replaced.
+
+    .. code-block:: python
+
+        endpoint_template('https://tc/api/v2/indicators/addresses/1.1.1.1/tags/My%20Tag')
+        # '/v2/indicators/addresses/{id}/tags/{name}'
+
+    Args:
+        url (str): The request url or path.
+
+    Returns:
+        str: The endpoint template.
+    """
+    segments = urlparse(url).path.split('/')
+    if 'v2' in segments:
+        # remove the api path prefix (e.g. /api)
+        segments = [''] + segments[segments.index('v2') :]
+    template = []
+    for index, segment in enumerate(segments):
+        previous = segments[index - 1] if index else None
+        if previous in _NAMED_SEGMENTS and not segment.isdigit():
+            segment = '{name}'
+        elif (
+            re.match(r'^(\d+|[0-9a-fA-F-]{32,64})$', segment)
+            or re.search(r'[.@:%]', segment)
+            or (index == 4 and segments[2] == 'indicators')
+        ):
+            # numeric ids, uuids, hashes, indicator values, and escaped values
+            segment = '{id}'
+        template.append(segment)
+    return '/'.join(template)
+
+
+class Histogram(object):
+    """Cumulative histogram of values in seconds.
+
+    Args:
+        buckets (list, optional): The upper bounds of the buckets.
+    """
+
+    default_buckets = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+    def __init__(self, buckets=None):
+        """Initialize the Class properties."""
+        self.buckets = buckets or self.default_buckets
+        self.count = 0
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.max = None
+        self.min = None
+        self.sum = 0
+
+    def observe(self, value):
+        """Add a value to the histogram."""
+        self.count += 1
+        self.sum += value
+        self.max = value if self.max is None else max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q):
+        """Return the upper bound of the bucket containing the quantile (e.g. 0.95)."""
+        rank = q * self.count
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return bound
+        return self.max
+
+    @property
+    def stats(self):
+        """Return the histogram summary."""
+        return {
+            'count': self.count,
+            'max': self.max,
+            'mean': self.sum / self.count if self.count else None,
+            'min': self.min,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'sum': self.sum,
+        }
+
+
+class Instrumentation(object):
+    """Aggregate ThreatConnect API request metrics shared by all TcSession instances.
+
+    When enabled, each request sent by a TcSession produces a metrics dict that is passed to the
+    registered hooks and aggregated per method and endpoint template (ids and values removed)::
+
+        {
+            "bytes_received": 1250,
+            "bytes_sent": 0,
+            "connect": 0.012,
+            "endpoint": "/v2/indicators/addresses/{id}",
+            "first_byte": 0.081,
+            "method": "GET",
+            "retries": 0,
+            "status_code": 200,
+            "tls": 0.034,
+            "total": 0.083
+        }
+
+    The connect (DNS lookup and TCP connect) and tls timings are only present when a new
+    connection was opened for the request. Requests that raise an exception (e.g. a connection
+    error) have no status_code and the exception class name in "error", and are counted as
+    errors.
+
+    .. code-block:: python
+
+        tcex.instrumentation.enable(dump_at_exit=True)
+        tcex.instrumentation.hooks.append(lambda metrics: print(metrics))
+        ...
+        tcex.log.info(tcex.instrumentation.report())
+        with open('metrics.prom', 'w') as fh:
+            fh.write(tcex.instrumentation.prometheus())
+    """
+
+    phases = ['total', 'first_byte', 'connect', 'tls']
+
+    def __init__(self, log=None):
+        """Initialize the Class properties."""
+        self._lock = threading.Lock()
+        self.enabled = False
+        self.endpoints = {}
+        self.hooks = []
+        self.log = log
+
+    def begin(self):
+        """Start collecting the connection timings for a request on the current thread."""
+        _local.timings = {}
+
+    def enable(self, dump_at_exit=False):
+        """Enable the instrumentation.
+
+        Args:
+            dump_at_exit (bool, default:False): If True log the report when the process exits.
+        """
+        self.enabled = True
+        if dump_at_exit:
+            atexit.register(self.dump)
+
+    def dump(self):
+        """Log the report."""
+        if self.log is not None and self.endpoints:
+            self.log.info('API request metrics: {}'.format(self.report()))
+
+    def end(self, r, elapsed, retries=0):
+        """Record the metrics for a completed request.
+
+        Args:
+            r (requests.Response): The response.
+            elapsed (float): The total number of seconds for the request.
+            retries (int, default:0): The number of retries made by the caller.
+
+        Returns:
+            dict: The metrics for the request.
+        """
+        timings = getattr(_local, 'timings', None) or {}
+        _local.timings = None
+
+        body = r.request.body if r.request is not None else None
+        bytes_received = r.headers.get('Content-Length')
+        if r.__dict__.get('_content_consumed'):
+            bytes_received = len(r.content or b'')
+        history = getattr(getattr(r.raw, 'retries', None), 'history', None) or []
+        metrics = {
+            'bytes_received': int(bytes_received or 0),
+            'bytes_sent': len(body) if isinstance(body, (bytes, str)) else 0,
+            'endpoint': endpoint_template(r.url),
+            'first_byte': r.elapsed.total_seconds(),
+            'method': r.request.method if r.request is not None else None,
+            'retries': retries + len(history),
+            'status_code': r.status_code,
+            'total': elapsed,
+        }
+        metrics.update(timings)
+        self.record(metrics)
+        return metrics
+
+    def fail(self, method, url, elapsed, error):
+        """Record the metrics for a request that raised an exception.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The request url.
+            elapsed (float): The total number of seconds for the request.
+            error (Exception): The exception raised by the request.
+
+        Returns:
+            dict: The metrics for the request.
+        """
+        timings = getattr(_local, 'timings', None) or {}
+        _local.timings = None
+
+        metrics = {
+            'bytes_received': 0,
+            'bytes_sent': 0,
+            'endpoint': endpoint_template(url),
+            'error': error.__class__.__name__,
+            'method': method.upper(),
+            'retries': 0,
+            'status_code': None,
+            'total': elapsed,
+        }
+        metrics.update(timings)
+        self.record(metrics)
+        return metrics
+
+    def record(self, metrics):
+        """Aggregate the metrics and pass them to the hooks.
+
+        Args:
+            metrics (dict): The metrics for a request.
+        """
+        key = (metrics.get('method'), metrics.get('endpoint'))
+        with self._lock:
+            endpoint = self.endpoints.get(key)
+            if endpoint is None:
+                endpoint = {
+                    'bytes_received': 0,
+                    'bytes_sent': 0,
+                    'errors': 0,
+                    'histograms': {},
+                    'retries': 0,
+                }
+                self.endpoints[key] = endpoint
+            endpoint['bytes_received'] += metrics.get('bytes_received', 0)
+            endpoint['bytes_sent'] += metrics.get('bytes_sent', 0)
+            endpoint['retries'] += metrics.get('retries', 0)
+            if metrics.get('error') or (metrics.get('status_code') or 0) >= 400:
+                endpoint['errors'] += 1
+            for phase in self.phases:
+                if metrics.get(phase) is not None:
+                    endpoint['histograms'].setdefault(phase, Histogram()).observe(metrics[phase])
+
+        for hook in self.hooks:
+            try:
+                hook(metrics)
+            except Exception as e:  # pylint: disable=broad-except
+                if self.log is not None:
+                    self.log.warning('Instrumentation hook failed ({}).'.format(e))
+
+    def report(self):
+        """Return the aggregated metrics as JSON sorted by the total time per endpoint."""
+        stats = self.stats
+        stats.sort(key=lambda e: e.get('total', {}).get('sum', 0), reverse=True)
+        return json.dumps(stats)
+
+    def reset(self):
+        """Remove all aggregated metrics."""
+        with self._lock:
+            self.endpoints = {}
+
+    @property
+    def stats(self):
+        """Return the aggregated metrics for each endpoint."""
+        stats = []
+        with self._lock:
+            for (method, template), endpoint in self.endpoints.items():
+                entry = {'endpoint': template, 'method': method}
+                entry.update({k: v for k, v in endpoint.items() if k != 'histograms'})
+                for phase, histogram in endpoint['histograms'].items():
+                    entry[phase] = histogram.stats
+                stats.append(entry)
+        return stats
+
+    def prometheus(self):
+        """Return the aggregated metrics in the Prometheus text format."""
+        lines = []
+        with self._lock:
+            for (method, template), endpoint in sorted(self.endpoints.items()):
+                labels = 'method="{}",endpoint="{}"'.format(method, template)
+                for phase, histogram in sorted(endpoint['histograms'].items()):
+                    name = 'tcex_api_{}_seconds'.format(phase)
+                    total = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        total += count
+                        bucket = '{}_bucket{{{},le="{}"}}'.format(name, labels, bound)
+                        lines.append('{} {}'.format(bucket, total))
+                    lines.append(
+                        '{}_bucket{{{},le="+Inf"}} {}'.format(name, labels, histogram.count)
+                    )
+                    lines.append('{}_sum{{{}}} {}'.format(name, labels, histogram.sum))
+                    lines.append('{}_count{{{}}} {}'.format(name, labels, histogram.count))
+                for counter in ['bytes_received', 'bytes_sent', 'errors', 'retries']:
+                    name = 'tcex_api_{}_total'.format(counter)
+                    lines.append('{}{{{}}} {}'.format(name, labels, endpoint[counter]))
+        return '\n'.join(lines) + '\n'
+
+
+def _timed(phase, method):
+    """Call the connection method recording its duration when a request is instrumented."""
+    timings = getattr(_local, 'timings', None)
+    if timings is None:
+        return method()
+    start = time.time()
+    try:
+        return method()
+    finally:
+        timings[phase] = timings.get(phase, 0) + time.time() - start
+
+
+class InstrumentedHTTPConnection(HTTPConnection):
+    """HTTP connection recording the connect time."""
+
+    def _new_conn(self):
+        """Open the socket (DNS lookup and TCP connect)."""
+        return _timed('connect', super(InstrumentedHTTPConnection, self)._new_conn)
+
+
+class InstrumentedHTTPSConnection(HTTPSConnection):
+    """HTTPS connection recording the connect and TLS handshake times."""
+
+    def _new_conn(self):
+        """Open the socket (DNS lookup and TCP connect)."""
+        return _timed('connect', super(InstrumentedHTTPSConnection, self)._new_conn)
+
+    def connect(self):
+        """Open the socket and complete the TLS handshake."""
+        timings = getattr(_local, 'timings', None)
+        if timings is None:
+            return super(InstrumentedHTTPSConnection, self).connect()
+
+        connect = timings.get('connect', 0)
+        start = time.time()
+        try:
+            return super(InstrumentedHTTPSConnection, self).connect()
+        finally:
+            # the handshake is the connect time less the time to open the socket
+            elapsed = time.time() - start - (timings.get('connect', 0) - connect)
+            timings['tls'] = timings.get('tls', 0) + elapsed
+
+
+class InstrumentedHTTPConnectionPool(HTTPConnectionPool):
+    """HTTP connection pool using the instrumented connection."""
+
+    ConnectionCls = InstrumentedHTTPConnection
+
+
+class InstrumentedHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPS connection pool using the instrumented connection."""
+
+    ConnectionCls = InstrumentedHTTPSConnection
+
+
+pool_classes_by_scheme = {
+    'http': InstrumentedHTTPConnectionPool,
+    'https': InstrumentedHTTPSConnectionPool,
+}
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""ThreatConnect API Rate Limiter"""
+import random
+import threading
+import time
+
+
+class TokenBucket(object):
+    """Token bucket with a concurrency limit for a family of API endpoints.
+
+    When a rate is set, requests wait for a token (up to **burst** tokens accumulate while idle).
+    The rate adapts to throttling: it is halved (down to **min_rate**) on each throttled response
+    and increases by 5% of the configured rate for each successful response. A throttled response
+    with a Retry-After header pauses all requests for the family and empties the bucket, so
+    waiting requests resume one token at a time instead of all at once.
+
+    Args:
+        rate (float, optional): The maximum requests per second (None for no limit).
+        burst (int, optional): The maximum number of tokens, defaults to the rate.
+        concurrency (int, optional): The maximum number of requests in flight.
+        min_rate (float, default:0.5): The minimum rate when adapting to throttling.
+    """
+
+    def __init__(self, rate=None, burst=None, concurrency=None, min_rate=0.5):
+        """Initialize the Class properties."""
+        self._lock = threading.Lock()
+        self._semaphore = None
+        self.burst = None
+        self.concurrency = None
+        self.current_rate = None
+        self.min_rate = min_rate
+        self.paused_until = 0
+        self.rate = None
+        self.throttled = 0
+        self.tokens = 0
+        self.updated = time.time()
+        self.configure(rate, burst, concurrency)
+
+    def acquire(self):
+        """Wait for a token and a concurrency slot.
+
+        Returns:
+            threading.Semaphore: The semaphore to pass to release (None without a limit).
+        """
+        semaphore = self._semaphore
+        if semaphore is not None:
+            semaphore.acquire()
+        try:
+            while True:
+                with self._lock:
+                    delay = self._take()
+                if delay <= 0:
+                    return semaphore
+                time.sleep(delay)
+        except BaseException:
+            self.release(semaphore)
+            raise
+
+    def configure(self, rate=None, burst=None, concurrency=None):
+        """Set the rate, burst, and concurrency limits.
+
+        Args:
+            rate (float, optional): The maximum requests per second (None for no limit).
+            burst (int, optional): The maximum number of tokens, defaults to the rate.
+            concurrency (int, optional): The maximum number of requests in flight.
+        """
+        with self._lock:
+            self.rate = rate
+            self.current_rate = rate
+            self.burst = burst or (max(rate, 1) if rate else None)
+            self.tokens = self.burst or 0
+            self.updated = time.time()
+            if concurrency != self.concurrency:
+                self.concurrency = concurrency
+                self._semaphore = threading.Semaphore(concurrency) if concurrency else None
+
+    @staticmethod
+    def release(semaphore):
+        """Release the concurrency slot.
+
+        Args:
+            semaphore (threading.Semaphore): The semaphore returned by acquire.
+        """
+        if semaphore is not None:
+            semaphore.release()
+
+    def success(self):
+        """Increase the rate after a successful response."""
+        if self.rate and self.current_rate < self.rate:
+            with self._lock:
+                self.current_rate = min(self.rate, self.current_rate + self.rate * 0.05)
+
+    def _take(self):
+        """Take a token returning 0, or return the seconds to wait for one (lock must be held)."""
+        now = time.time()
+        if now < self.paused_until:
+            # spread the requests waiting on the pause over up to a second
+            return self.paused_until - now + random.random()
+        if not self.current_rate:
+            return 0
+
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.current_rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.current_rate
+
+    def throttle(self, retry_after=None):
+        """Reduce the rate and pause the family after a throttled response.
+
+        Args:
+            retry_after (float, optional): The number of seconds from the Retry-After header.
+        """
+        with self._lock:
+            self.throttled += 1
+            if self.rate:
+                self.current_rate = max(self.min_rate, self.current_rate / 2)
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.time() + retry_after)
+                self.tokens = 0
+                self.updated = self.paused_until
+
+
+class RateLimiter(object):
+    """Client side rate limits for the ThreatConnect API shared by all TcSession instances.
+
+    Limits are configured per endpoint family, the longest family prefix matching the request
+    path is used and all other requests use the default family (''). By default there are no
+    rate or concurrency limits, but throttled responses (429, or 503 with a Retry-After header)
+    still pause the family for the Retry-After value and are retried.
+
+    .. code-block:: python
+
+        tcex.rate_limiter.configure('/v2/batch', rate=2, concurrency=4)
+        tcex.rate_limiter.configure('/v2/indicators', rate=50, burst=100, concurrency=16)
+        tcex.rate_limiter.configure('/v2/exchange/db', concurrency=8)
+
+    Args:
+        retries (int, default:3): The number of times a throttled request is retried.
+        max_retry_after (int, default:120): The maximum number of seconds to pause.
+    """
+
+    families = ['/v2/batch', '/v2/exchange/db', '/v2/indicators', '']
+
+    def __init__(self, retries=3, max_retry_after=120):
+        """Initialize the Class properties."""
+        self._lock = threading.Lock()
+        self.buckets = {family: TokenBucket() for family in self.families}
+        self.max_retry_after = max_retry_after
+        self.retries = retries
+
+    def bucket(self, path):
+        """Return the bucket for the longest family matching the request path.
+
+        Args:
+            path (str): The request path (e.g. /v2/indicators/addresses).
+
+        Returns:
+            TokenBucket: The bucket for the endpoint family.
+        """
+        family = max([f for f in list(self.buckets) if path.startswith(f)], key=len)
+        return self.buckets[family]
+
+    def configure(self, family, rate=None, burst=None, concurrency=None):
+        """Set the limits for an endpoint family.
+
+        Args:
+            family (str): The path prefix of the family (e.g. /v2/batch or '' for the default).
+            rate (float, optional): The maximum requests per second (None for no limit).
+            burst (int, optional): The maximum number of tokens, defaults to the rate.
+            concurrency (int, optional): The maximum number of requests in flight.
+        """
+        with self._lock:
+            if family not in self.buckets:
+                self.buckets[family] = TokenBucket()
+        self.buckets[family].configure(rate, burst, concurrency)
+
+    def retry_after(self, r):
+        """Return the Retry-After seconds if the response is throttled, otherwise None.
+
+        Args:
+            r (requests.Response): The response.
+
+        Returns:
+            float: The number of seconds to pause (0 when throttled without a Retry-After).
+        """
+        retry_after = r.headers.get('Retry-After')
+        if r.status_code not in [429, 503] or (r.status_code == 503 and retry_after is None):
+            return None
+        try:
+            return min(max(float(retry_after), 0), self.max_retry_after)
+        except (TypeError, ValueError):
+            # HTTP date or no value, use the exponential back off of the caller
+            return 0
+
+    @property
+    def stats(self):
+        """Return the current rate and the number of throttled responses for each family."""
+        return {
+            family: {
+                'concurrency': bucket.concurrency,
+                'rate': bucket.current_rate,
+                'throttled': bucket.throttled,
+            }
+            for family, bucket in self.buckets.items()
+        }
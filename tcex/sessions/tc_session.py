@@ -6,35 +6,64 @@ import hmac
 import time
 import urllib3
 from urllib3.util.retry import Retry
-from requests import adapters, auth, Session
+from requests import auth, Session
 
 # disable ssl warning message
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
 class HmacAuth(auth.AuthBase):
-    """ThreatConnect HMAC Authorization"""
+    """ThreatConnect HMAC Authorization
+
+    The keyed HMAC state is created on the first signature and copied for each following
+    signature, and the headers are reused for requests with the same path and method within the
+    same second (the signature only changes with the timestamp).
+    """
 
     def __init__(self, access_id, secret_key):
         """Initialize the Class properties."""
         super(HmacAuth, self).__init__()
         self._access_id = access_id
         self._secret_key = secret_key
+        self._hmac = None
+        self._prefix = 'TC {}:'.format(access_id)
+        self._signatures = (None, {})
 
     def __call__(self, r):
         """Override of parent __call__ method."""
-        timestamp = int(time.time())
-        signature = '{}:{}:{}'.format(r.path_url, r.method, timestamp)
-        hmac_signature = hmac.new(
-            self._secret_key.encode(), signature.encode(), digestmod=hashlib.sha256
-        ).digest()
-        authorization = 'TC {}:{}'.format(
-            self._access_id, base64.b64encode(hmac_signature).decode()
-        )
-        r.headers['Authorization'] = authorization
-        r.headers['Timestamp'] = timestamp
+        r.headers.update(self.authorization(r.path_url, r.method))
         return r
 
+    def authorization(self, path_url, method):
+        """Return the authorization headers for a request.
+
+        Args:
+            path_url (str): The path and query string of the request.
+            method (str): The HTTP method of the request.
+
+        Returns:
+            dict: The Authorization and Timestamp headers.
+        """
+        timestamp = int(time.time())
+        signatures_timestamp, signatures = self._signatures
+        if signatures_timestamp != timestamp:
+            # only the signatures for the current second are kept
+            signatures = {}
+            self._signatures = (timestamp, signatures)
+
+        headers = signatures.get((path_url, method))
+        if headers is None:
+            if self._hmac is None:
+                self._hmac = hmac.new(self._secret_key.encode(), digestmod=hashlib.sha256)
+            hmac_signature = self._hmac.copy()
+            hmac_signature.update('{}:{}:{}'.format(path_url, method, timestamp).encode())
+            headers = {
+                'Authorization': self._prefix + base64.b64encode(hmac_signature.digest()).decode(),
+                'Timestamp': str(timestamp),
+            }
+            signatures[(path_url, method)] = headers
+        return headers
+
 
 class TokenAuth(auth.AuthBase):
     """ThreatConnect Token Authorization"""
@@ -43,12 +72,32 @@ class TokenAuth(auth.AuthBase):
         """Initialize Class Properties."""
         super(TokenAuth, self).__init__()
         self.token = token
+        self._headers = (None, None)
 
     def __call__(self, r):
         """Override of parent __call__ method."""
-        r.headers['Authorization'] = 'TC-Token {}'.format(self.token.token)
+        r.headers.update(self.authorization(r.path_url, r.method))
         return r
 
+    def authorization(self, path_url=None, method=None):  # pylint: disable=unused-argument
+        """Return the authorization headers for a request.
+
+        The header is rebuilt only when the token changes (e.g. after a token renewal).
+
+        Args:
+            path_url (str, optional): The path and query string of the request (not used).
+            method (str, optional): The HTTP method of the request (not used).
+
+        Returns:
+            dict: The Authorization header.
+        """
+        token = self.token.token
+        headers_token, headers = self._headers
+        if headers is None or headers_token != token:
+            headers = {'Authorization': 'TC-Token {}'.format(token)}
+            self._headers = (token, headers)
+        return headers
+
 
 class TcSession(Session):
     """ThreatConnect REST API Requests Session"""
@@ -110,14 +159,75 @@ class TcSession(Session):
         """Return true if the current App is a service App."""
         return self.token.token is not None and self.token.token_expires is not None
 
+    @staticmethod
+    def _replayable(kwargs):
+        """Return True if the request body can be sent again."""
+        return kwargs.get('files') is None and isinstance(
+            kwargs.get('data'), (type(None), bytes, dict, list, str, tuple)
+        )
+
     def request(self, method, url, **kwargs):  # pylint: disable=arguments-differ
-        """Override request method disabling verify on token renewal if disabled on session."""
+        """Override request method disabling verify on token renewal if disabled on session.
+
+        Requests wait on the rate limiter for the endpoint family (tcex.rate_limiter) and
+        throttled responses are retried after the family is paused. When tcex.instrumentation
+        is enabled the metrics for each request are recorded, including requests that raise.
+        """
         if self.auth is None:
             self._configure_auth()
 
+        path = url
         if not url.startswith('https'):
             url = '{}{}'.format(self.args.tc_api_path, url)
-        return super(TcSession, self).request(method, url, **kwargs)
+        elif url.startswith(self.args.tc_api_path):
+            path = url[len(self.args.tc_api_path) :]
+
+        instrumentation = self.tcex.instrumentation
+        if not instrumentation.enabled:
+            return self._send(method, url, path, **kwargs)[0]
+
+        instrumentation.begin()
+        start = time.time()
+        try:
+            r, retries = self._send(method, url, path, **kwargs)
+        except Exception as e:
+            # record the failed request and clear the connection timings for the thread
+            instrumentation.fail(method, url, time.time() - start, e)
+            raise
+        instrumentation.end(r, time.time() - start, retries)
+        return r
+
+    def _send(self, method, url, path, **kwargs):
+        """Send the request using the rate limiter, retrying throttled responses.
+
+        Returns:
+            tuple: The response and the number of throttled retries.
+        """
+        limiter = self.tcex.rate_limiter
+        bucket = limiter.bucket(path)
+        attempt = 0
+        while True:
+            semaphore = bucket.acquire()
+            try:
+                r = super(TcSession, self).request(method, url, **kwargs)
+            finally:
+                bucket.release(semaphore)
+
+            retry_after = limiter.retry_after(r)
+            if retry_after is None:
+                bucket.success()
+                return r, attempt
+
+            bucket.throttle(retry_after or 2 ** attempt)
+            if attempt >= limiter.retries or not self._replayable(kwargs):
+                return r, attempt
+            self.tcex.log.debug(
+                'Throttled ({}) by {}, retrying after the rate limit pause.'.format(
+                    r.status_code, path
+                )
+            )
+            r.close()
+            attempt += 1
 
     def retry(self, retries=3, backoff_factor=0.3, status_forcelist=(500, 502, 504)):
         """Add retry to Requests Session
@@ -131,5 +241,5 @@ class TcSession(Session):
             backoff_factor=backoff_factor,
             status_forcelist=status_forcelist,
         )
-        # mount all https requests
-        self.mount('https://', adapters.HTTPAdapter(max_retries=retries))
+        # mount all https requests using the connection pool shared by all TcEx sessions
+        self.mount('https://', self.tcex.connection_pool.adapter(max_retries=retries))
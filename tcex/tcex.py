@@ -43,21 +43,27 @@ class TcEx(object):
             signal.signal(signal.SIGTERM, self._signal_handler)
 
         # Property defaults
+        self._async_session = None
         self._config = kwargs.get('config', {})
+        self._connection_pool = None
         self._default_args = None
         self._error_codes = None
         self._exit_code = 0
         self._indicator_associations_types_data = {}
         self._indicator_types = []
         self._indicator_types_data = {}
+        self._instrumentation = None
         self._jobs = None
         self._logger = None
         self._playbook = None
+        self._playbook_cache = None
+        self._rate_limiter = None
         self._service = None
         self._session = None
         self._session_external = None
         self._utils = None
         self._ti = None
+        self._ti_cache = None
         self._token = None
         self.ij = InstallJson()
 
@@ -580,6 +586,36 @@ class TcEx(object):
 
         return Playbooks(self)
 
+    @property
+    def playbook_cache(self):
+        """Return the playbook variable cache shared by Playbooks instances (None when disabled).
+
+        The cache is opt-in, set this property to True to enable a cache with the default size,
+        to an instance of PlaybookCache for a custom size, or to None to disable it. When enabled,
+        values read with ``tcex.playbook.read()`` are cached per DB context and only invalidated
+        by writes made through tcex.playbook, so only enable it when no other process (e.g. an
+        upstream App in the same context) changes the variables during the execution.
+
+        .. code-block:: python
+
+            tcex.playbook_cache = PlaybookCache(maxsize=5000)
+            ...
+            tcex.log.debug('cache stats: {}'.format(tcex.playbook_cache.stats))
+        """
+        return self._playbook_cache
+
+    @playbook_cache.setter
+    def playbook_cache(self, cache):
+        """Enable or disable the playbook variable cache."""
+        if cache is True:
+            from .playbooks import PlaybookCache
+
+            cache = PlaybookCache()
+        elif cache is False:
+            cache = None
+        # an empty cache is falsy (__len__), so compare to None
+        self._playbook_cache = cache
+
     @property
     def proxies(self):
         """Format the proxy configuration for Python Requests module.
@@ -860,6 +896,60 @@ class TcEx(object):
             self._service = Services(self)
         return self._service
 
+    @property
+    def connection_pool(self):
+        """Return the connection pool shared by all Requests sessions.
+
+        Pool sizes can be changed using ``tcex.connection_pool.configure(pool_maxsize=50)`` and
+        utilization counters are available using ``tcex.connection_pool.stats``.
+        """
+        if self._connection_pool is None:
+            from .sessions import ConnectionPool
+
+            self._connection_pool = ConnectionPool()
+        return self._connection_pool
+
+    @property
+    def instrumentation(self):
+        """Return the API request instrumentation shared by all ThreatConnect API sessions.
+
+        Disabled by default, use ``tcex.instrumentation.enable(dump_at_exit=True)`` to log the
+        timings, bytes, and retries per endpoint when the App exits.
+        """
+        if self._instrumentation is None:
+            from .sessions import Instrumentation
+
+            self._instrumentation = Instrumentation(self.log)
+        return self._instrumentation
+
+    @property
+    def rate_limiter(self):
+        """Return the client side rate limiter shared by all ThreatConnect API sessions.
+
+        Limits are configured per endpoint family, e.g.
+        ``tcex.rate_limiter.configure('/v2/batch', rate=2, concurrency=4)``.
+        """
+        if self._rate_limiter is None:
+            from .sessions import RateLimiter
+
+            self._rate_limiter = RateLimiter()
+        return self._rate_limiter
+
+    @property
+    def async_session(self):
+        """Return an instance of the asyncio Session configured for the ThreatConnect API.
+
+        .. Note:: The asyncio session requires the aiohttp module (pip install tcex[async]).
+        """
+        if self._async_session is None:
+            try:
+                from .sessions.async_tc_session import AsyncTcSession
+
+                self._async_session = AsyncTcSession(self)
+            except ImportError as e:
+                self.handle_error(105, [e])
+        return self._async_session
+
     @property
     def session(self):
         """Return an instance of Requests Session configured for the ThreatConnect API."""
@@ -876,6 +966,8 @@ class TcEx(object):
             from requests import Session
 
             self._session_external = Session()
+            self._session_external.mount('http://', self.connection_pool.adapter())
+            self._session_external.mount('https://', self.connection_pool.adapter())
             if self.default_args.tc_proxy_external:
                 self.log.info(
                     'Using proxy server for external connectivity ({}:{}).'.format(
@@ -897,6 +989,40 @@ class TcEx(object):
             self._ti = TcExTi(self)
         return self._ti
 
+    @property
+    def ti_cache(self):
+        """Return the TI single object response cache (None when disabled).
+
+        The cache is opt-in, set this property to True to enable a cache with the default size
+        and TTL, to an instance of TiResponseCache for custom settings, or to None to disable it.
+
+        .. code-block:: python
+
+            tcex.ti_cache = TiResponseCache(maxsize=5000, ttl=600)
+            ...
+            tcex.log.debug('cache stats: {}'.format(tcex.ti_cache.stats))
+        """
+        return self._ti_cache
+
+    @ti_cache.setter
+    def ti_cache(self, cache):
+        """Enable or disable the TI single object response cache."""
+        hooks = self.session.hooks['response']
+        if self._ti_cache is not None and self._ti_cache.response_hook in hooks:
+            hooks.remove(self._ti_cache.response_hook)
+
+        if cache is True:
+            from .tcex_ti import TiResponseCache
+
+            cache = TiResponseCache()
+        elif cache is False:
+            cache = None
+        # an empty cache is falsy (__len__), so compare to None
+        self._ti_cache = cache
+        if self._ti_cache is not None:
+            # invalidate cached responses on writes sent using the ThreatConnect session
+            hooks.append(self._ti_cache.response_hook)
+
     @property
     def token(self):
         """Return token object."""
@@ -27,6 +27,9 @@ class TcExErrorCodes(object):
             350: 'Data Store request failed. API status code: {}, API message: {}.',
             # batch v2: 500-600
             520: 'File Occurrences can only be added to a File. Current type: {}.',
+            525: 'Bulk Indicator columns require at least one column array ({}).',
+            530: 'Invalid Indicator type(s) provided for bulk add ({}).',
+            535: 'Bulk Indicator columns must all be the same length ({}).',
             540: 'Failed polling batch status ({}).',
             545: 'Failed polling batch status. API status code: {}, API message: {}.',
             550: 'Batch status check reached timeout ({} seconds).',
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 """TcEx Framework KeyValue Module"""
 from builtins import str
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 try:
     from urllib import quote  # Python 2
@@ -18,8 +21,38 @@ class TcExKeyValue(object):
             tcex (object): Instance of TcEx.
             rhash (string): The REDIS hash.
         """
+        self._batch = None
+        self.batch_workers = 8
         self.tcex = tcex
 
+    @contextmanager
+    def batch(self):
+        """Buffer all writes and send them concurrently when the block exits.
+
+        Reads of a buffered key return the buffered value. Nested calls use the outer batch.
+
+        .. code-block:: python
+
+            with tcex.playbook.db.batch():
+                tcex.playbook.db.create('#App:1234:one!String', '"one"')
+                tcex.playbook.db.create('#App:1234:two!String', '"two"')
+        """
+        if self._batch is not None:
+            yield
+            return
+
+        self._batch = OrderedDict()
+        try:
+            yield
+        finally:
+            batch, self._batch = self._batch, None
+            if batch:
+                workers = max(min(self.batch_workers, len(batch)), 1)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(self._put, k, v) for k, v in batch.items()]
+                    for future in futures:
+                        future.result()
+
     def create(self, key, value):
         """Create key/value pair in remote KV store.
 
@@ -28,8 +61,15 @@ class TcExKeyValue(object):
             value (any): The value to store in remote KV store.
 
         Returns:
-            (string): The response from the API call.
+            (string): The response from the API call (None when batched).
         """
+        if self._batch is not None:
+            self._batch[key] = value
+            return None
+        return self._put(key, value)
+
+    def _put(self, key, value):
+        """Write the key/value pair to the remote KV store."""
         key = quote(key, safe='~')
         headers = {'content-type': 'application/octet-stream'}
         url = '/internal/playbooks/keyValue/{}'.format(key)
@@ -49,6 +89,8 @@ class TcExKeyValue(object):
         Returns:
             (any): The response data from the remote KV store.
         """
+        if self._batch is not None and key in self._batch:
+            return self._batch.get(key)
         key = quote(key, safe='~')
         url = '/internal/playbooks/keyValue/{}'.format(key)
         r = self.tcex.session.get(url)
@@ -56,3 +98,17 @@ class TcExKeyValue(object):
         if data is not None and not isinstance(data, str):
             data = str(r.content, 'utf-8')
         return data
+
+    def read_many(self, keys):
+        """Read data from remote KV store for the provided keys concurrently.
+
+        Args:
+            keys (list): The keys to read in remote KV store.
+
+        Returns:
+            (list): The response data from the remote KV store for each key.
+        """
+        if len(keys) < 2:
+            return [self.read(k) for k in keys]
+        with ThreadPoolExecutor(max_workers=min(self.batch_workers, len(keys))) as executor:
+            return list(executor.map(self.read, keys))
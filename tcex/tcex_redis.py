@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """TcEx Framework Redis Module"""
 from builtins import str
+from collections import OrderedDict
+from contextlib import contextmanager
 
 # TODO: [py2] switch to py3 metaclass
 from six import with_metaclass
@@ -64,6 +66,7 @@ class TcExRedis(object):
 
     def __init__(self, host, port, key):
         """Initialize the Class properties."""
+        self._batch = None
         self._key = key
         self.client = RedisClient(host=host, port=port, db=0).client
         self.r = self.client  # for legacy App that may have been using this value
@@ -78,6 +81,33 @@ class TcExRedis(object):
         """Set the current key."""
         self._key = key
 
+    @contextmanager
+    def batch(self):
+        """Buffer all writes to the hash and send them in a single pipelined round trip.
+
+        Reads of a buffered field return the buffered value. Nested calls use the outer batch.
+
+        .. code-block:: python
+
+            with tcex.playbook.db.batch():
+                tcex.playbook.db.create('#App:1234:one!String', '"one"')
+                tcex.playbook.db.create('#App:1234:two!String', '"two"')
+        """
+        if self._batch is not None:
+            yield
+            return
+
+        self._batch = OrderedDict()
+        try:
+            yield
+        finally:
+            batch, self._batch = self._batch, None
+            if batch:
+                pipe = self.client.pipeline(transaction=False)
+                for field, value in batch.items():
+                    pipe.hset(self.key, field, value)
+                pipe.execute()
+
     def blpop(self, keys, timeout=30):
         """POP a value off the first empty list in keys.
 
@@ -100,9 +130,9 @@ class TcExRedis(object):
             value (any): The value for the kv pair in Redis.
 
         Returns:
-            str: The response from Redis.
+            str: The response from Redis (None when batched).
         """
-        return self.client.hset(self.key, field, value)
+        return self.hset(field, value)
 
     def delete(self, field):
         """Alias for hdel method.
@@ -124,6 +154,8 @@ class TcExRedis(object):
         Returns:
             str: The response from Redis.
         """
+        if self._batch is not None:
+            self._batch.pop(field, None)
         return self.client.hdel(self.key, field)
 
     def hget(self, field):
@@ -135,9 +167,12 @@ class TcExRedis(object):
         Returns:
             str: The response data from Redis.
         """
-        data = self.client.hget(self.key, field)
+        if self._batch is not None and field in self._batch:
+            data = self._batch.get(field)
+        else:
+            data = self.client.hget(self.key, field)
         if data is not None and not isinstance(data, str):
-            data = str(self.client.hget(self.key, field), 'utf-8')
+            data = str(data, 'utf-8')
         return data
 
     def hgetall(self):
@@ -148,6 +183,29 @@ class TcExRedis(object):
         """
         return self.client.hgetall(self.key)
 
+    def hmget(self, fields):
+        """Read data from Redis for the provided keys in a single round trip.
+
+        Args:
+            fields (list): The field names (keys) for the kv pairs in Redis.
+
+        Returns:
+            list: The response data from Redis for each field (None when not set).
+        """
+        batch = self._batch or {}
+        missing = [f for f in fields if f not in batch]
+        values = {}
+        if missing:
+            values = dict(zip(missing, self.client.hmget(self.key, missing)))
+
+        data = []
+        for field in fields:
+            value = batch[field] if field in batch else values.get(field)
+            if value is not None and not isinstance(value, str):
+                value = str(value, 'utf-8')
+            data.append(value)
+        return data
+
     def hset(self, field, value):
         """Create key/value pair in Redis.
 
@@ -156,14 +214,21 @@ class TcExRedis(object):
             value (any): The value for the kv pair in Redis.
 
         Returns:
-            str: The response from Redis.
+            str: The response from Redis (None when batched).
         """
+        if self._batch is not None:
+            self._batch[field] = value
+            return None
         return self.client.hset(self.key, field, value)
 
     def read(self, field):
         """Alias for hget method."""
         return self.hget(field)
 
+    def read_many(self, fields):
+        """Alias for hmget method."""
+        return self.hmget(fields)
+
     def rpush(self, key, values):
         """Append/Push values to the end of list ``name``.
 
@@ -10,10 +10,14 @@ from requests.packages.urllib3.util.retry import Retry  # pylint: disable=E0401
 packages.urllib3.disable_warnings()  # pylint: disable=E1101
 
 
-def session_retry(retries=3, backoff_factor=0.3, status_forcelist=(500, 502, 504), session=None):
+def session_retry(
+    retries=3, backoff_factor=0.3, status_forcelist=(500, 502, 504), session=None, pool=None
+):
     """Add retry to Requests Session
 
     https://urllib3.readthedocs.io/en/latest/reference/urllib3.util.html#urllib3.util.retry.Retry
+
+    If a ConnectionPool is provided the session uses the shared connection pools.
     """
     session = session or Session()
     retries = Retry(
@@ -24,7 +28,10 @@ def session_retry(retries=3, backoff_factor=0.3, status_forcelist=(500, 502, 504
         status_forcelist=status_forcelist,
     )
     # mount all https requests
-    session.mount('https://', adapters.HTTPAdapter(max_retries=retries))
+    if pool is not None:
+        session.mount('https://', pool.adapter(max_retries=retries))
+    else:
+        session.mount('https://', adapters.HTTPAdapter(max_retries=retries))
     return session
 
 
@@ -47,9 +54,9 @@ class TcExRequest(object):
         self._timeout = 300
 
         # session
-        self.session = session_retry()
-        if session is not None:
-            self.session = session
+        if session is None:
+            session = session_retry(pool=self.tcex.connection_pool)
+        self.session = session
         self.session.headers.update({'User-Agent': 'TcEx'})
 
     #
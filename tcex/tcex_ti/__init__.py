@@ -1,3 +1,6 @@
 # -*- coding: utf-8 -*-
 """TcEx Framework Threat Intel module init file."""
 from .tcex_ti import TcExTi  # noqa: F401
+from .tcex_ti_cache import TiResponseCache  # noqa: F401
+from .tcex_ti_fan_out import OwnerBackoff, TiFanOut  # noqa: F401
+from .tcex_ti_sync import TiSync  # noqa: F401
@@ -251,13 +251,17 @@ class TIMappings(object):
             params=params,
         )
 
-    def many(self, filters=None, params=None):
+    def many(self, filters=None, params=None, prefetch=None, incremental=None):
         """
         Gets the Indicator/Group/Victim or Security Labels
         Args:
             filters:
             owner:
             params: parameters to pass in to get the objects
+            prefetch (int, optional): The number of result pages requested concurrently
+                (defaults to tc_requests.prefetch, see :py:class:`TiTcRequest`).
+            incremental (bool, optional): If True decode the results as they arrive
+                (defaults to tc_requests.incremental, see :py:class:`TiTcRequest`).
 
         Yields: A Indicator/Group/Victim json
 
@@ -269,6 +273,8 @@ class TIMappings(object):
             owner=self.owner,
             filters=filters,
             params=params,
+            prefetch=prefetch,
+            incremental=incremental,
         ):
             yield i
 
@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
 """ThreatConnect Threat Intelligence Module"""
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import inflect
 from tcex.tcex_ti.mappings.indicator.tcex_ti_indicator import (
     custom_indicator_class_factory,
@@ -26,6 +30,8 @@ from tcex.tcex_ti.mappings.victim import Victim
 from tcex.tcex_ti.mappings.tag import Tag
 from tcex.tcex_ti.mappings.group.tcex_ti_group import Group
 from tcex.tcex_ti.mappings.tcex_ti_owner import Owner
+from tcex.tcex_ti.tcex_ti_fan_out import TiFanOut
+from tcex.tcex_ti.tcex_ti_sync import TiSync
 
 p = inflect.engine()
 
@@ -43,6 +49,7 @@ class TcExTi(object):
         """
         self.tcex = tcex
         self._custom_indicator_classes = {}
+        self.child_workers = 10
         self._gen_indicator_class()
 
     def address(self, ip, owner=None, **kwargs):
@@ -415,8 +422,44 @@ class TcExTi(object):
         """
         return Owner(self.tcex)
 
+    def fan_out(self, sources, max_workers=8, backoff=None, queue_size=10000):
+        """
+        Iterate over many TI types and owners concurrently.
+
+        Args:
+            sources (list): The (type, owner, filters) tuples (filters is optional).
+            max_workers (int, default:8): The maximum number of sources requested concurrently.
+            backoff (OwnerBackoff, optional): The per owner back off on 429/503 responses.
+            queue_size (int, default:10000): The maximum number of results held in memory.
+
+        Return:
+            TiFanOut: An iterable of (source, entity) tuples.
+        """
+        return TiFanOut(
+            self, sources, max_workers=max_workers, backoff=backoff, queue_size=queue_size
+        )
+
+    def sync(self, owner, indicator_type=None, path=None, overlap=300):
+        """
+        Create the incremental sync object for the indicators of an owner.
+
+        Args:
+            owner (str): The ThreatConnect owner name.
+            indicator_type (str, optional): The indicator type, defaults to all types.
+            path (str, optional): The directory for the snapshot, defaults to tc_temp_path.
+            overlap (int, default:300): The number of seconds each sync overlaps the previous.
+
+        Return:
+            TiSync: The sync object.
+        """
+        return TiSync(self.tcex, owner, indicator_type, path=path, overlap=overlap)
+
     def create_entity(self, entity, owner):
-        """ Given a Entity and a Owner, creates a indicator/group in ThreatConnect"""
+        """ Given a Entity and a Owner, creates a indicator/group in ThreatConnect
+
+        The attributes, tags, security labels and associations are added concurrently using up to
+        **child_workers** threads after the indicator/group is created.
+        """
 
         attributes = entity.pop('attribute', [])
         associations = entity.pop('associations', [])
@@ -447,23 +490,16 @@ class TcExTi(object):
             'security_labels': [],
             'associations': [],
         }
-        for attribute in attributes:
+
+        def add_attribute(attribute):
             r = ti.add_attribute(attribute.get('type'), attribute.get('value'))
-            attribute_response = {
+            return {
                 'status_code': r.status_code,
                 'type': r.json().get('attribute', {}).get('type', 'Description'),
                 'id': r.json().get('attribute', {}).get('id', None),
             }
-            response['attributes'].append(attribute_response)
-        for tag in tags:
-            r = ti.add_tag(tag)
-            tag_response = {'status_code': r.status_code}
-            response['tags'].append(tag_response)
-        for label in security_labels:
-            r = ti.add_label(label)
-            label_response = {'status_code': r.status_code}
-            response['security_labels'].append(label_response)
-        for association in associations:
+
+        def add_association(association):
             association_target = self.indicator(
                 association.pop('type', None), association.pop('owner', None), **association
             )
@@ -471,27 +507,326 @@ class TcExTi(object):
                 association_target = self.group(
                     association.pop('type', None), association.pop('owner', None), **association
                 )
-            r = ti.add_association(association_target)
-            association_response = {'status_code': r.status_code}
-            response['associations'].append(association_response)
+            return {'status_code': ti.add_association(association_target).status_code}
+
+        children = len(attributes) + len(tags) + len(security_labels) + len(associations)
+        if not children:
+            return response
+
+        # the child objects are independent, write them concurrently and collect the results
+        # in input order
+        with ThreadPoolExecutor(max_workers=max(min(self.child_workers, children), 1)) as executor:
+            futures = {
+                'attributes': [executor.submit(add_attribute, a) for a in attributes],
+                'tags': [executor.submit(ti.add_tag, t) for t in tags],
+                'security_labels': [executor.submit(ti.add_label, sl) for sl in security_labels],
+                'associations': [executor.submit(add_association, a) for a in associations],
+            }
+            response['attributes'] = [f.result() for f in futures['attributes']]
+            for key in ['tags', 'security_labels']:
+                response[key] = [{'status_code': f.result().status_code} for f in futures[key]]
+            response['associations'] = [f.result() for f in futures['associations']]
 
         return response
 
-    def create_entities(self, entities, owner):
+    def create_entities(self, entities, owner, bulk=False):
         """
         Creates a indicator/group in TC based on the given entity's
+
+        When bulk is True the entities are submitted as a single batch job instead of one
+        request per entity and child object. The response for each entity has the keys of the
+        :py:meth:`create_entity` response (with the entity xid added), however the batch API
+        does not return everything a direct request does:
+
+        * status_code is 400 when a batch error has the entity xid, 201 only when every batch job
+          completed without any errors, and otherwise None (unknown).
+        * unique_id is None for groups (the group id is not returned).
+        * The status_code of attributes, tags, security labels and associations is None and the
+          attribute id is None.
+
+        Entities with associations that can't be expressed in batch (an association to a group
+        that is not in the same request and has no xid, or to an indicator) are created
+        individually after the batch job completes and have the full response.
+
         Args:
             entities:
             owner:
+            bulk (bool, default:False): If True submit the entities using the batch API.
 
         Returns:
 
         """
+        if bulk:
+            return self._create_entities_bulk(entities, owner)
+
         responses = []
         for entity in entities:
             responses.append(self.create_entity(entity, owner))
         return responses
 
+    def _create_entities_bulk(self, entities, owner):
+        """Create the entities using the batch API.
+
+        Args:
+            entities (list): The entities to create.
+            owner (str): The ThreatConnect owner name.
+
+        Returns:
+            list: The response for each entity in input order.
+        """
+        entities = [dict(entity) for entity in entities]
+
+        # xids for groups in this request so associations can reference them
+        generated = set()
+        group_xids = {}
+        for index, entity in enumerate(entities):
+            if not entity.get('type'):
+                self.tcex.handle_error(
+                    925, ['type', 'create_entities', 'type', 'type', entity.get('type')]
+                )
+            if self.indicator(entity.get('type'), owner) is not None:
+                continue
+            if entity.get('xid') is None:
+                entity['xid'] = str(uuid.uuid4())
+                generated.add(index)
+            name = entity.get('name') or entity.get('summary')
+            group_xids[(entity.get('type').lower(), name)] = entity.get('xid')
+
+        # entities with associations that can't be written in batch are created individually,
+        # repeat until stable since an entity may reference a group that was removed
+        bulk = {}
+        while len(bulk) < len(entities):
+            bulk = {}
+            for index, entity in enumerate(entities):
+                xids = self._bulk_association_xids(entity, group_xids)
+                if xids is not None:
+                    bulk[index] = xids
+            removed = [entities[i].get('xid') for i in range(len(entities)) if i not in bulk]
+            if all(xid not in group_xids.values() for xid in removed):
+                break
+            group_xids = {k: v for k, v in group_xids.items() if v not in removed}
+
+        batch = self.tcex.batch(owner)
+        responses = [None] * len(entities)
+        for index, association_xids in bulk.items():
+            responses[index] = self._bulk_entity(batch, entities[index], owner, association_xids)
+
+        status_codes = {}
+        if bulk:
+            status_codes = self._bulk_status_codes(
+                batch.submit_all(halt_on_error=False), [responses[i].get('xid') for i in bulk]
+            )
+        batch.close()
+
+        for index, entity in enumerate(entities):
+            if responses[index] is None:
+                if index in generated:
+                    entity.pop('xid')
+                responses[index] = self.create_entity(entity, owner)
+                continue
+            response = responses[index]
+            response['status_code'] = status_codes.get(response.get('xid'))
+        return responses
+
+    @staticmethod
+    def _bulk_status_codes(batch_results, xids):
+        """Return the status code for each entity xid from the batch job results.
+
+        The batch API does not report the status of each entity. An entity is 400 when a batch
+        error has the entity xid (the error xid or the entire error source), and 201 only when
+        every batch job completed without any errors. Otherwise the status is unknown (None).
+
+        Args:
+            batch_results (list): The batch status of each batch job.
+            xids (list): The xids of the entities in the batch.
+
+        Returns:
+            dict: The status code (or None if unknown) keyed by xid.
+        """
+        failed = set()
+        completed = bool(batch_results)
+        for batch_data in batch_results:
+            errors = batch_data.get('errors') or []
+            if batch_data.get('status') != 'Completed' or errors or batch_data.get('errorCount'):
+                completed = False
+            for error in errors:
+                failed.update(
+                    xid for xid in [error.get('xid'), error.get('errorSource')] if xid in xids
+                )
+
+        status_codes = {}
+        for xid in xids:
+            if xid in failed:
+                status_codes[xid] = 400
+            elif completed:
+                status_codes[xid] = 201
+            else:
+                status_codes[xid] = None
+        return status_codes
+
+    @staticmethod
+    def _bulk_association_xids(entity, group_xids):
+        """Return the group xids for the entity associations or None if not supported in batch.
+
+        Args:
+            entity (dict): The entity to create.
+            group_xids (dict): The xid of each group in the request keyed by type and name.
+
+        Returns:
+            list: The xids of the associated groups.
+        """
+        xids = []
+        for association in entity.get('associations', []):
+            xid = association.get('xid')
+            if xid is None:
+                name = association.get('name') or association.get('summary')
+                xid = group_xids.get((association.get('type', '').lower(), name))
+            if xid is None:
+                return None
+            xids.append(xid)
+        return xids
+
+    def _bulk_entity(self, batch, entity, owner, association_xids):
+        """Add the entity to the batch and return the response template for the entity.
+
+        Args:
+            batch (Batch): The batch instance.
+            entity (dict): The entity to create.
+            owner (str): The ThreatConnect owner name.
+            association_xids (list): The xids of the groups to associate.
+
+        Returns:
+            dict: The response for the entity (status codes are set after the batch job).
+        """
+        attributes = entity.get('attribute', [])
+        security_labels = entity.get('securityLabel', [])
+        tags = entity.get('tag', [])
+        entity_type = entity.get('type')
+
+        summary = None
+        if self.indicator(entity_type, owner) is not None:
+            values = self._bulk_indicator_values(entity_type, entity)
+            summary = ' : '.join(v for v in values.values() if v) or entity.get('summary')
+            if not summary:
+                self.tcex.handle_error(
+                    925, ['summary', 'create_entities', 'summary', 'summary', summary]
+                )
+            if not any(values.values()):
+                values = {'unique_id': summary.split(' : ')[0]}
+            ti = self.indicator(entity_type, owner, **values)
+            fields = [
+                'active',
+                'confidence',
+                'dateAdded',
+                'date_added',
+                'dnsActive',
+                'dns_active',
+                'lastModified',
+                'last_modified',
+                'privateFlag',
+                'private_flag',
+                'rating',
+                'size',
+                'whoisActive',
+                'whois_active',
+                'xid',
+            ]
+            kwargs = {k: v for k, v in entity.items() if k in fields and v is not None}
+            batch_entity = batch.indicator(entity_type, summary, **kwargs)
+            unique_id = ti.unique_id
+        else:
+            name = entity.get('name') or entity.get('summary')
+            ti = self.group(entity_type, owner, name=name)
+            fields = [
+                'body',
+                'dateAdded',
+                'date_added',
+                'eventDate',
+                'event_date',
+                'fileName',
+                'fileText',
+                'fileType',
+                'file_name',
+                'file_text',
+                'file_type',
+                'firstSeen',
+                'first_seen',
+                'from_addr',
+                'header',
+                'malware',
+                'password',
+                'publishDate',
+                'publish_date',
+                'status',
+                'subject',
+                'to_addr',
+                'xid',
+            ]
+            kwargs = {k: v for k, v in entity.items() if k in fields and v is not None}
+            batch_entity = batch.group(entity_type, name, **kwargs)
+            file_content = entity.get('file_content') or entity.get('fileContent')
+            if file_content is not None:
+                file_name = entity.get('file_name') or entity.get('fileName')
+                batch_entity.add_file(file_name, file_content)
+            unique_id = None
+
+        for attribute in attributes:
+            batch_entity.attribute(attribute.get('type'), attribute.get('value'))
+        for tag in tags:
+            batch_entity.tag(tag)
+        for label in security_labels:
+            batch_entity.security_label(label)
+        for xid in association_xids:
+            batch_entity.association(xid)
+
+        # the batch API only reports errors for the entity, the child status is unknown
+        return {
+            'status_code': None,
+            'main_type': ti.type,
+            'sub_type': ti.api_sub_type,
+            'api_type': ti.api_type,
+            'unique_id': unique_id,
+            'api_entity': ti.api_entity,
+            'api_branch': ti.api_branch,
+            'owner': owner,
+            'xid': batch_entity.xid,
+            'attributes': [
+                {'status_code': None, 'type': a.get('type', 'Description'), 'id': None}
+                for a in attributes
+            ],
+            'tags': [{'status_code': None} for _ in tags],
+            'security_labels': [{'status_code': None} for _ in security_labels],
+            'associations': [{'status_code': None} for _ in association_xids],
+        }
+
+    def _bulk_indicator_values(self, indicator_type, entity):
+        """Return the indicator value fields of the entity as passed to :py:meth:`indicator`.
+
+        Args:
+            indicator_type (str): The indicator type.
+            entity (dict): The entity to create.
+
+        Returns:
+            OrderedDict: The value of each value field (None if not set) in summary order.
+        """
+        upper_indicator_type = indicator_type.upper()
+        if upper_indicator_type == 'ADDRESS':
+            fields = ['ip']
+        elif upper_indicator_type in ['EMAIL ADDRESS', 'EMAILADDRESS']:
+            fields = ['address']
+        elif upper_indicator_type == 'FILE':
+            fields = ['md5', 'sha1', 'sha256']
+        elif upper_indicator_type == 'HOST':
+            fields = ['hostname']
+        elif upper_indicator_type == 'URL':
+            fields = ['url']
+        else:
+            # custom indicator values are passed using the lower case value label
+            custom_indicator_details = self._custom_indicator_classes.get(upper_indicator_type, {})
+            value_fields = custom_indicator_details.get('value_fields', [])
+            fields = [f.lower().replace(' ', '_') for f in value_fields]
+        return OrderedDict((f, entity.get(f)) for f in fields)
+
     def entities(self, tc_data, resource_type):
         """
         Yields a entity. Takes both a list of indicators/groups or a individual
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""ThreatConnect Threat Intelligence Response Cache"""
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    from urllib import unquote_plus  # Python 2
+    from urlparse import urlparse  # Python 2
+except ImportError:
+    from urllib.parse import unquote_plus, urlparse  # Python 3
+
+
+class TiResponseCache(object):
+    """Size bounded LRU cache with a TTL for TI single object responses.
+
+    Successful responses from :py:meth:`TiTcRequest.single` are cached by url, owner and query
+    parameters. Any POST, PUT or DELETE sent on the session the cache is attached to invalidates
+    the cached responses for each unique_id in the request path (e.g. updating an indicator,
+    adding a tag or attribute, or associating a group to it). The unique_ids are compared
+    decoded, so the quote_plus encoded unique_id of a URL indicator matches the request path.
+
+    .. code-block:: python
+
+        tcex.ti_cache = True
+        ti = tcex.ti.address('1.1.1.1', owner='MyOrg')
+        ti.single()  # GET
+        ti.single()  # cached
+        ti.add_tag('MyTag')  # invalidates 1.1.1.1
+        print(tcex.ti_cache.stats)
+
+    Args:
+        maxsize (int, default:1000): The maximum number of cached responses.
+        ttl (int, default:300): The number of seconds a response is cached.
+    """
+
+    def __init__(self, maxsize=1000, ttl=300):
+        """Initialize the Class properties."""
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._unique_ids = {}
+        self.hits = 0
+        self.maxsize = maxsize
+        self.misses = 0
+        self.ttl = ttl
+
+    def __len__(self):
+        """Return the number of cached responses."""
+        return len(self._cache)
+
+    @staticmethod
+    def _decode(unique_id):
+        """Return the decoded unique_id used to index the cached responses."""
+        return unquote_plus(str(unique_id))
+
+    @staticmethod
+    def key(url, params=None):
+        """Return the cache key for the url and query parameters.
+
+        Args:
+            url (str): The API url.
+            params (dict, optional): The query parameters (including owner).
+
+        Returns:
+            tuple: The cache key.
+        """
+        params = params or {}
+        return (url, tuple(sorted((str(k), str(v)) for k, v in params.items())))
+
+    def _remove(self, key):
+        """Remove the key from the cache and the unique_id index (lock must be held)."""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            keys = self._unique_ids.get(entry[0])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._unique_ids[entry[0]]
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._cache.clear()
+            self._unique_ids.clear()
+
+    def get(self, key):
+        """Return the cached response for the key or None if not cached or expired.
+
+        Args:
+            key (tuple): The cache key.
+
+        Returns:
+            requests.Response: The cached response.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[1] < time.time():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def invalidate(self, unique_id):
+        """Remove all cached responses for the unique_id.
+
+        Args:
+            unique_id (str): The unique_id of the indicator, group, or victim.
+        """
+        with self._lock:
+            for key in list(self._unique_ids.get(self._decode(unique_id), [])):
+                self._remove(key)
+
+    def invalidate_path(self, path):
+        """Remove the cached responses for every cached unique_id in the url path.
+
+        Args:
+            path (str): The request url or path (e.g. /v2/indicators/addresses/1.1.1.1/tags/a).
+        """
+        # split before decoding, an encoded "/" is part of the unique_id (e.g. a URL indicator)
+        segments = {self._decode(s) for s in urlparse(path).path.split('/')}
+        with self._lock:
+            for segment in segments:
+                for key in list(self._unique_ids.get(segment, [])):
+                    self._remove(key)
+
+    def response_hook(self, r, *args, **kwargs):  # pylint: disable=unused-argument
+        """Invalidate cached responses for write requests (Requests response hook)."""
+        if r.request is not None and r.request.method not in ['GET', 'HEAD', 'OPTIONS']:
+            self.invalidate_path(r.request.path_url)
+
+    def set(self, key, unique_id, response):
+        """Cache the response for the key.
+
+        Args:
+            key (tuple): The cache key.
+            unique_id (str): The unique_id of the indicator, group, or victim.
+            response (requests.Response): The response to cache.
+        """
+        if self.maxsize <= 0:
+            return
+        unique_id = self._decode(unique_id)
+        with self._lock:
+            self._remove(key)
+            self._cache[key] = (unique_id, time.time() + self.ttl, response)
+            self._unique_ids.setdefault(unique_id, set()).add(key)
+            while len(self._cache) > self.maxsize:
+                self._remove(next(iter(self._cache)))
+
+    @property
+    def stats(self):
+        """Return the cache counters.
+
+        Returns:
+            dict: The hits, misses, and size of the cache.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache)}
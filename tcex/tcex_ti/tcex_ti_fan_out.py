@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""ThreatConnect Threat Intelligence Fan Out Module"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Full, Queue
+
+
+class OwnerBackoff(object):
+    """Back off requests per owner when the server is throttling (429/503).
+
+    When a request returns one of the **status_codes** all requests for the same owner wait for
+    the Retry-After value (or an exponential delay) before they are sent, while requests for
+    other owners continue.
+
+    Args:
+        retries (int, default:5): The maximum number of retries for a request.
+        backoff_factor (float, default:1.0): The back off factor when there is no Retry-After.
+        max_delay (int, default:60): The maximum number of seconds to wait.
+        status_codes (tuple, default:(429, 503)): The status codes to back off on.
+    """
+
+    def __init__(self, retries=5, backoff_factor=1.0, max_delay=60, status_codes=(429, 503)):
+        """Initialize the Class properties."""
+        self._lock = threading.Lock()
+        self._until = {}
+        self.backoff_factor = backoff_factor
+        self.backoffs = {}
+        self.max_delay = max_delay
+        self.retries = retries
+        self.status_codes = status_codes
+
+    def delay(self, r, attempt):
+        """Return the number of seconds to wait before the next request.
+
+        Args:
+            r (requests.Response): The throttled response.
+            attempt (int): The number of the failed attempt (starting at 0).
+
+        Returns:
+            float: The number of seconds to wait.
+        """
+        try:
+            delay = float(r.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            delay = self.backoff_factor * (2 ** attempt)
+        return min(max(delay, 0), self.max_delay)
+
+    def request(self, owner, method, *args, **kwargs):
+        """Send the request retrying with back off while the owner is throttled.
+
+        Args:
+            owner (str): The ThreatConnect owner name.
+            method (callable): The session method (e.g. session.get).
+            args: The positional arguments for the method.
+            kwargs: The keyword arguments for the method.
+
+        Returns:
+            requests.Response: The response.
+        """
+        attempt = 0
+        while True:
+            self.wait(owner)
+            r = method(*args, **kwargs)
+            if r.status_code not in self.status_codes or attempt >= self.retries:
+                return r
+
+            delay = self.delay(r, attempt)
+            with self._lock:
+                self._until[owner] = max(self._until.get(owner, 0), time.time() + delay)
+                self.backoffs[owner] = self.backoffs.get(owner, 0) + 1
+            r.close()
+            attempt += 1
+
+    def wait(self, owner):
+        """Wait until the owner is no longer throttled."""
+        while True:
+            with self._lock:
+                delay = self._until.get(owner, 0) - time.time()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+
+class TiFanOut(object):
+    """Iterate over many TI sources concurrently as a single stream.
+
+    Each source is a tuple of (type, owner, filters) (filters is optional). The paginated
+    requests for each source run on a pool of **max_workers** threads, which caps the number of
+    concurrent requests, and the results are yielded as they arrive as (source, entity) tuples.
+    The order of the results within a source is preserved, the results from different sources
+    are interleaved.
+
+    .. code-block:: python
+
+        sources = [(t, o) for t in ['Address', 'Host'] for o in ['Org A', 'Org B']]
+        for (ti_type, owner, _), indicator in tcex.ti.fan_out(sources, max_workers=8):
+            ...
+
+    Args:
+        ti (TcExTi): An instance of TcExTi.
+        sources (list): The (type, owner, filters) tuples.
+        max_workers (int, default:8): The maximum number of sources requested concurrently.
+        backoff (OwnerBackoff, optional): The per owner back off, defaults to OwnerBackoff().
+        queue_size (int, default:10000): The maximum number of results held in memory.
+    """
+
+    def __init__(self, ti, sources, max_workers=8, backoff=None, queue_size=10000):
+        """Initialize the Class properties."""
+        self.ti = ti
+        self.backoff = backoff or OwnerBackoff()
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.sources = [(tuple(s) + (None,))[:3] for s in sources]
+
+    def __iter__(self):
+        """Yield the (source, entity) tuples."""
+        if not self.sources:
+            return
+
+        done = object()
+        results = Queue(self.queue_size)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=max(min(self.max_workers, len(self.sources)), 1))
+        for source in self.sources:
+            executor.submit(self._worker, source, results, stop, done)
+
+        try:
+            remaining = len(self.sources)
+            while remaining:
+                item = results.get()
+                if item[0] is done:
+                    remaining -= 1
+                    if item[1] is not None:
+                        raise item[1]
+                    continue
+                yield item
+        finally:
+            # stop the workers if the consumer stops early or a source failed
+            stop.set()
+            executor.shutdown(wait=False)
+
+    def _worker(self, source, results, stop, done):
+        """Add the results for a source to the queue."""
+        error = None
+        try:
+            if not stop.is_set():
+                ti_type, owner, filters = source
+                ti = self.ti.indicator(ti_type, owner) or self.ti.group(ti_type, owner)
+                ti.tc_requests.backoff = self.backoff
+                for entity in ti.many(filters=filters):
+                    if not self._put(results, (source, entity), stop):
+                        return
+        except Exception as e:  # pylint: disable=broad-except
+            error = e
+        self._put(results, (done, error), stop)
+
+    @staticmethod
+    def _put(results, item, stop):
+        """Add the item to the queue, returning False if the iteration was stopped."""
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
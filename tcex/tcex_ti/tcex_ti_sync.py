@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""ThreatConnect Threat Intelligence Incremental Sync Module"""
+import glob
+import json
+import os
+import re
+import shelve
+import time
+
+from .tcex_ti_tc_request import TiTcRequest
+
+
+class TiSync(object):
+    """Keep a local snapshot of the indicators for an owner in sync with ThreatConnect.
+
+    The first sync retrieves all indicators for the owner (and type). Each following sync only
+    retrieves the indicators modified since the previous sync (``modifiedSince``) and the
+    indicators deleted since the previous sync (``deleted`` endpoint), and applies them to the
+    snapshot. The cursor is saved after the snapshot has been written, so a failed sync is
+    retried from the previous cursor. Each sync overlaps the previous one by **overlap** seconds
+    to cover clock skew and writes in flight while the previous sync ran (applying the same
+    change twice has no effect).
+
+    The snapshot is a shelve keyed on the indicator id and the cursor is stored in a JSON file
+    next to it. A full sync builds a new snapshot next to the current one and only replaces it
+    once all indicators have been retrieved, so a failed full sync keeps the previous snapshot
+    and cursor.
+
+    .. code-block:: python
+
+        sync = tcex.ti.sync('MyOrg', indicator_type='Address')
+        results = sync.sync()
+        for indicator_id, indicator in sync.items():
+            ...
+        sync.close()
+
+    .. note:: Only indicators are supported since ThreatConnect only provides the deleted
+        endpoint for indicators.
+
+    Args:
+        tcex (TcEx): An instance of TcEx.
+        owner (str): The ThreatConnect owner name.
+        indicator_type (str, optional): The indicator type (e.g. Address), default to all types.
+        path (str, optional): The directory for the snapshot, defaults to tc_temp_path.
+        overlap (int, default:300): The number of seconds each sync overlaps the previous sync.
+    """
+
+    def __init__(self, tcex, owner, indicator_type=None, path=None, overlap=300):
+        """Initialize the Class properties."""
+        self.tcex = tcex
+        self._cursor = None
+        self._store = None
+        self.indicator_type = indicator_type
+        self.overlap = overlap
+        self.owner = owner
+        self.tc_requests = TiTcRequest(self.tcex)
+
+        # ti indicator object provides the api branch and entity for the type
+        self.ti = self.tcex.ti.indicator(indicator_type)
+        if self.ti is None:
+            self.tcex.handle_error(925, ['indicator_type', 'sync', 'indicator_type', None, None])
+
+        name = re.sub(r'[^\w.-]', '_', '{}-{}'.format(owner, indicator_type or 'indicators'))
+        path = path or self.tcex.default_args.tc_temp_path
+        self.store_fqfn = os.path.join(path, 'ti-sync-{}'.format(name))
+        self.cursor_fqfn = '{}.cursor'.format(self.store_fqfn)
+        self.full_fqfn = '{}.full'.format(self.store_fqfn)
+
+    def __contains__(self, indicator_id):
+        """Return True if the indicator is in the snapshot."""
+        return str(indicator_id) in self.store
+
+    def __len__(self):
+        """Return the number of indicators in the snapshot."""
+        return len(self.store)
+
+    def close(self):
+        """Close the snapshot store."""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    @property
+    def cursor(self):
+        """Return the high-water mark of the last successful sync (None before the first sync)."""
+        if self._cursor is None and os.path.isfile(self.cursor_fqfn):
+            with open(self.cursor_fqfn, 'r') as fh:
+                self._cursor = json.load(fh).get('cursor')
+        return self._cursor
+
+    @cursor.setter
+    def cursor(self, cursor):
+        """Save the high-water mark atomically."""
+        tmp_fqfn = '{}.tmp'.format(self.cursor_fqfn)
+        with open(tmp_fqfn, 'w') as fh:
+            json.dump({'cursor': cursor}, fh)
+        os.replace(tmp_fqfn, self.cursor_fqfn)
+        self._cursor = cursor
+
+    @staticmethod
+    def _files(fqfn):
+        """Return the files of the shelve (the dbm backend may add extensions to the name)."""
+        filenames = glob.glob('{}*'.format(glob.escape(fqfn)))
+        return [f for f in filenames if f == fqfn or f[len(fqfn)] == '.']
+
+    def _remove_files(self, fqfn):
+        """Remove the files of the shelve."""
+        for filename in self._files(fqfn):
+            os.remove(filename)
+
+    def _replace_store(self):
+        """Replace the snapshot with the snapshot built by a full sync.
+
+        The cursor is removed first, so a failure while the files are moved results in a full
+        sync on the next run instead of applying changes to a partial snapshot.
+        """
+        self.close()
+        if os.path.isfile(self.cursor_fqfn):
+            os.remove(self.cursor_fqfn)
+        self._cursor = None
+        for filename in self._files(self.full_fqfn):
+            os.replace(filename, '{}{}'.format(self.store_fqfn, filename[len(self.full_fqfn) :]))
+
+    def get(self, indicator_id, default=None):
+        """Return the indicator data from the snapshot.
+
+        Args:
+            indicator_id (int|str): The ThreatConnect indicator id.
+            default (any, optional): The value to return if the indicator is not found.
+
+        Returns:
+            dict: The indicator data.
+        """
+        return self.store.get(str(indicator_id), default)
+
+    def items(self):
+        """Yield the id and data of each indicator in the snapshot."""
+        for indicator_id in self.store.keys():
+            yield indicator_id, self.store[indicator_id]
+
+    @property
+    def store(self):
+        """Return the snapshot store."""
+        if self._store is None:
+            self._store = shelve.open(self.store_fqfn)
+        return self._store
+
+    def sync(self, full=False):
+        """Apply the changes since the last sync to the snapshot.
+
+        Args:
+            full (bool, default:False): If True rebuild the snapshot from all indicators.
+
+        Returns:
+            dict: The number of indicators updated and deleted and the new cursor.
+        """
+        started = time.time()
+        cursor = None if full else self.cursor
+        results = {'cursor': None, 'deleted': 0, 'full': cursor is None, 'updated': 0}
+
+        params = {}
+        if cursor is None:
+            # build the full snapshot separately to keep the current snapshot if the sync fails
+            store = shelve.open(self.full_fqfn, 'n')
+        else:
+            params['modifiedSince'] = cursor
+            store = self.store
+
+        try:
+            for indicator in self.tc_requests.many(
+                self.ti.api_type,
+                self.ti.api_branch,
+                self.ti.api_entity,
+                owner=self.owner,
+                params=params,
+            ):
+                store[str(indicator.get('id'))] = indicator
+                results['updated'] += 1
+        except Exception:
+            if cursor is None:
+                store.close()
+                self._remove_files(self.full_fqfn)
+            raise
+
+        if cursor is None:
+            store.close()
+            self._replace_store()
+        else:
+            for indicator in self.tc_requests.deleted(
+                self.ti.api_type, self.ti.api_branch, cursor, owner=self.owner
+            ):
+                if self.store.pop(str(indicator.get('id')), None) is not None:
+                    results['deleted'] += 1
+
+        # save the snapshot before moving the cursor forward
+        self.store.sync()
+        results['cursor'] = time.strftime(
+            '%Y-%m-%dT%H:%M:%SZ', time.gmtime(started - self.overlap)
+        )
+        self.cursor = results['cursor']
+        self.tcex.log.debug(
+            'TI sync for {} ({}): {}'.format(self.owner, self.indicator_type or 'all', results)
+        )
+        return results
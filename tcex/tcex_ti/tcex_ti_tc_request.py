@@ -5,21 +5,45 @@ try:
 except ImportError:
     from urllib.parse import quote  # Python
 import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ..utils import JsonArrayStream
 
 # import local modules for dynamic reference
 module = __import__(__name__)
 
 
 class TiTcRequest:
-    """Common API calls to ThreatConnect"""
-
-    def __init__(self, tcex):
-        """
-
-        Args:
-            tcex:
-        """
+    """Common API calls to ThreatConnect
+
+    The paging options are used by all paginated requests (e.g. :py:meth:`many`) and can be
+    changed on an instance, passed on creation, or (prefetch and incremental) overridden for a
+    single call of :py:meth:`many`. The TI objects expose their instance as ``tc_requests``.
+
+    .. code-block:: python
+
+        indicator = tcex.ti.indicator('Address', 'MyOrg')
+        for address in indicator.many(prefetch=4, incremental=True):
+            ...
+
+    Args:
+        tcex (TcEx): An instance of TcEx.
+        prefetch (int, default:1): The number of result pages requested concurrently. When
+            greater than 1 the result count of the first page is used to request the following
+            pages concurrently, results are still returned in order.
+        incremental (bool, default:False): If True the entities of each page are decoded from
+            the response stream as they arrive instead of decoding the entire page.
+        backoff (OwnerBackoff, optional): A gate the page requests wait on, so requests for an
+            owner that was throttled are paused (see :py:meth:`TcExTi.fan_out`).
+    """
+
+    def __init__(self, tcex, prefetch=1, incremental=False, backoff=None):
+        """Initialize Class Properties."""
         self.tcex = tcex
+        self.backoff = backoff
+        self.incremental = incremental
+        self.prefetch = prefetch
         self.result_limit = 10000
 
     def create(self, main_type, sub_type, data, owner):
@@ -94,6 +118,8 @@ class TiTcRequest:
     def single(self, main_type, sub_type, unique_id, owner=None, filters=None, params=None):
         """
 
+        When **tcex.ti_cache** is enabled successful responses are cached (see TiResponseCache).
+
         Args:
             main_type:
             sub_type:
@@ -116,9 +142,29 @@ class TiTcRequest:
         else:
             url = '/v2/{}/{}/{}'.format(main_type, sub_type, unique_id)
 
-        return self.tcex.session.get(url, params=params)
+        cache = self.tcex.ti_cache
+        if cache is None:
+            return self.tcex.session.get(url, params=params)
+
+        key = cache.key(url, params)
+        r = cache.get(key)
+        if r is None:
+            r = self.tcex.session.get(url, params=params)
+            if r.ok:
+                cache.set(key, unique_id, r)
+        return r
 
-    def many(self, main_type, sub_type, api_entity, owner=None, filters=None, params=None):
+    def many(
+        self,
+        main_type,
+        sub_type,
+        api_entity,
+        owner=None,
+        filters=None,
+        params=None,
+        prefetch=None,
+        incremental=None,
+    ):
         """
 
         Args:
@@ -128,6 +174,8 @@ class TiTcRequest:
             filters:
             owner:
             params:
+            prefetch (int, optional): Override the **prefetch** setting for this request.
+            incremental (bool, optional): Override the **incremental** setting for this request.
 
         Returns:
 
@@ -143,38 +191,170 @@ class TiTcRequest:
         else:
             url = '/v2/{}/{}'.format(main_type, sub_type)
 
-        for i in self._iterate(url, params, api_entity):
+        for i in self._iterate(url, params, api_entity, prefetch, incremental):
             yield i
 
-    def _iterate(self, url, params, api_entity):
-        """
+    def _iterate(self, url, params, api_entity, prefetch=None, incremental=None):
+        """Yield all entities for a paginated request.
+
+        When **prefetch** is greater than 1 the total result count from the first page is used to
+        plan the remaining page offsets and up to prefetch pages are requested concurrently.
+        Results are still yielded in order and at most prefetch pages are held in memory.
+
+        When **incremental** is True the entities of pages that are not prefetched are decoded
+        from the response stream as they arrive instead of decoding the entire page.
+
         Args:
-            url:
-            params:
-            api_entity:
+            url (str): The API url.
+            params (dict): The query parameters for the request.
+            api_entity (str): The name of the entity array in the response data.
+            prefetch (int, optional): Override the **prefetch** setting.
+            incremental (bool, optional): Override the **incremental** setting.
 
-        Return:
+        Yields:
+            dict: The entity data.
         """
+        if prefetch is None:
+            prefetch = self.prefetch
         params['resultLimit'] = self.result_limit
-        should_iterate = True
+        data, results = self._page(url, params, 0, api_entity, incremental)
         result_start = 0
-        while should_iterate:
-            # params['resultOffset'] = result_offset
-            params['resultStart'] = result_start
-            r = self.tcex.session.get(url, params=params)
-            if not self.success(r):
-                err = r.text or r.reason
-                self.tcex.handle_error(950, [r.status_code, err, r.url])
-
-            data = r.json().get('data', {}).get(api_entity, [])
+        count = 0
+        for result in results:
+            count += 1
+            yield result
 
-            if len(data) < self.result_limit:
-                should_iterate = False
+        if prefetch > 1 and count >= self.result_limit:
+            offsets = range(self.result_limit, data.get('resultCount') or 0, self.result_limit)
+            data = None  # release the first page
+            pages = self._prefetch(url, params, api_entity, offsets, prefetch, incremental)
+            try:
+                for result_start, results in pages:
+                    count = len(results)
+                    for result in results:
+                        yield result
+            finally:
+                # cancel any outstanding page requests if the consumer stops early
+                pages.close()
+
+        # continue one page at a time (also picks up results added since the count was taken)
+        while count >= self.result_limit:
             result_start += self.result_limit
-
-            for result in data:
+            _, results = self._page(url, params, result_start, api_entity, incremental)
+            count = 0
+            for result in results:
+                count += 1
                 yield result
 
+    def _page(self, url, params, result_start, api_entity, incremental=None):
+        """Request a single page of results.
+
+        Args:
+            url (str): The API url.
+            params (dict): The query parameters for the request.
+            result_start (int): The result offset for the page.
+            api_entity (str): The name of the entity array in the response data.
+            incremental (bool, optional): Override the **incremental** setting.
+
+        Returns:
+            tuple: The response data and the entities for the page. When decoding incrementally
+                the entities are a generator and the data is populated as the entities are read.
+        """
+        params = dict(params)
+        params['resultStart'] = result_start
+        if incremental is None:
+            incremental = self.incremental
+        if incremental:
+            return self._page_stream(url, params, api_entity)
+
+        r = self._get(url, params)
+        if not self.success(r):
+            err = r.text or r.reason
+            self.tcex.handle_error(950, [r.status_code, err, r.url])
+        data = r.json().get('data', {})
+        return data, data.get(api_entity, [])
+
+    def _get(self, url, params, **kwargs):
+        """Send a GET request for a page, waiting on the **backoff** gate when configured."""
+        if self.backoff is None:
+            return self.tcex.session.get(url, params=params, **kwargs)
+        return self.backoff.request(
+            params.get('owner'), self.tcex.session.get, url, params=params, **kwargs
+        )
+
+    def _page_stream(self, url, params, api_entity):
+        """Request a single page of results decoding the entities as they arrive.
+
+        Returns:
+            tuple: The response data and a generator of the entities for the page.
+        """
+        r = self._get(url, params, stream=True)
+        if not r.ok:
+            err = r.text or r.reason
+            self.tcex.handle_error(950, [r.status_code, err, r.url])
+        stream = JsonArrayStream(r.iter_content(65536), ['data', api_entity])
+
+        def entities():
+            """Yield the entities and validate the response status."""
+            try:
+                for entity in stream:
+                    yield entity
+            except ValueError as e:
+                self.tcex.handle_error(950, [r.status_code, e, r.url])
+            finally:
+                r.close()
+            if stream.metadata.get('status') != 'Success':
+                self.tcex.handle_error(950, [r.status_code, stream.metadata, r.url])
+
+        return stream.metadata.setdefault('data', {}), entities()
+
+    def _prefetch(self, url, params, api_entity, offsets, prefetch, incremental=None):
+        """Yield the offset and entities for each page keeping up to prefetch requests in flight.
+
+        Args:
+            url (str): The API url.
+            params (dict): The query parameters for the request.
+            api_entity (str): The name of the entity array in the response data.
+            offsets (iterable): The result offsets of the pages to retrieve.
+            prefetch (int): The maximum number of requests in flight.
+            incremental (bool, optional): Override the **incremental** setting.
+
+        Yields:
+            tuple: The result offset and the list of entities for the page.
+        """
+        offsets = iter(offsets)
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=prefetch)
+
+        def fetch(offset):
+            """Submit the request for the page at offset."""
+            future = executor.submit(
+                self._page_list, url, params, offset, api_entity, incremental
+            )
+            pending.append((offset, future))
+
+        try:
+            for offset in offsets:
+                fetch(offset)
+                if len(pending) >= prefetch:
+                    break
+
+            while pending:
+                offset, future = pending.popleft()
+                results = future.result()
+                next_offset = next(offsets, None)
+                if next_offset is not None:
+                    fetch(next_offset)
+                yield offset, results
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _page_list(self, url, params, result_start, api_entity, incremental=None):
+        """Return the entities for a single page as a list (used for prefetched pages)."""
+        return list(self._page(url, params, result_start, api_entity, incremental)[1])
+
     def request(
         self, main_type, sub_type, result_limit, result_start, owner=None, filters=None, params=None
     ):
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""ThreatConnect Threat Intelligence asyncio Module"""
+import asyncio
+from collections import deque
+from urllib.parse import quote
+
+
+class AsyncTiTcRequest:
+    """Common API calls to ThreatConnect using the asyncio session.
+
+    The methods mirror :py:class:`TiTcRequest` as coroutines (``many`` is an async generator)
+    and use ``tcex.async_session``. Responses are aiohttp responses with the body already read.
+
+    .. code-block:: python
+
+        tc_request = AsyncTiTcRequest(tcex)
+        r = await tc_request.single('indicators', 'addresses', '1.1.1.1', owner='MyOrg')
+        async for indicator in tc_request.many('indicators', None, 'indicator', owner='MyOrg'):
+            ...
+    """
+
+    def __init__(self, tcex):
+        """
+
+        Args:
+            tcex:
+        """
+        self.tcex = tcex
+        self.prefetch = 1
+        self.result_limit = 10000
+
+    @property
+    def session(self):
+        """Return the asyncio session."""
+        return self.tcex.async_session
+
+    @staticmethod
+    def _url(main_type, sub_type, *parts):
+        """Return the API url for the provided types and path parts."""
+        url = '/v2/{}'.format(main_type)
+        if sub_type:
+            url = '{}/{}'.format(url, sub_type)
+        for part in parts:
+            url = '{}/{}'.format(url, part)
+        return url
+
+    async def create(self, main_type, sub_type, data, owner):
+        """
+
+        Args:
+            main_type:
+            sub_type:
+            data:
+            owner:
+
+        Returns:
+
+        """
+        url = self._url(main_type, sub_type)
+        return await self.session.post(url, json=data, params={'owner': owner})
+
+    async def delete(self, main_type, sub_type, unique_id, owner=None):
+        """
+        Deletes the Indicator/Group/Victim or Security Label
+        Args:
+            main_type:
+            sub_type:
+            unique_id:
+            owner:
+        """
+        params = {'owner': owner} if owner else {}
+        url = self._url(main_type, sub_type, unique_id)
+        return await self.session.delete(url, params=params)
+
+    async def update(self, main_type, sub_type, unique_id, data, owner=None):
+        """
+
+        Args:
+            main_type:
+            sub_type:
+            unique_id:
+            data:
+            owner:
+
+        Returns:
+
+        """
+        params = {'owner': owner} if owner else {}
+        url = self._url(main_type, sub_type, unique_id)
+        return await self.session.put(url, params=params, json=data)
+
+    async def single(self, main_type, sub_type, unique_id, owner=None, filters=None, params=None):
+        """
+
+        Args:
+            main_type:
+            sub_type:
+            unique_id:
+            owner:
+            filters:
+            params:
+
+        Returns:
+
+        """
+        params = params or {}
+
+        if owner:
+            params['owner'] = owner
+        if filters and filters.filters:
+            params['filters'] = filters.filters_string
+        url = self._url(main_type, sub_type, unique_id)
+        return await self.session.get(url, params=params)
+
+    async def many(self, main_type, sub_type, api_entity, owner=None, filters=None, params=None):
+        """Yield all entities for the provided type.
+
+        When **prefetch** is greater than 1, up to prefetch pages are requested concurrently and
+        results are yielded in order.
+
+        Args:
+            main_type:
+            sub_type:
+            api_entity:
+            owner:
+            filters:
+            params:
+
+        Yields:
+            dict: The entity data.
+        """
+        params = params or {}
+
+        if owner:
+            params['owner'] = owner
+        if filters and filters.filters:
+            params['filters'] = filters.filters_string
+        params['resultLimit'] = self.result_limit
+        url = self._url(main_type, sub_type)
+
+        data = await self._page(url, params, 0)
+        results = data.get(api_entity, [])
+        result_start = 0
+        for result in results:
+            yield result
+
+        if self.prefetch > 1 and len(results) >= self.result_limit:
+            result_count = data.get('resultCount') or 0
+            offsets = iter(range(self.result_limit, result_count, self.result_limit))
+            pending = deque()
+
+            def fetch(offset):
+                """Schedule the request for the page at offset."""
+                pending.append((offset, asyncio.ensure_future(self._page(url, params, offset))))
+
+            try:
+                for offset in offsets:
+                    fetch(offset)
+                    if len(pending) >= self.prefetch:
+                        break
+
+                while pending:
+                    result_start, task = pending.popleft()
+                    results = (await task).get(api_entity, [])
+                    offset = next(offsets, None)
+                    if offset is not None:
+                        fetch(offset)
+                    for result in results:
+                        yield result
+            finally:
+                # cancel any outstanding page requests if the consumer stops early
+                for _, task in pending:
+                    task.cancel()
+
+        # continue one page at a time (also picks up results added since the count was taken)
+        while len(results) >= self.result_limit:
+            result_start += self.result_limit
+            results = (await self._page(url, params, result_start)).get(api_entity, [])
+            for result in results:
+                yield result
+
+    async def _page(self, url, params, result_start):
+        """Return the data for a single page of results.
+
+        Args:
+            url (str): The API url.
+            params (dict): The query parameters for the request.
+            result_start (int): The result offset for the page.
+
+        Returns:
+            dict: The data from the response.
+        """
+        params = dict(params)
+        params['resultStart'] = result_start
+        r = await self.session.get(url, params=params)
+        response_data = await self.json(r)
+        if response_data is None or response_data.get('status') != 'Success':
+            err = await r.text()
+            self.tcex.handle_error(950, [r.status, err, r.url])
+        return (response_data or {}).get('data', {})
+
+    @staticmethod
+    async def json(r):
+        """Return the JSON response data or None if the response failed."""
+        if r.status >= 400:
+            return None
+        try:
+            return await r.json(content_type=None)
+        except ValueError:
+            return None
+
+    async def tag(self, main_type, sub_type, unique_id, tag, action='GET', owner=None, params=None):
+        """
+
+        Args:
+            main_type:
+            sub_type:
+            unique_id:
+            tag:
+            action:
+            owner:
+            params:
+
+        Return:
+
+        """
+        params = params or {}
+
+        if owner:
+            params['owner'] = owner
+
+        action = action.upper()
+        url = self._url(main_type, sub_type, unique_id, 'tags', quote(tag))
+        response = None
+        if action == 'ADD':
+            response = await self.session.post(url, params=params)
+        elif action == 'DELETE':
+            response = await self.session.delete(url, params=params)
+        elif action == 'GET':
+            response = await self.session.get(url, params=params)
+        else:
+            self.tcex.log.error('_tags error')
+        return response
+
+    async def add_tag(self, main_type, sub_type, unique_id, tag, owner=None):
+        """
+
+        Args:
+            main_type:
+            sub_type:
+            unique_id:
+            tag:
+            owner:
+
+        Return:
+
+        """
+        return await self.tag(main_type, sub_type, unique_id, tag, action='ADD', owner=owner)
+
+    async def delete_tag(self, main_type, sub_type, unique_id, tag, owner=None):
+        """
+
+        Args:
+            main_type:
+            sub_type:
+            unique_id:
+            tag:
+            owner:
+
+        Return:
+
+        """
+        return await self.tag(main_type, sub_type, unique_id, tag, action='DELETE', owner=owner)
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
 """Utils module for TcEx Framework"""
 # flake8: noqa
+from .json_stream import JsonArrayStream
 from .utils import Utils
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""TcEx Framework JSON Stream Module."""
+import codecs
+import json
+import re
+
+
+class JsonArrayStream(object):
+    """Incrementally decode the entries of a JSON array nested in a JSON object.
+
+    The response is read one chunk at a time and each entry of the array is decoded as soon as
+    it is complete, so only the current entry (and the unread part of the current chunk) is held
+    in memory. All other values found in the objects on the path to the array are added to
+    **metadata** as they are read (e.g. status and resultCount).
+
+    .. code-block:: python
+
+        r = tcex.session.get('/v2/indicators', params=params, stream=True)
+        results = JsonArrayStream(r.iter_content(65536), ['data', 'indicator'])
+        for indicator in results:
+            ...
+        status = results.metadata.get('status')
+
+    Args:
+        chunks (iterable): An iterable of bytes (e.g. response.iter_content()).
+        path (list): The keys of the nested objects leading to the array.
+        encoding (str, default:utf-8): The encoding of the response.
+    """
+
+    # the end of a number or literal, the special characters in a string, and the characters
+    # that change the nesting depth of an object or array
+    _primitive_end = re.compile(r'[\s,:\]}]')
+    _string_special = re.compile(r'["\\]')
+    _structural = re.compile(r'["\[\]{}]')
+    _value_delimiters = [',', ':', ']', '}', ' ', '\t', '\n', '\r']
+    _whitespace = ' \t\n\r'
+
+    def __init__(self, chunks, path, encoding='utf-8'):
+        """Initialize Class Properties."""
+        self._buffer = ''
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._entries = None
+        self._eof = False
+        self._json_decoder = json.JSONDecoder()
+        self._lookahead = []
+        self._pos = 0
+        self.metadata = {}
+        self.path = path
+
+    def __iter__(self):
+        """Yield each entry of the array."""
+        if self._entries is None:
+            self._entries = self._document()
+        while self._lookahead:
+            yield self._lookahead.pop()
+        for entry in self._entries:
+            yield entry
+
+    def _document(self):
+        """Yield each entry of the array and validate the rest of the document."""
+        for entry in self._object(self.path, self.metadata):
+            yield entry
+        if self._peek() is not None:
+            raise ValueError('Extra data after JSON document at position {}.'.format(self._pos))
+
+    def _expect(self, char):
+        """Consume the next non-whitespace character which must match char."""
+        if self._peek() != char:
+            raise ValueError('Expecting "{}" at position {}.'.format(char, self._pos))
+        self._pos += 1
+
+    def _fill(self):
+        """Read the next chunk into the buffer, returning False if there is no more data."""
+        if self._eof:
+            return False
+
+        if self._pos > 65536:
+            # drop the consumed part of the buffer
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            self._buffer += self._decoder.decode(b'', final=True)
+        else:
+            self._buffer += self._decoder.decode(chunk)
+        return True
+
+    def _object(self, path, metadata):
+        """Yield the array entries from the object at the current position."""
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+
+        while True:
+            key = self._value()
+            self._expect(':')
+            if path and key == path[0] and self._peek() == ('[' if len(path) == 1 else '{'):
+                if len(path) == 1:
+                    for entry in self._array():
+                        yield entry
+                else:
+                    for entry in self._object(path[1:], metadata.setdefault(key, {})):
+                        yield entry
+            else:
+                metadata[key] = self._value()
+
+            char = self._peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise ValueError('Expecting "," or "}}" at position {}.'.format(self._pos - 1))
+
+    def _array(self):
+        """Yield the entries of the array at the current position."""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+
+        while True:
+            yield self._value()
+            char = self._peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError('Expecting "," or "]" at position {}.'.format(self._pos - 1))
+
+    def _peek(self):
+        """Return the next non-whitespace character without consuming it (None at the end)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in self._whitespace:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return None
+
+    def _scan(self, state):
+        """Return the end position of the value at the current position or None if incomplete.
+
+        Args:
+            state (list): The scan offset from the start of the value, the nesting depth, and
+                True if the scan stopped in a string. Updated so the scan can continue from
+                where it stopped once more data has been read.
+
+        Returns:
+            int: The position after the end of the value.
+        """
+        buffer = self._buffer
+        offset, depth, in_string = state
+        pos = self._pos + offset
+        if buffer[self._pos] not in '{["':
+            match = self._primitive_end.search(buffer, pos)
+            if match is not None:
+                return match.start()
+            pos = len(buffer)
+        while pos < len(buffer):
+            if in_string:
+                match = self._string_special.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                elif match.group() == '\\':
+                    if match.end() == len(buffer):
+                        # continue from the escape once the escaped character has been read
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                else:
+                    in_string = False
+                    pos = match.end()
+                    if depth == 0:
+                        return pos
+                continue
+
+            match = self._structural.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                continue
+            pos = match.end()
+            if match.group() == '"':
+                in_string = True
+            elif match.group() in '[{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return pos
+        state[:] = [pos - self._pos, depth, in_string]
+        return None
+
+    def _value(self):
+        """Decode and consume the complete JSON value at the current position.
+
+        A value that is not complete in the buffer is decoded once its end has been found. The
+        scan for the end continues from where it stopped after each chunk is read, so a value
+        spanning many chunks is only scanned and decoded once.
+        """
+        self._peek()
+        try:
+            value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            # a number at the end of the buffer (e.g. "2.5e") may continue in the next chunk
+            if self._eof or self._buffer[end : end + 1] in self._value_delimiters:
+                self._pos = end
+                return value
+        except ValueError:
+            if self._eof:
+                raise
+
+        state = [0, 0, False]
+        while self._scan(state) is None and self._fill():
+            pass
+        value, self._pos = self._json_decoder.raw_decode(self._buffer, self._pos)
+        return value
+
+    def start(self):
+        """Decode the document up to the first entry of the array.
+
+        The values before the array (e.g. the response status) are available in **metadata**
+        once this method returns. When there are no entries the entire document is decoded.
+
+        Returns:
+            bool: True if the array has at least one entry.
+        """
+        if self._entries is None:
+            self._entries = self._document()
+            for entry in self._entries:
+                self._lookahead.append(entry)
+                break
+        return bool(self._lookahead)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Batch Poll Module."""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from tcex.batch.batch_poll import (
+    BatchPoller,
+    HeuristicPollStrategy,
+    PollStrategy,
+    ProgressPollStrategy,
+)
+
+from ..stubs import LocalServer, StubTcEx
+
+
+class ConcurrencyStrategy(HeuristicPollStrategy):
+    """Heuristic strategy recording the number of threads in its methods at the same time."""
+
+    def __init__(self):
+        """Initialize Class Properties."""
+        super(ConcurrencyStrategy, self).__init__()
+        self.active = 0
+        self.max_active = 0
+
+    def _enter(self):
+        """Record a thread in a strategy method."""
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        self.active -= 1
+
+    def completed(self, batch_id, elapsed, poll_count):
+        """Record that a batch job completed."""
+        self._enter()
+        super(ConcurrencyStrategy, self).completed(batch_id, elapsed, poll_count)
+
+    def initial_interval(self, batch_id, batch_count=None):
+        """Return a short initial interval."""
+        self._enter()
+        return 0.01
+
+    def next_interval(self, batch_id, batch_status, elapsed, poll_count, **kwargs):
+        """Return a short interval."""
+        self._enter()
+        return 0.01
+
+
+class BatchStatusHandler(BaseHTTPRequestHandler):
+    """Local stub of the /v2/batch/{id} endpoint.
+
+    Each job processes 100 entities per poll and is completed after 4 polls.
+    """
+
+    polls = {}
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Return the batch status for the requested id."""
+        batch_id = int(re.search(r'/v2/batch/(\d+)', self.path).group(1))
+        count = self.polls.get(batch_id, 0) + 1
+        self.polls[batch_id] = count
+        processed = min(count * 100, 400)
+        batch_status = {
+            'id': batch_id,
+            'status': 'Completed' if processed == 400 else 'Running',
+            'errorCount': 0,
+            'successCount': processed,
+            'unprocessCount': 400 - processed,
+        }
+        body = json.dumps({'status': 'Success', 'data': {'batchStatus': batch_status}})
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body.encode('utf-8'))
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Suppress request logging."""
+
+
+# pylint: disable=R0201,W0201
+class TestBatchPoll:
+    """Test the TcEx Batch Poll Module."""
+
+    def setup_class(self):
+        """Configure setup before all tests."""
+        self.server = LocalServer(BatchStatusHandler)
+        self.tcex = StubTcEx(self.server.session())
+
+    def teardown_class(self):
+        """Stop the stub server."""
+        self.server.shutdown()
+
+    def test_progress_poll_many(self):
+        """Test polling several batch ids in one pass with the progress strategy."""
+        strategy = ProgressPollStrategy(initial=0.05, min_interval=0.01, max_interval=0.2)
+        poller = BatchPoller(self.tcex, strategy)
+        results = poller.poll([101, 102, 103], timeout=10)
+        for batch_id in [101, 102, 103]:
+            batch_status = results[batch_id].get('data').get('batchStatus')
+            assert batch_status.get('status') == 'Completed'
+            assert batch_status.get('successCount') == 400
+            assert BatchStatusHandler.polls[batch_id] == 4
+        assert poller.metrics.count == 12
+        assert poller.metrics.errors == 0
+
+    def test_progress_estimate(self):
+        """Test the progress strategy estimates time to completion from the progress rate."""
+        strategy = ProgressPollStrategy(initial=1, min_interval=1, max_interval=60)
+        strategy.initial_interval('1')
+        strategy.next_interval('1', {'successCount': 100, 'unprocessCount': 900}, 10, 1)
+        interval = strategy.next_interval('1', {'successCount': 300, 'unprocessCount': 700}, 20, 2)
+        # 200 entities in 10 seconds leaves 35 seconds for the remaining 700
+        assert interval == 35
+
+    def test_heuristic_strategy(self):
+        """Test the heuristic strategy matches the legacy poll intervals."""
+        strategy = HeuristicPollStrategy()
+        assert strategy.initial_interval('1', 3000) == 10
+        assert strategy.next_interval('1', {}, 10, 1) == 7
+        assert strategy.next_interval('1', {}, 10, 10) == 20
+        assert strategy.next_interval('1', {}, 10, 1, retry_seconds=1, back_off=1) == 2
+        strategy.completed('1', 10, 2)
+        assert strategy.initial_interval('2') == 7
+
+    def test_shared_poller(self):
+        """Test the strategy of a poller shared by several threads is called by one at a time."""
+        strategy = ConcurrencyStrategy()
+        poller = BatchPoller(self.tcex, strategy)
+        threads = [
+            threading.Thread(target=poller.poll, args=([batch_id],), kwargs={'timeout': 10})
+            for batch_id in [201, 202, 203, 204]
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert [BatchStatusHandler.polls[b] for b in [201, 202, 203, 204]] == [4, 4, 4, 4]
+        assert strategy.max_active == 1
+        assert len(strategy.poll_interval_times) == 4
+
+    def test_incomplete_strategy(self):
+        """Test a strategy missing a required method can't be instantiated."""
+
+        class InitialOnlyStrategy(PollStrategy):  # pylint: disable=abstract-method
+            """Strategy without next_interval."""
+
+            def initial_interval(self, batch_id, batch_count=None):
+                """Return the seconds to wait before the first poll."""
+                return 1
+
+        with pytest.raises(TypeError):
+            InitialOnlyStrategy()
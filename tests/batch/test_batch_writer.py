@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Batch Writer Module."""
+import json
+
+from tcex.batch.batch_writer import BatchWriter
+
+
+# pylint: disable=R0201,W0201
+class TestBatchWriter:
+    """Test the TcEx Batch Writer Module."""
+
+    @staticmethod
+    def content(body):
+        """Return the decoded content part of a batch body."""
+        raw = body.read(10) + body.read()
+        assert len(raw) == len(body)
+        content = raw.split(b'filename="content"\r\n\r\n')[1].rsplit(b'\r\n--', 1)[0]
+        return json.loads(content.decode('utf-8'))
+
+    def test_max_chunk(self):
+        """Test bodies are cut at the max entity count."""
+        units = [('indicator', [{'xid': 'i{}'.format(i)}]) for i in range(5)]
+        writer = BatchWriter(units)
+        counts = []
+        while True:
+            body = writer.next_body({'owner': 'TCI'}, 2)
+            if body is None:
+                break
+            counts.append(len(self.content(body).get('indicator')))
+        assert counts == [2, 2, 1]
+
+    def test_max_size(self):
+        """Test bodies are cut at the byte budget without splitting group associations."""
+        units = [
+            ('group', [{'xid': 'g1', 'associatedGroupXid': ['g2']}, {'xid': 'g2'}]),
+            ('indicator', [{'xid': 'x' * 200}]),
+            ('indicator', [{'xid': 'i1'}]),
+        ]
+        writer = BatchWriter(units)
+        bodies = []
+        while True:
+            body = writer.next_body({'owner': 'TCI'}, 5000, 550)
+            if body is None:
+                break
+            assert len(body) <= 550
+            bodies.append(self.content(body))
+        assert len(bodies) == 2
+        assert [g.get('xid') for g in bodies[0].get('group')] == ['g1', 'g2']
+        assert [i.get('xid') for i in bodies[1].get('indicator')] == ['x' * 200, 'i1']
+
+    def test_carried_files(self):
+        """Test the file of a carried Document is returned with the body containing it."""
+        files = {}
+
+        def units():
+            yield 'indicator', [{'xid': 'x' * 200}]
+            # the file data is added when the group is generated, as in Batch.data_units
+            files['d1'] = {'fileContent': 'one', 'fileName': 'one.txt', 'type': 'Document'}
+            yield 'group', [{'xid': 'd1', 'type': 'Document', 'name': 'd' * 200}]
+
+        writer = BatchWriter(units(), files=files)
+        first = writer.next_body({'owner': 'TCI'}, 5000, 550)
+        assert self.content(first).get('group') == []
+        assert first.files == {}
+
+        second = writer.next_body({'owner': 'TCI'}, 5000, 550)
+        assert [g.get('xid') for g in self.content(second).get('group')] == ['d1']
+        assert list(second.files) == ['d1']
+        assert not files
+        assert writer.next_body({'owner': 'TCI'}, 5000, 550) is None
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Batch Content Index Module."""
+import json
+import os
+
+from tcex.batch.batch_writer import BatchWriter
+from tcex.batch.content_index import ContentIndex
+
+
+# pylint: disable=R0201,W0201
+class TestContentIndex:
+    """Test the TcEx Batch Content Index Module."""
+
+    @staticmethod
+    def units():
+        """Return indicator units as dicts and as serialized JSON."""
+        return [
+            ('indicator', [{'xid': 'i1', 'summary': '1.1.1.1'}]),
+            ('indicator', [b'{"xid": "i2", "summary": "2.2.2.2"}'], ['i2']),
+        ]
+
+    def test_commit_reload(self, tmpdir):
+        """Test committed hashes are persisted and reloaded."""
+        fqfn = os.path.join(str(tmpdir), 'content-index')
+        index = ContentIndex(fqfn)
+        content_hash = index.content_hash(b'{"xid": "i1"}')
+        index.commit({'i1': content_hash})
+        index.commit({'i1': content_hash})
+
+        index = ContentIndex(fqfn)
+        assert index.unchanged('i1', content_hash)
+        assert not index.unchanged('i1', index.content_hash(b'{"xid": "i1", "rating": 1}'))
+        assert not index.unchanged('i2', content_hash)
+
+        index.compact()
+        with open(fqfn) as fh:
+            assert len(fh.read().splitlines()) == 1
+
+    def test_max_age(self, tmpdir):
+        """Test unchanged entities are submitted again after the max age."""
+        index = ContentIndex(os.path.join(str(tmpdir), 'content-index'), max_age=-1)
+        content_hash = index.content_hash(b'{"xid": "i1"}')
+        index.commit({'i1': content_hash})
+        assert not index.unchanged('i1', content_hash)
+
+    def test_writer_skip_unchanged(self, tmpdir):
+        """Test the batch writer skips entities that are unchanged since the last submit."""
+        index = ContentIndex(os.path.join(str(tmpdir), 'content-index'))
+        body = BatchWriter(self.units(), index).next_body({'owner': 'TCI'}, 5000)
+        assert body.indicator_count == 2
+        assert sorted(body.hashes) == ['i1', 'i2']
+
+        # only commit the first indicator
+        index.commit({'i1': body.hashes.get('i1')})
+        body = BatchWriter(self.units(), index).next_body({'owner': 'TCI'}, 5000)
+        content = body.read().split(b'filename="content"\r\n\r\n')[1].rsplit(b'\r\n--', 1)[0]
+        indicators = json.loads(content.decode('utf-8')).get('indicator')
+        assert [i.get('xid') for i in indicators] == ['i2']
+        assert index.skipped == 1
+
+        # all entities unchanged
+        index.commit(body.hashes)
+        assert BatchWriter(self.units(), index).next_body({'owner': 'TCI'}, 5000) is None
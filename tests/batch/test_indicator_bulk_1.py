@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Batch Module."""
+import pytest
+
+
+# pylint: disable=R0201,W0201
+class TestIndicatorBulk1:
+    """Test the TcEx Batch Module."""
+
+    def setup_class(self):
+        """Configure setup before all tests."""
+
+    def test_bulk_columns(self, tcex):
+        """Test bulk indicator creation from column arrays."""
+        batch = tcex.batch(owner='TCI')
+        summaries = ['1.11.113.{}'.format(i) for i in range(4)]
+        count = batch.add_indicators_bulk(
+            type='Address',
+            summary=summaries,
+            rating=[5.0, 4.0, 3.0, 2.0],
+            confidence=[100, 75, 50, 25],
+            tags=[['PyTest1'], ['PyTest2'], [], None],
+            attributes=[[{'type': 'Description', 'value': 'Example #1'}], [], [], []],
+            xid=[batch.generate_xid(['pytest', 'address', 'bulk', s]) for s in summaries],
+        )
+        assert count == 4
+        assert batch.indicator_len == 4
+        batch_status = batch.submit_all()
+        assert batch_status[0].get('status') == 'Completed'
+        assert batch_status[0].get('successCount') == 4
+
+    def test_bulk_rows(self, tcex):
+        """Test bulk indicator creation from dict rows."""
+        batch = tcex.batch(owner='TCI')
+        rows = (
+            {
+                'type': 'Host',
+                'summary': 'pytest-bulk-{}.com'.format(i),
+                'rating': 3,
+                'xid': batch.generate_xid(['pytest', 'host', 'bulk', i]),
+            }
+            for i in range(3)
+        )
+        assert batch.add_indicators_bulk(rows) == 3
+        batch_status = batch.submit_all()
+        assert batch_status[0].get('status') == 'Completed'
+        assert batch_status[0].get('successCount') == 3
+
+    def test_bulk_invalid_type(self, tcex):
+        """Test bulk indicator creation with an invalid type column."""
+        batch = tcex.batch(owner='TCI')
+        with pytest.raises(RuntimeError):
+            batch.add_indicators_bulk(type='Bad Type', summary=['1.11.113.1'])
+        assert batch.add_indicators_bulk(
+            type=['Bad Type', 'Address'], summary=['a', '1.11.113.1'], halt_on_error=False
+        ) == 1
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Batch bulk indicator rows."""
+from types import SimpleNamespace
+
+import pytest
+
+from tcex.batch import Batch
+
+from ..stubs import StubTcEx
+
+
+# pylint: disable=R0201,W0201
+class TestIndicatorBulkRows:
+    """Test the TcEx Batch bulk indicator rows."""
+
+    def setup_method(self):
+        """Configure setup before each test."""
+        self.errors = []
+        tcex = StubTcEx(
+            indicator_types_data={'Address': {'name': 'Address'}, 'Host': {'name': 'Host'}},
+            utils=SimpleNamespace(to_bool=bool),
+        )
+        tcex.handle_error = self.handle_error
+        self.batch = Batch(tcex, 'MyOrg')
+        self.batch._indicators_shelf = {}  # pylint: disable=protected-access
+
+    def handle_error(self, code, message_values=None, raise_error=True):
+        """Record the error and raise it when requested."""
+        self.errors.append((code, message_values))
+        if raise_error:
+            raise RuntimeError(code, message_values)
+
+    def test_columns(self):
+        """Test single values are repeated for each row of the column arrays."""
+        count = self.batch.add_indicators_bulk(
+            type='Address', summary=['1.1.1.1', '1.1.1.2'], rating=3, xid=['a', 'b']
+        )
+        assert count == 2
+        assert self.batch.indicators_shelf['b'].get('summary') == '1.1.1.2'
+        assert self.batch.indicators_shelf['b'].get('rating') == 3
+
+    def test_scalar_columns(self):
+        """Test columns without a column array are rejected."""
+        with pytest.raises(RuntimeError):
+            self.batch.add_indicators_bulk(type='Address', summary='1.1.1.1')
+        assert self.errors == [(525, ['type, summary'])]
+        assert not self.batch.indicators_shelf
+
+    def test_invalid_row_types(self):
+        """Test an invalid type in dict rows is reported once and its rows are skipped."""
+        rows = [
+            {'type': 'Bad Type', 'summary': 'one', 'xid': 'a'},
+            {'type': 'Address', 'summary': '1.1.1.1', 'xid': 'b'},
+            {'type': 'Bad Type', 'summary': 'two', 'xid': 'c'},
+        ]
+        assert self.batch.add_indicators_bulk(rows, halt_on_error=False) == 1
+        assert self.errors == [(530, ['Bad Type'])]
+        assert list(self.batch.indicators_shelf) == ['b']
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Batch Spill Store Module."""
+import os
+import shelve
+
+from tcex.batch.spill_store import open_store, remove_store, SpillStore
+
+
+# pylint: disable=R0201,W0201
+class TestSpillStore:
+    """Test the TcEx Batch Spill Store Module."""
+
+    def test_spill_store(self, tmpdir):
+        """Test set, overwrite, pop and delete on the spill store."""
+        fqfn = os.path.join(str(tmpdir), 'indicators-pytest')
+        store = SpillStore(fqfn)
+        for i in range(5):
+            xid = 'xid-{}'.format(i)
+            store[xid] = {'summary': '1.1.1.{}'.format(i), 'type': 'Address', 'xid': xid}
+        store['xid-1'] = {'summary': '1.1.1.11', 'type': 'Address', 'xid': 'xid-1'}
+        del store['xid-2']
+
+        assert len(store) == 4
+        assert 'xid-2' not in store
+        assert store.get('xid-1').get('summary') == '1.1.1.11'
+        raw = store.pop_raw('xid-0')
+        assert raw == b'{"summary": "1.1.1.0", "type": "Address", "xid": "xid-0"}'
+        assert list(store.keys()) == ['xid-1', 'xid-3', 'xid-4']
+        store.close()
+
+    def test_spill_store_reopen(self, tmpdir):
+        """Test the index is rebuilt from an existing log."""
+        fqfn = os.path.join(str(tmpdir), 'groups-saved')
+        store = SpillStore(fqfn)
+        store['xid-1'] = {'name': 'pytest-1', 'type': 'Adversary', 'xid': 'xid-1'}
+        store['xid-2'] = {'name': 'pytest-2', 'type': 'Adversary', 'xid': 'xid-2'}
+        store.pop('xid-1')
+        store.close()
+
+        store = SpillStore(fqfn)
+        assert list(store.keys()) == ['xid-2']
+        assert store['xid-2'].get('name') == 'pytest-2'
+        store.close()
+        remove_store(fqfn)
+        assert not os.path.isfile(fqfn)
+
+    def test_open_saved_shelve(self, tmpdir):
+        """Test a saved file written by the shelve backend is not opened as a log."""
+        fqfn = os.path.join(str(tmpdir), 'indicators-saved')
+        store = shelve.open(fqfn, writeback=False)
+        store['xid-1'] = {'summary': '1.1.1.1', 'type': 'Address', 'xid': 'xid-1'}
+        store.close()
+
+        store = open_store('log', fqfn)
+        assert not isinstance(store, SpillStore)
+        assert store['xid-1'].get('summary') == '1.1.1.1'
+        store.close()
+
+        store = open_store('log', os.path.join(str(tmpdir), 'groups-saved'))
+        assert isinstance(store, SpillStore)
+        store.close()
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Batch Module."""
+
+
+# pylint: disable=R0201,W0201
+class TestSubmit1:
+    """Test the TcEx Batch Module."""
+
+    def setup_class(self):
+        """Configure setup before all tests."""
+
+    def test_submit_all_pipelined(self, tcex):
+        """Test pipelined submit of multiple batch chunks."""
+        batch = tcex.batch(owner='TCI')
+        batch._batch_max_chunk = 2  # pylint: disable=protected-access
+        batch.max_in_flight = 2
+        for i in range(5):
+            indicator = '1.11.112.{}'.format(i)
+            xid = batch.generate_xid(['pytest', 'address', 'pipelined', indicator])
+            ti = batch.address(ip=indicator, rating='5.0', confidence='100', xid=xid)
+            ti.tag(name='PyTest1')
+            batch.save(ti)
+        batch_status = batch.submit_all()
+        assert len(batch_status) == 3
+        assert [s.get('successCount') for s in batch_status] == [2, 2, 1]
+        for status in batch_status:
+            assert status.get('status') == 'Completed'
+
+    def test_submit_files_streamed(self, tcex):
+        """Test concurrent upload of streamed document content."""
+
+        def file_content(xid):
+            """Return a generator for the file content."""
+            yield 'Example file content for {}\n'.format(xid).encode('utf-8')
+            yield b'streamed in multiple chunks'
+
+        batch = tcex.batch(owner='TCI')
+        batch.file_max_workers = 2
+        xids = []
+        for i in range(3):
+            name = 'pytest-document-streamed-{}'.format(i)
+            xid = batch.generate_xid(['pytest', 'document', name])
+            xids.append(xid)
+            batch.document(name=name, file_name='example.txt', file_content=file_content, xid=xid)
+        batch_status = batch.submit_all()
+        assert batch_status[0].get('status') == 'Completed'
+        assert batch_status[0].get('uploadStatus') == [{'uploaded': True, 'xid': x} for x in xids]
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the ThreatConnect API authorization hot path.
+
+Usage::
+
+    python -m tests.benchmarks.auth_signing [count]
+
+Reports the microseconds per authorization header for HMAC signing with a new HMAC object
+per request (the previous implementation), for HmacAuth with unique paths (keyed HMAC state
+copied per request), and for HmacAuth with a repeated path and method (signature reused
+within the same second), and for TokenAuth.
+"""
+import base64
+import hashlib
+import hmac
+import sys
+import time
+from types import SimpleNamespace
+
+from tcex.sessions.tc_session import HmacAuth, TokenAuth
+
+
+def fresh_hmac(access_id, secret_key):
+    """Return the previous implementation signing with a new HMAC object per request."""
+
+    def authorization(path_url, method):
+        timestamp = int(time.time())
+        signature = '{}:{}:{}'.format(path_url, method, timestamp)
+        hmac_signature = hmac.new(
+            secret_key.encode(), signature.encode(), digestmod=hashlib.sha256
+        ).digest()
+        authorization = 'TC {}:{}'.format(access_id, base64.b64encode(hmac_signature).decode())
+        return {'Authorization': authorization, 'Timestamp': str(timestamp)}
+
+    return authorization
+
+
+def timeit(authorization, paths, method='GET'):
+    """Return the microseconds per call of authorization for each path."""
+    start = time.perf_counter()
+    for path in paths:
+        authorization(path, method)
+    return (time.perf_counter() - start) / len(paths) * 1000000
+
+
+def main(count=200000):
+    """Run the benchmark."""
+    access_id = '12345678901234567890'
+    secret_key = 'aBcDeFgHiJkLmNoPqRsTuVwXyZ0123456789aBcDeFgHiJkLmNoPqRsTuVwXy'
+    unique_paths = [
+        '/v2/indicators/addresses/10.{}.{}.{}'.format(i >> 16 & 255, i >> 8 & 255, i & 255)
+        for i in range(count)
+    ]
+    same_path = ['/v2/owners/mine'] * count
+    token = SimpleNamespace(token='a' * 200)
+
+    # verify the implementations return the same headers
+    path = '/v2/groups/adversaries/1?owner=MyOrg'
+    assert fresh_hmac(access_id, secret_key)(path, 'GET') == HmacAuth(
+        access_id, secret_key
+    ).authorization(path, 'GET')
+
+    print('calls: {:,}'.format(count))
+    results = [
+        ('hmac (new hmac per call)', fresh_hmac(access_id, secret_key), unique_paths),
+        ('hmac (copy, unique paths)', HmacAuth(access_id, secret_key).authorization, unique_paths),
+        ('hmac (copy, same path)', HmacAuth(access_id, secret_key).authorization, same_path),
+        ('token', TokenAuth(token).authorization, same_path),
+    ]
+    for name, authorization, paths in results:
+        print('{:>28}: {:.2f} us/call'.format(name, timeit(authorization, paths)))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
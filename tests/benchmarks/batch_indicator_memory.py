@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the memory used per Batch Indicator object.
+
+Usage::
+
+    python -m tests.benchmarks.batch_indicator_memory [count]
+
+Reports the number of bytes allocated per indicator held in memory (as in Batch.indicators)
+for a bare indicator and for an indicator with one attribute and one tag, using the current
+batch objects and a baseline with the previous object layout (no __slots__, a Utils instance
+per indicator, duplicate summary/type fields and child lists created up front).
+"""
+import gc
+import sys
+import tracemalloc
+
+from tcex.batch.indicator import Address
+from tcex.utils import Utils
+
+
+class BaselineAttribute(object):
+    """Batch Attribute with the previous (instance dict) layout."""
+
+    def __init__(self, attr_type, attr_value, displayed=False):
+        """Initialize Class Properties."""
+        self._attribute_data = {'type': attr_type, 'value': attr_value}
+        if displayed:
+            self._attribute_data['displayed'] = displayed
+        self._valid = attr_value not in [None, '']
+
+
+class BaselineTag(object):
+    """Batch Tag with the previous (instance dict) layout."""
+
+    def __init__(self, name):
+        """Initialize Class Properties."""
+        self._tag_data = {'name': name}
+        self._valid = bool(name)
+
+
+class BaselineAddress(object):
+    """Batch Address indicator with the previous (instance dict) layout."""
+
+    def __init__(self, summary, **kwargs):
+        """Initialize Class Properties."""
+        self._utils = Utils()
+        self._summary = summary
+        self._type = 'Address'
+        self._indicator_data = {'summary': summary, 'type': 'Address'}
+        self._indicator_data.update(kwargs)
+        self._attributes = []
+        self._file_actions = []
+        self._labels = []
+        self._occurrences = []
+        self._tags = []
+
+    def attribute(self, attr_type, attr_value, displayed=False):
+        """Add an attribute to the indicator."""
+        self._attributes.append(BaselineAttribute(attr_type, attr_value, displayed))
+
+    def tag(self, name):
+        """Add a tag to the indicator."""
+        self._tags.append(BaselineTag(name))
+
+    @property
+    def xid(self):
+        """Return the indicator xid."""
+        return self._indicator_data.get('xid')
+
+
+def ip(i):
+    """Return a unique IP address for the provided index."""
+    return '10.{}.{}.{}'.format(i >> 16 & 255, i >> 8 & 255, i & 255)
+
+
+def bare(i, address_class=Address):
+    """Return an Address indicator with no child objects."""
+    return address_class(ip(i), xid=str(i))
+
+
+def with_children(i, address_class=Address):
+    """Return an Address indicator with a single attribute and tag."""
+    indicator = bare(i, address_class)
+    indicator.attribute('Description', 'Example Description', displayed=True)
+    indicator.tag('PyTest')
+    return indicator
+
+
+def baseline_bare(i):
+    """Return a baseline Address indicator with no child objects."""
+    return bare(i, BaselineAddress)
+
+
+def baseline_with_children(i):
+    """Return a baseline Address indicator with a single attribute and tag."""
+    return with_children(i, BaselineAddress)
+
+
+def bytes_per_indicator(factory, count):
+    """Return the bytes allocated per indicator for the provided factory method."""
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    indicators = {}
+    for i in range(count):
+        indicator = factory(i)
+        indicators[indicator.xid] = indicator
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (current - start) / count
+
+
+def main(count=100000):
+    """Run the benchmark."""
+    print('indicators: {:,}'.format(count))
+    print('{:>15}  {:>10}  {:>10}  (bytes/indicator)'.format('', 'baseline', 'current'))
+    for name, baseline, factory in [
+        ('bare', baseline_bare, bare),
+        ('attribute+tag', baseline_with_children, with_children),
+    ]:
+        print(
+            '{:>15}: {:>10,.0f}  {:>10,.0f}'.format(
+                name, bytes_per_indicator(baseline, count), bytes_per_indicator(factory, count)
+            )
+        )
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the embedded playbook variable substitution.
+
+Usage::
+
+    python -m tests.benchmarks.embedded_variables [count]
+
+Reports the milliseconds to resolve the embedded variables in two payloads using the previous
+implementation (one re.sub over the whole payload per variable) and the single pass
+implementation:
+
+* the embedded values from tests/playbooks/test_embedded_variables.py repeated count times.
+* a KeyValueArray with count entries each embedding a different String variable.
+
+The DB is an in memory dict so the results show the substitution cost only.
+"""
+import json
+import logging
+import re
+import sys
+import time
+from types import SimpleNamespace
+
+from tcex.playbooks import Playbooks
+
+from ..playbooks.test_embedded_variables import TestEmbedded
+from ..stubs import StubDb
+
+
+class LegacyPlaybooks(Playbooks):
+    """Playbooks using the previous per variable substitution."""
+
+    def read_embedded(self, data, parent_var_type):
+        """Replace each embedded variable with a re.sub over the whole payload."""
+        if data is None:
+            return data
+
+        for var in (v.group(0) for v in re.finditer(self._variable_parse, str(data))):
+            key_type = self.variable_type(var)
+            val = self.read(var)
+
+            if val is None:
+                val = ''
+            elif key_type == 'String':
+                val = json.dumps(val)[1:-1]
+            elif key_type != 'String':
+                var = r'"?{}"?'.format(var)
+                val = json.dumps(val)
+
+            data = re.sub(var, val, data)
+        return data
+
+
+def playbook(cls, count):
+    """Return a playbook with the test data and count String variables staged."""
+    tcex = SimpleNamespace(
+        args=SimpleNamespace(),
+        default_args=SimpleNamespace(tc_playbook_out_variables=''),
+        log=logging.getLogger('tcex'),
+        playbook_cache=None,
+    )
+    tcex.playbook = cls(tcex)
+    tcex.playbook._db = StubDb('benchmark')  # pylint: disable=protected-access
+    TestEmbedded().stage_data(tcex)
+    for i in range(count):
+        tcex.playbook.create_string('#App:0002:string.{}!String'.format(i), 'value "{}"'.format(i))
+    return tcex.playbook
+
+
+def payloads(count):
+    """Return the test case and KeyValueArray payloads."""
+    cases = []
+    for mark in TestEmbedded.test_embedded_read_string.pytestmark:
+        cases.extend(v[0] for v in mark.args[1] if isinstance(v[0], str))
+    key_value_array = ', '.join(
+        '{{"key": "k{0}", "value": "#App:0002:string.{0}!String"}}'.format(i) for i in range(count)
+    )
+    return [
+        ('test cases x{}'.format(count), '\n'.join(cases * count)),
+        ('KeyValueArray ({} vars)'.format(count), '[{}]'.format(key_value_array)),
+    ]
+
+
+def timeit(pb, payload):
+    """Return the milliseconds to resolve the payload and the result."""
+    start = time.perf_counter()
+    result = pb.read_embedded(payload, 'KeyValueArray')
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main(count=200):
+    """Run the benchmark."""
+    legacy = playbook(LegacyPlaybooks, count)
+    single_pass = playbook(Playbooks, count)
+    for name, payload in payloads(count):
+        legacy_ms, legacy_result = timeit(legacy, payload)
+        single_pass_ms, single_pass_result = timeit(single_pass, payload)
+        assert legacy_result == single_pass_result
+        print(
+            '{:>28}: {:,} chars, legacy {:,.1f} ms, single pass {:,.1f} ms'.format(
+                name, len(payload), legacy_ms, single_pass_ms
+            )
+        )
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the playbook variable cache hits.
+
+Usage::
+
+    python -m tests.benchmarks.playbook_cache [count] [reads]
+
+Reports the microseconds per read of a KeyValueArray and a StringArray variable with count
+entries without the cache, with the previous cache (copy.deepcopy of the decoded value on set
+and get), and with the current cache (JSON encoded value decoded on get).
+
+The DB is an in memory dict so the uncached reads do not include the Redis round trip.
+"""
+import copy
+import logging
+import sys
+import time
+from types import SimpleNamespace
+
+from tcex.playbooks import PlaybookCache, Playbooks
+
+from ..stubs import StubDb
+
+
+class DeepCopyCache(PlaybookCache):
+    """Playbook cache returning a deep copy of the cached value (the previous implementation)."""
+
+    def get(self, context, key):
+        """Return a copy of the cached value or None."""
+        with self._lock:
+            value = self._cache.get((context, key))
+            if value is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end((context, key))
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def set(self, context, key, value):
+        """Cache a copy of the value."""
+        if value is None:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._remove((context, key))
+            self._cache[(context, key)] = value
+            self._contexts.setdefault(context, set()).add((context, key))
+
+
+def playbook(cache, count):
+    """Return a playbook using the cache with the array variables staged."""
+    tcex = SimpleNamespace(log=logging.getLogger('tcex'), playbook_cache=cache)
+    pb = Playbooks(tcex)
+    pb._db = StubDb('benchmark')  # pylint: disable=protected-access
+    pb.create_key_value_array(
+        '#App:0001:kva!KeyValueArray',
+        [{'key': 'key {}'.format(i), 'value': 'value {}'.format(i)} for i in range(count)],
+    )
+    pb.create_string_array('#App:0001:sa!StringArray', ['value {}'.format(i) for i in range(count)])
+    return pb
+
+
+def timeit(pb, key, reads):
+    """Return the microseconds per read of the key and the value."""
+    value = pb.read(key)
+    start = time.perf_counter()
+    for _ in range(reads):
+        pb.read(key)
+    return (time.perf_counter() - start) / reads * 1000000, value
+
+
+def main(count=1000, reads=200):
+    """Run the benchmark."""
+    playbooks = [
+        ('no cache', playbook(None, count)),
+        ('deepcopy cache', playbook(DeepCopyCache(), count)),
+        ('json cache', playbook(PlaybookCache(), count)),
+    ]
+    for key in ['#App:0001:kva!KeyValueArray', '#App:0001:sa!StringArray']:
+        results = []
+        expected = None
+        for name, pb in playbooks:
+            us, value = timeit(pb, key, reads)
+            assert expected is None or value == expected
+            expected = value
+            results.append('{} {:,.1f} us'.format(name, us))
+        print('{:>28} ({} entries): {}'.format(key, count, ', '.join(results)))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
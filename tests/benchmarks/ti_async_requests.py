@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Benchmark concurrent TI requests using threads and the asyncio session.
+
+Usage::
+
+    python -m tests.benchmarks.ti_async_requests [count] [latency_ms] [concurrency]
+
+Starts a local HTTP stub of the ThreatConnect indicator endpoint that adds a fixed latency to
+each response, then retrieves count indicators with TiTcRequest.single on a thread pool and
+with AsyncTiTcRequest.single on a single event loop. Requires the aiohttp module.
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from tcex.sessions import ConnectionPool, Instrumentation, RateLimiter, TcSession
+from tcex.sessions.async_tc_session import AsyncTcSession
+from tcex.tcex_ti.tcex_ti_tc_request import TiTcRequest
+from tcex.tcex_ti.tcex_ti_tc_request_async import AsyncTiTcRequest
+
+
+class IndicatorHandler(BaseHTTPRequestHandler):
+    """Local stub of the /v2/indicators/addresses/{id} endpoint."""
+
+    latency = 0.05
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Return the requested indicator after the configured latency."""
+        time.sleep(self.latency)
+        summary = self.path.split('?')[0].rsplit('/', 1)[-1]
+        data = {'address': {'ip': summary, 'rating': 3}}
+        body = json.dumps({'status': 'Success', 'data': data}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Suppress request logging."""
+
+
+def stub_tcex(api_path):
+    """Return a minimal TcEx stand-in configured for HMAC auth against the stub."""
+    tcex = SimpleNamespace(
+        connection_pool=ConnectionPool(pool_maxsize=1000),
+        default_args=SimpleNamespace(
+            api_access_id='benchmark',
+            api_secret_key='benchmark',
+            tc_api_path=api_path,
+            tc_proxy_tc=False,
+            tc_verify=False,
+        ),
+        ij=SimpleNamespace(runtime_level='Organization'),
+        instrumentation=Instrumentation(),
+        log=SimpleNamespace(trace=lambda msg: None),
+        proxies={},
+        rate_limiter=RateLimiter(),
+        ti_cache=None,
+        token=SimpleNamespace(token=None, token_expires=None),
+    )
+    tcex.session = TcSession(tcex)
+    # the stub is plain http, use the sized shared pool for http as well
+    tcex.session.mount('http://', tcex.connection_pool.adapter())
+    tcex.async_session = AsyncTcSession(tcex, limit=1000)
+    return tcex
+
+
+def run_threads(tcex, count, concurrency):
+    """Return the seconds to retrieve count indicators using a thread pool."""
+    tc_request = TiTcRequest(tcex)
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(tc_request.single, 'indicators', 'addresses', '10.0.0.{}'.format(i))
+            for i in range(count)
+        ]
+        assert all(f.result().ok for f in futures)
+    return time.time() - start
+
+
+def run_async(tcex, count, concurrency):
+    """Return the seconds to retrieve count indicators using the asyncio session."""
+    tc_request = AsyncTiTcRequest(tcex)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def single(i):
+        async with semaphore:
+            return await tc_request.single('indicators', 'addresses', '10.0.0.{}'.format(i))
+
+    async def main():
+        async with tcex.async_session:
+            return await asyncio.gather(*[single(i) for i in range(count)])
+
+    start = time.time()
+    responses = asyncio.get_event_loop().run_until_complete(main())
+    assert all(r.status == 200 for r in responses)
+    return time.time() - start
+
+
+def main(count=2000, latency_ms=50, concurrency=500):
+    """Run the benchmark."""
+    IndicatorHandler.latency = latency_ms / 1000.0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), IndicatorHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    tcex = stub_tcex('http://127.0.0.1:{}'.format(server.server_port))
+
+    print('requests: {:,}, latency: {}ms, concurrency: {}'.format(count, latency_ms, concurrency))
+    for name, runner in [('threads', run_threads), ('asyncio', run_async)]:
+        elapsed = runner(tcex, count, concurrency)
+        print('{:>10}: {:.2f}s ({:,.0f} requests/s)'.format(name, elapsed, count / elapsed))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -75,3 +75,18 @@ class TestUtils:
 
         tcex.playbook.delete(variable)
         assert tcex.playbook.read(variable) is None
+
+    def test_write_output(self):
+        """Test playbook write output"""
+        # tcex.playbook returns a new instance, the output data is stored on the instance
+        playbook = tcex.playbook
+        playbook.add_output('one', '1', 'String')
+        playbook.add_output('a', 'b', 'StringArray')
+        playbook.add_output('not_requested', '5', 'String')
+        playbook.write_output()
+        assert playbook.read('#App:0001:one!String') == '1'
+        assert playbook.read('#App:0001:a!StringArray') == ['b']
+        assert playbook.read('#App:0001:not_requested!String') is None
+
+        playbook.delete('#App:0001:one!String')
+        playbook.delete('#App:0001:a!StringArray')
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Playbook Variable Cache."""
+import logging
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from tcex.playbooks import PlaybookCache, Playbooks
+
+from ..stubs import StubDb
+
+
+# pylint: disable=R0201,W0201
+class TestPlaybookCache:
+    """Test the TcEx Playbook Variable Cache."""
+
+    def setup_method(self):
+        """Configure setup before each test."""
+        tcex = SimpleNamespace(log=logging.getLogger('tcex'), playbook_cache=PlaybookCache())
+        self.playbook = Playbooks(tcex)
+        self.playbook._db = StubDb()  # pylint: disable=protected-access
+
+    def test_read_cached(self):
+        """Test repeated reads are cached and cached values can't be modified."""
+        self.playbook.create_string_array('#App:1:array!StringArray', ['one', 'two'])
+        assert self.playbook.read('#App:1:array!StringArray') == ['one', 'two']
+        self.playbook.read('#App:1:array!StringArray').append('three')
+        assert self.playbook.read('#App:1:array!StringArray') == ['one', 'two']
+        assert self.playbook.db.reads == 1
+        assert self.playbook.tcex.playbook_cache.stats['hits'] == 2
+
+    def test_read_cached_key_value(self):
+        """Test cached KeyValue values are returned as a new OrderedDict."""
+        self.playbook.create_key_value_array(
+            '#App:1:kva!KeyValueArray', [{'key': 'b', 'value': '1'}, {'key': 'a', 'value': '2'}]
+        )
+        value = self.playbook.read('#App:1:kva!KeyValueArray')
+        cached = self.playbook.read('#App:1:kva!KeyValueArray')
+        assert cached == value and cached is not value
+        assert isinstance(cached[0], OrderedDict) and list(cached[0]) == ['key', 'value']
+        assert self.playbook.tcex.playbook_cache.stats['hits'] == 1
+
+    def test_literal_not_cached(self):
+        """Test literal values are not looked up in the cache."""
+        assert self.playbook.read('literal value') == 'literal value'
+        assert self.playbook.read(' #App:1:missing!String') is None
+        assert self.playbook.tcex.playbook_cache.stats == {'hits': 0, 'misses': 1, 'size': 0}
+
+    def test_write_invalidates(self):
+        """Test writes and deletes invalidate values that embed the variable."""
+        self.playbook.create_string('#App:1:string!String', 'one')
+        self.playbook.create_key_value(
+            '#App:1:kv!KeyValue', {'key': 'k', 'value': '#App:1:string!String'}
+        )
+        assert self.playbook.read('#App:1:kv!KeyValue') == {'key': 'k', 'value': 'one'}
+
+        self.playbook.create_string('#App:1:string!String', 'two')
+        assert self.playbook.read('#App:1:kv!KeyValue') == {'key': 'k', 'value': 'two'}
+
+        self.playbook.delete('#App:1:kv!KeyValue')
+        assert self.playbook.read('#App:1:kv!KeyValue') is None
+
+    def test_context_isolation(self):
+        """Test sessions sharing a Playbooks instance do not share cached values."""
+        self.playbook.create_string('#App:1:string!String', 'one')
+        assert self.playbook.read('#App:1:string!String') == 'one'
+
+        self.playbook.db.key = 'context-2'
+        assert self.playbook.read('#App:1:string!String') is None
+        self.playbook.create_string('#App:1:string!String', 'two')
+        assert self.playbook.read('#App:1:string!String') == 'two'
+
+        self.playbook.db.key = 'context-1'
+        assert self.playbook.read('#App:1:string!String') == 'one'
+
+    def test_maxsize(self):
+        """Test the least recently used values are removed."""
+        cache = PlaybookCache(maxsize=2)
+        cache.set('context', ('one', True), 1)
+        cache.set('context', ('two', True), 2)
+        assert cache.get('context', ('one', True)) == 1
+        cache.set('context', ('three', True), 3)
+        assert cache.get('context', ('two', True)) is None
+        assert len(cache) == 2
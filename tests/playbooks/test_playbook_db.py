@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Playbook Redis round trips."""
+from types import SimpleNamespace
+
+import pytest
+
+from tcex import tcex_redis
+from tcex.playbooks import Playbooks
+
+from ..stubs import StubRedis, StubTcEx
+
+
+# pylint: disable=R0201,W0201
+class TestPlaybookDb:
+    """Test the TcEx Playbook Redis round trips."""
+
+    @pytest.fixture(autouse=True)
+    def playbook(self, monkeypatch):
+        """Return a Playbooks instance using TcExRedis with a stub Redis client."""
+        self.redis = StubRedis()
+        monkeypatch.setattr(
+            tcex_redis, 'RedisClient', lambda **kwargs: SimpleNamespace(client=self.redis)
+        )
+        out_variables = ['#App:0001:one!String', '#App:0001:a!StringArray']
+        tcex = StubTcEx(
+            default_args=SimpleNamespace(tc_playbook_out_variables=','.join(out_variables)),
+            playbook_cache=None,
+        )
+        self.playbook = Playbooks(tcex)
+        self.playbook._db = tcex_redis.TcExRedis(  # pylint: disable=protected-access
+            'localhost', 6379, 'context-1'
+        )
+
+    def test_write_output(self):
+        """Test the requested outputs are written in a single pipelined batch."""
+        self.playbook.add_output('one', '1', 'String')
+        self.playbook.add_output('a', 'b', 'StringArray')
+        self.playbook.add_output('not_requested', '5', 'String')
+        self.playbook.write_output()
+
+        assert self.redis.calls == []
+        assert len(self.redis.executed) == 1
+        assert [c[:3] for c in self.redis.executed[0]] == [
+            ('hset', 'context-1', '#App:0001:one!String'),
+            ('hset', 'context-1', '#App:0001:a!StringArray'),
+        ]
+        assert self.playbook.read('#App:0001:one!String') == '1'
+        assert self.playbook.read('#App:0001:a!StringArray') == ['b']
+
+    def test_read_embedded_levels(self):
+        """Test nested embedded variables are read with one HMGET per nesting level."""
+        self.redis.hashes['context-1'] = {
+            '#App:0001:outer!String': '"kv: #App:0001:kv!KeyValue, one: #App:0001:one!String"',
+            '#App:0001:kv!KeyValue': '{"key": "inner", "value": "#App:0001:inner!String"}',
+            '#App:0001:inner!String': '"inner #App:0001:deep!String"',
+            '#App:0001:deep!String': '"deep"',
+            '#App:0001:one!String': '"one"',
+        }
+        data = self.playbook.read('#App:0001:outer!String')
+
+        assert data == 'kv: {"key": "inner", "value": "inner deep"}, one: one'
+        assert self.redis.calls == [
+            ('hget', 'context-1', '#App:0001:outer!String'),
+            ('hmget', 'context-1', ['#App:0001:kv!KeyValue', '#App:0001:one!String']),
+            ('hmget', 'context-1', ['#App:0001:inner!String']),
+            ('hmget', 'context-1', ['#App:0001:deep!String']),
+        ]
+
+    def test_hmget_batch(self):
+        """Test HMGET returns the buffered writes of a batch and only reads the other fields."""
+        self.redis.hashes['context-1'] = {'stored': b'"stored"', 'buffered': b'"old"'}
+        db = self.playbook.db
+        with db.batch():
+            db.create('buffered', '"new"')
+            assert db.hmget(['buffered', 'stored', 'missing']) == ['"new"', '"stored"', None]
+            assert db.read_many(['buffered']) == ['"new"']
+        assert self.redis.calls == [('hmget', 'context-1', ['stored', 'missing'])]
+        assert db.read('buffered') == '"new"'
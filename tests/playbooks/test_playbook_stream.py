@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Playbook Binary Streams."""
+import base64
+import io
+import logging
+from types import SimpleNamespace
+
+from tcex.playbooks import PlaybookCache, Playbooks
+
+from ..stubs import StubDb
+
+
+# pylint: disable=R0201,W0201
+class TestPlaybookStream:
+    """Test the TcEx Playbook Binary Streams."""
+
+    def setup_method(self):
+        """Configure setup before each test."""
+        tcex = SimpleNamespace(log=logging.getLogger('tcex'), playbook_cache=PlaybookCache())
+        self.playbook = Playbooks(tcex)
+        self.playbook._db = StubDb()  # pylint: disable=protected-access
+
+    def test_binary_stream(self):
+        """Test a file is written in chunks and read back incrementally."""
+        value = bytes(range(256)) * 40
+        self.playbook.create_binary_stream('#App:1:pcap!Binary', io.BytesIO(value), chunk_size=1000)
+        # 11 chunks and the manifest
+        assert len(self.playbook.db.data) == 12
+        assert max(len(v) for v in self.playbook.db.data.values()) < 1400
+
+        reader = self.playbook.read_binary_stream('#App:1:pcap!Binary')
+        assert reader.size == len(value)
+        buffer = bytearray(300)
+        assert reader.readinto(buffer) == 300
+        assert bytes(buffer) == value[:300]
+        assert reader.read() == value[300:]
+        assert reader.read() == b''
+
+        # read and read_binary return the joined value
+        assert self.playbook.read('#App:1:pcap!Binary') == value
+        data = self.playbook.read_binary('#App:1:pcap!Binary', b64decode=False)
+        assert base64.b64decode(data) == value
+
+    def test_binary_array_stream(self):
+        """Test array values are streamed with None values."""
+        values = [memoryview(b'one' * 100), None, 'two']
+        self.playbook.create_binary_array_stream('#App:1:files!BinaryArray', values, chunk_size=64)
+        readers = self.playbook.read_binary_array_stream('#App:1:files!BinaryArray')
+        assert readers[1] is None
+        assert [r.read() for r in readers if r is not None] == [b'one' * 100, b'two']
+        assert self.playbook.read_binary_array('#App:1:files!BinaryArray', decode=True) == [
+            'one' * 100,
+            None,
+            'two',
+        ]
+
+    def test_regular_binary(self):
+        """Test the reader handles regular Binary variables."""
+        self.playbook.create_binary('#App:1:binary!Binary', b'data')
+        assert self.playbook.read_binary_stream('#App:1:binary!Binary').read() == b'data'
+        assert self.playbook.read_binary_stream('#App:1:missing!Binary') is None
+
+    def test_overwrite_and_delete(self):
+        """Test the chunks of a previous value are removed."""
+        self.playbook.create_binary_stream('#App:1:pcap!Binary', b'a' * 100, chunk_size=10)
+        self.playbook.create_binary_stream('#App:1:pcap!Binary', b'b' * 30, chunk_size=10)
+        assert len(self.playbook.db.data) == 4
+        assert self.playbook.read('#App:1:pcap!Binary') == b'b' * 30
+
+        self.playbook.delete('#App:1:pcap!Binary')
+        assert not self.playbook.db.data
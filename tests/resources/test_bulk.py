@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Bulk Resource Module."""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from tcex.resources.resources import Bulk
+
+from ..stubs import StubTcEx
+
+
+# pylint: disable=R0201,W0201
+class TestBulk:
+    """Test the TcEx Bulk Resource Module."""
+
+    @staticmethod
+    def bulk_json(raw):
+        """Return the data and status for an incremental bulk JSON download."""
+        tcex = StubTcEx(
+            default_args=SimpleNamespace(api_default_org='MyOrg'),
+            request=lambda session: SimpleNamespace(add_payload=lambda key, value: None),
+        )
+        bulk = Bulk(tcex)
+        bulk.json(incremental=True)
+        chunks = [raw[i : i + 16] for i in range(0, len(raw), 16)]
+        response = SimpleNamespace(iter_content=lambda chunk_size: iter(chunks), text='')
+        return bulk._request_process_json(response)  # pylint: disable=protected-access
+
+    def test_incremental(self):
+        """Test the indicators are decoded as they are read."""
+        indicators = [{'summary': '1.1.1.{}'.format(i)} for i in range(10)]
+        data, status = self.bulk_json(json.dumps({'indicator': indicators}).encode('utf-8'))
+        assert status == 'Success'
+        assert list(data) == indicators
+
+    def test_incremental_failure(self):
+        """Test error responses, empty downloads, and invalid JSON are a Failure status."""
+        for raw in [
+            b'{"status": "Failure", "message": "Bulk generation not enabled."}',
+            b'{"status": "Failure", "indicator": [{"summary": "1.1.1.1"}]}',
+            b'{"indicator": []}',
+            b'<html>Service Unavailable</html>',
+        ]:
+            data, status = self.bulk_json(raw)
+            assert status == 'Failure'
+            assert list(data) == []
+
+    def test_incremental_truncated(self):
+        """Test a download truncated after the first indicator raises an error."""
+        data, status = self.bulk_json(b'{"indicator": [{"summary": "1.1.1.1"}, {"summ')
+        assert status == 'Success'
+        with pytest.raises(RuntimeError):
+            list(data)
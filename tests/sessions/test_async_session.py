@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx asyncio Session Module."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from tcex.sessions.async_tc_session import AsyncTcSession  # noqa: E402
+from tcex.tcex_ti.tcex_ti_tc_request_async import AsyncTiTcRequest  # noqa: E402
+
+
+class StubClient(object):
+    """aiohttp client stand-in recording the requests and returning the status."""
+
+    closed = False
+
+    def __init__(self, status):
+        """Initialize Class Properties."""
+        self.requests = []
+        self.status = status
+
+    async def read(self):
+        """Read the response body."""
+        return b''
+
+    async def request(self, method, url, **kwargs):  # pylint: disable=unused-argument
+        """Return the response."""
+        self.requests.append(method)
+        return SimpleNamespace(read=self.read, status=self.status)
+
+
+# pylint: disable=R0201,W0201
+class TestAsyncSession:
+    """Test the TcEx asyncio Session Module."""
+
+    @staticmethod
+    def run(coroutine):
+        """Run the coroutine to completion."""
+        return asyncio.get_event_loop().run_until_complete(coroutine)
+
+    def test_async_session(self, tcex):
+        """Test concurrent requests with the asyncio session."""
+
+        async def owners():
+            async with tcex.async_session as session:
+                return await asyncio.gather(*[session.get('/v2/owners') for _ in range(5)])
+
+        for r in self.run(owners()):
+            assert r.status == 200
+
+    def test_async_many(self, tcex):
+        """Test retrieving owners with the async TI request."""
+
+        async def owners():
+            async with tcex.async_session:
+                tc_request = AsyncTiTcRequest(tcex)
+                return [o async for o in tc_request.many('owners', None, 'owner')]
+
+        assert self.run(owners())
+
+    def test_retry_methods(self):
+        """Test only idempotent methods are retried unless retry is set for the request."""
+        args = SimpleNamespace(tc_api_path='https://localhost', tc_proxy_tc=False, tc_verify=True)
+        session = AsyncTcSession(SimpleNamespace(default_args=args, token=None), backoff_factor=0)
+        session.auth = SimpleNamespace(authorization=lambda path, method: {})
+
+        for method, retry, count in [
+            ('GET', None, 4),
+            ('PUT', None, 4),
+            ('POST', None, 1),
+            ('POST', True, 4),
+            ('GET', False, 1),
+        ]:
+            session._client = StubClient(502)  # pylint: disable=protected-access
+            r = self.run(session.request(method, '/v2/owners', retry=retry))
+            assert r.status == 502
+            assert session.client.requests == [method] * count
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Connection Pool Module."""
+from http.server import BaseHTTPRequestHandler
+
+from requests import Session
+
+from tcex.sessions import ConnectionPool
+
+from ..stubs import LocalServer
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    """Local stub that keeps connections alive."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Return an empty JSON response."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Suppress request logging."""
+
+
+# pylint: disable=R0201,W0201
+class TestConnectionPool:
+    """Test the TcEx Connection Pool Module."""
+
+    def setup_class(self):
+        """Configure setup before all tests."""
+        self.server = LocalServer(OkHandler)
+        self.url = '{}/v2/owners'.format(self.server.url)
+
+    def teardown_class(self):
+        """Stop the stub server."""
+        self.server.shutdown()
+
+    def test_shared_pool(self):
+        """Test sessions mounted with the shared pool reuse the same connection."""
+        pool = ConnectionPool(pool_maxsize=2)
+        sessions = [Session(), Session()]
+        for session in sessions:
+            session.mount('http://', pool.adapter())
+
+        for _ in range(3):
+            for session in sessions:
+                assert session.get(self.url).ok
+
+        stats = pool.stats
+        assert stats.get('requests') == 6
+        assert stats.get('active') == 0
+        assert len(stats.get('pools')) == 1
+        assert stats.get('pools')[0].get('connections') == 1
+        assert stats.get('pools')[0].get('requests') == 6
+        assert stats.get('pools')[0].get('maxsize') == 2
+
+    def test_configure(self):
+        """Test the pool size can be changed after the pool is used."""
+        pool = ConnectionPool()
+        session = Session()
+        session.mount('http://', pool.adapter())
+        assert session.get(self.url).ok
+
+        pool.configure(pool_maxsize=25)
+        assert session.get(self.url).ok
+        assert pool.stats.get('pools')[0].get('maxsize') == 25
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx HMAC Authorization."""
+import base64
+import hashlib
+import hmac
+
+from tcex.sessions import tc_session
+from tcex.sessions.tc_session import HmacAuth
+
+
+# pylint: disable=R0201,W0201
+class TestHmacAuth:
+    """Test the TcEx HMAC Authorization."""
+
+    @staticmethod
+    def signature(secret_key, path_url, method, timestamp):
+        """Return the signature using a new HMAC object."""
+        message = '{}:{}:{}'.format(path_url, method, timestamp).encode()
+        digest = hmac.new(secret_key.encode(), message, digestmod=hashlib.sha256).digest()
+        return base64.b64encode(digest).decode()
+
+    def test_signature(self, monkeypatch):
+        """Test the signatures match a new HMAC object within and across a second boundary."""
+        now = [1500000000.5]
+        monkeypatch.setattr(tc_session.time, 'time', lambda: now[0])
+        auth = HmacAuth('access-id', 'secret-key')
+        path_url = '/v2/owners?resultLimit=1'
+
+        for timestamp in [1500000000.5, 1500000000.9, 1500000001.1]:
+            now[0] = timestamp
+            for method in ['GET', 'POST']:
+                expected = self.signature('secret-key', path_url, method, int(timestamp))
+                assert auth.authorization(path_url, method) == {
+                    'Authorization': 'TC access-id:{}'.format(expected),
+                    'Timestamp': str(int(timestamp)),
+                }
+
+    def test_no_secret_key(self):
+        """Test the auth can be created before the secret key is available."""
+        auth = HmacAuth('access-id', None)
+        auth._secret_key = 'secret-key'  # pylint: disable=protected-access
+        assert auth.authorization('/v2/owners', 'GET').get('Authorization')
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Instrumentation Module."""
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from requests import Session
+
+from tcex.sessions import instrumentation as instrumentation_module
+from tcex.sessions import RateLimiter, TcSession
+from tcex.sessions.instrumentation import endpoint_template, Histogram, Instrumentation
+
+from ..stubs import StubTcEx
+
+
+# pylint: disable=R0201,W0201
+class TestInstrumentation:
+    """Test the TcEx Instrumentation Module."""
+
+    def test_endpoint_template(self):
+        """Test ids and values are removed from the endpoint."""
+        api = 'https://tc.example.com/api'
+        assert endpoint_template('{}/v2/owners/mine'.format(api)) == '/v2/owners/mine'
+        assert endpoint_template('/v2/batch/123?owner=MyOrg') == '/v2/batch/{id}'
+        assert (
+            endpoint_template('{}/v2/indicators/addresses/1.1.1.1/tags/My%20Tag'.format(api))
+            == '/v2/indicators/addresses/{id}/tags/{name}'
+        )
+        assert (
+            endpoint_template('/v2/groups/adversaries/42/attributes/7')
+            == '/v2/groups/adversaries/{id}/attributes/{id}'
+        )
+        assert endpoint_template('/v2/indicators/hosts/example') == '/v2/indicators/hosts/{id}'
+        assert endpoint_template('/v2/exchange/db/local/app/key') == '/v2/exchange/db/local/app/key'
+
+    def test_histogram(self):
+        """Test the histogram summary."""
+        histogram = Histogram()
+        for value in [0.001, 0.02, 0.02, 0.3, 4]:
+            histogram.observe(value)
+        stats = histogram.stats
+        assert stats['count'] == 5 and stats['min'] == 0.001 and stats['max'] == 4
+        assert stats['p50'] == 0.025 and stats['p95'] == 5
+
+    def test_end(self):
+        """Test the request metrics are aggregated per endpoint and passed to the hooks."""
+        instrumentation = Instrumentation()
+        instrumentation.enable()
+        metrics = []
+        instrumentation.hooks.append(metrics.append)
+        for status_code in [200, 404]:
+            r = SimpleNamespace(
+                elapsed=timedelta(seconds=0.05),
+                headers={'Content-Length': '10'},
+                raw=None,
+                request=SimpleNamespace(body=b'{"a": 1}', method='PUT'),
+                status_code=status_code,
+                url='https://tc.example.com/api/v2/groups/adversaries/1',
+            )
+            instrumentation.begin()
+            instrumentation.end(r, 0.06, retries=1)
+
+        assert metrics[0]['endpoint'] == '/v2/groups/adversaries/{id}'
+        assert metrics[0]['bytes_sent'] == 8 and metrics[0]['bytes_received'] == 10
+        stats = instrumentation.stats[0]
+        assert stats['errors'] == 1 and stats['retries'] == 2 and stats['bytes_sent'] == 16
+        assert stats['total']['count'] == 2
+        assert 'tcex_api_total_seconds_count{method="PUT",' in instrumentation.prometheus()
+
+    def test_fail(self):
+        """Test a request that raised is recorded as an error and the timings are cleared."""
+        instrumentation = Instrumentation()
+        instrumentation.enable()
+        instrumentation.begin()
+        instrumentation_module._local.timings['connect'] = 0.01  # pylint: disable=W0212
+        metrics = instrumentation.fail(
+            'get', 'https://tc.example.com/api/v2/owners/1', 0.5, ConnectionError('refused')
+        )
+
+        assert metrics['error'] == 'ConnectionError' and metrics['status_code'] is None
+        assert metrics['connect'] == 0.01 and metrics['endpoint'] == '/v2/owners/{id}'
+        assert instrumentation.stats[0]['errors'] == 1
+        assert instrumentation_module._local.timings is None  # pylint: disable=W0212
+
+    def test_session_error(self, monkeypatch):
+        """Test the session records requests that raise an exception."""
+
+        def request(session, method, url, **kwargs):  # pylint: disable=unused-argument
+            raise ConnectionError('refused')
+
+        monkeypatch.setattr(Session, 'request', request)
+        args = SimpleNamespace(tc_api_path='https://tc.example.com/api', tc_proxy_tc=False)
+        args.tc_verify = True
+        tcex = StubTcEx(
+            connection_pool=SimpleNamespace(adapter=lambda **kwargs: None),
+            default_args=args,
+            instrumentation=Instrumentation(),
+            rate_limiter=RateLimiter(),
+            token=None,
+        )
+        tcex.instrumentation.enable()
+        session = TcSession(tcex)
+        session.auth = lambda r: r
+        with pytest.raises(ConnectionError):
+            session.get('/v2/owners')
+
+        stats = tcex.instrumentation.stats
+        assert [(s['method'], s['endpoint'], s['errors']) for s in stats] == [
+            ('GET', '/v2/owners', 1)
+        ]
+        assert instrumentation_module._local.timings is None  # pylint: disable=W0212
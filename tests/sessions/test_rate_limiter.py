@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Rate Limiter Module."""
+import threading
+import time
+from types import SimpleNamespace
+
+from tcex.sessions.rate_limiter import RateLimiter, TokenBucket
+
+
+# pylint: disable=R0201,W0201
+class TestRateLimiter:
+    """Test the TcEx Rate Limiter Module."""
+
+    def test_bucket_family(self):
+        """Test the longest matching family is used."""
+        limiter = RateLimiter()
+        limiter.configure('/v2/indicators/addresses', rate=5)
+        assert limiter.bucket('/v2/batch/123') is limiter.buckets['/v2/batch']
+        assert limiter.bucket('/v2/indicators/hosts') is limiter.buckets['/v2/indicators']
+        assert limiter.bucket('/v2/indicators/addresses/1.1.1.1').rate == 5
+        assert limiter.bucket('/v2/owners') is limiter.buckets['']
+
+    def test_rate(self):
+        """Test requests are limited to the rate after the burst."""
+        bucket = TokenBucket(rate=50, burst=5)
+        start = time.time()
+        for _ in range(15):
+            bucket.release(bucket.acquire())
+        assert 0.15 < time.time() - start < 1
+
+    def test_concurrency(self):
+        """Test the number of requests in flight is limited."""
+        bucket = TokenBucket(concurrency=2)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def request():
+            semaphore = bucket.acquire()
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+            bucket.release(semaphore)
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert max(peak) == 2
+
+    def test_throttle(self):
+        """Test a throttled response halves the rate and pauses the family."""
+        limiter = RateLimiter()
+        limiter.configure('/v2/batch', rate=10)
+        bucket = limiter.bucket('/v2/batch')
+        r = SimpleNamespace(status_code=429, headers={'Retry-After': '0.1'})
+        assert limiter.retry_after(r) == 0.1
+        assert limiter.retry_after(SimpleNamespace(status_code=503, headers={})) is None
+        assert limiter.retry_after(SimpleNamespace(status_code=200, headers={})) is None
+
+        bucket.throttle(limiter.retry_after(r))
+        assert bucket.current_rate == 5
+        start = time.time()
+        bucket.release(bucket.acquire())
+        assert time.time() - start >= 0.1
+        bucket.success()
+        assert bucket.current_rate == 5.5
+        assert limiter.stats['/v2/batch']['throttled'] == 1
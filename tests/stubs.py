@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""Stub sessions, servers, and DBs shared by the unit tests that run without ThreatConnect."""
+import json
+import logging
+import threading
+from collections import OrderedDict
+from http.server import HTTPServer
+from types import SimpleNamespace
+
+from requests import Session
+from requests.utils import requote_uri
+
+
+class StubLogger(logging.Logger):
+    """Logger supporting the trace level of the TcEx logger."""
+
+    def trace(self, msg, *args, **kwargs):
+        """Log the message at the trace level."""
+        self.log(logging.DEBUG - 5, msg, *args, **kwargs)
+
+
+class StubResponse(object):
+    """Response stand-in returning the data in a ThreatConnect envelope.
+
+    Args:
+        status_code (int, default:200): The HTTP status code.
+        data (any, optional): The value of the "data" field in the JSON response.
+        headers (dict, optional): The response headers.
+    """
+
+    def __init__(self, status_code=200, data=None, headers=None):
+        """Initialize Class Properties."""
+        self.data = data
+        self.headers = headers or {}
+        self.ok = status_code < 400
+        self.reason = None
+        self.request = None
+        self.status_code = status_code
+        self.url = None
+
+    def close(self):
+        """Close the response."""
+
+    def json(self):
+        """Return the response data."""
+        return {'status': 'Success' if self.ok else 'Failure', 'data': self.data}
+
+    @property
+    def text(self):
+        """Return the response body."""
+        return json.dumps(self.json())
+
+
+class StubSession(object):
+    """Session stand-in recording each request and running the response hooks.
+
+    Args:
+        responder (callable, optional): Called with the method, url, params, and keyword args
+            of each request and returns the response (defaults to an empty 200 response).
+    """
+
+    def __init__(self, responder=None):
+        """Initialize Class Properties."""
+        self.hooks = {'response': []}
+        self.lock = threading.Lock()
+        self.requests = []
+        self.responder = responder
+
+    def request(self, method, url, params=None, **kwargs):
+        """Return the response for the request."""
+        with self.lock:
+            self.requests.append((method, url, params))
+        if self.responder is None:
+            r = StubResponse()
+        else:
+            r = self.responder(method, url, params, **kwargs)
+        # requests sends the path with reserved characters in the url already percent encoded
+        r.request = SimpleNamespace(method=method, path_url=requote_uri(url))
+        r.url = r.url or url
+        for hook in self.hooks.get('response'):
+            hook(r)
+        return r
+
+    def delete(self, url, **kwargs):
+        """Send a DELETE request."""
+        return self.request('DELETE', url, **kwargs)
+
+    def get(self, url, **kwargs):
+        """Send a GET request."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """Send a POST request."""
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        """Send a PUT request."""
+        return self.request('PUT', url, **kwargs)
+
+
+class StubTcEx(object):
+    """Minimal TcEx stand-in providing the session, logger, and error handling.
+
+    Args:
+        session (object, optional): The session for API requests.
+        **kwargs: Additional properties (e.g. ti_cache).
+    """
+
+    def __init__(self, session=None, **kwargs):
+        """Initialize Class Properties."""
+        self.log = StubLogger('tcex')
+        self.session = session
+        self.ti_cache = None
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+    @staticmethod
+    def handle_error(code, message_values=None, raise_error=True):
+        """Raise the error."""
+        if raise_error:
+            raise RuntimeError(code, message_values)
+
+
+class BaseUrlSession(Session):
+    """Session that sends relative API paths to a local server.
+
+    Args:
+        base_url (str): The url of the local server.
+    """
+
+    def __init__(self, base_url):
+        """Initialize Class Properties."""
+        super(BaseUrlSession, self).__init__()
+        self.base_url = base_url
+
+    def request(self, method, url, **kwargs):  # pylint: disable=arguments-differ
+        """Prefix the url with the base url."""
+        return super(BaseUrlSession, self).request(method, self.base_url + url, **kwargs)
+
+
+class LocalServer(object):
+    """HTTP server on a free local port serving requests in a daemon thread.
+
+    Args:
+        handler (BaseHTTPRequestHandler): The request handler class.
+    """
+
+    def __init__(self, handler):
+        """Initialize Class Properties."""
+        self.server = HTTPServer(('127.0.0.1', 0), handler)
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def session(self):
+        """Return a session sending relative API paths to the server."""
+        return BaseUrlSession(self.url)
+
+    def shutdown(self):
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StubDb(object):
+    """Playbook DB stand-in storing the fields of each context (Redis hash) in a dict.
+
+    The context is switched by setting the key, as the service Apps do with the session id.
+    """
+
+    def __init__(self, key='context-1'):
+        """Initialize Class Properties."""
+        self.contexts = {}
+        self.key = key
+        self.reads = 0
+        self.read_many_calls = []
+
+    @property
+    def data(self):
+        """Return the fields of the current context."""
+        return self.contexts.setdefault(self.key, {})
+
+    def create(self, field, value):
+        """Create the field."""
+        self.data[field] = value
+
+    def delete(self, field):
+        """Delete the field."""
+        self.data.pop(field, None)
+
+    def read(self, field):
+        """Read the field."""
+        self.reads += 1
+        return self.data.get(field)
+
+    def read_many(self, fields):
+        """Read the fields."""
+        self.reads += 1
+        self.read_many_calls.append(list(fields))
+        return [self.data.get(f) for f in fields]
+
+
+class StubPipeline(object):
+    """Redis pipeline stand-in recording the commands of each execute."""
+
+    def __init__(self, redis):
+        """Initialize Class Properties."""
+        self.commands = []
+        self.redis = redis
+
+    def execute(self):
+        """Run the queued commands."""
+        self.redis.executed.append(self.commands)
+        for _, key, field, value in self.commands:
+            self.redis.hashes.setdefault(key, OrderedDict())[field] = value
+        self.commands = []
+
+    def hset(self, key, field, value):
+        """Queue an HSET command."""
+        self.commands.append(('hset', key, field, value))
+
+
+class StubRedis(object):
+    """Redis client stand-in supporting the hash commands used by TcExRedis."""
+
+    def __init__(self):
+        """Initialize Class Properties."""
+        self.calls = []
+        self.executed = []
+        self.hashes = {}
+
+    @staticmethod
+    def _encode(value):
+        """Return the value as bytes like redis-py."""
+        if value is None or isinstance(value, bytes):
+            return value
+        return str(value).encode('utf-8')
+
+    def hdel(self, key, field):
+        """Delete the field."""
+        self.calls.append(('hdel', key, field))
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+    def hget(self, key, field):
+        """Return the field value."""
+        self.calls.append(('hget', key, field))
+        return self._encode(self.hashes.get(key, {}).get(field))
+
+    def hgetall(self, key):
+        """Return all fields."""
+        self.calls.append(('hgetall', key))
+        return {k: self._encode(v) for k, v in self.hashes.get(key, {}).items()}
+
+    def hmget(self, key, fields):
+        """Return the field values."""
+        self.calls.append(('hmget', key, list(fields)))
+        return [self._encode(self.hashes.get(key, {}).get(f)) for f in fields]
+
+    def hset(self, key, field, value):
+        """Set the field value."""
+        self.calls.append(('hset', key, field))
+        self.hashes.setdefault(key, OrderedDict())[field] = value
+        return 1
+
+    def pipeline(self, transaction=True):  # pylint: disable=unused-argument
+        """Return a pipeline."""
+        return StubPipeline(self)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Threat Intel paginated requests."""
+import json
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+from tcex.tcex_ti.tcex_ti_tc_request import TiTcRequest
+
+from ..stubs import LocalServer, StubTcEx
+
+
+class IndicatorHandler(BaseHTTPRequestHandler):
+    """Local stub of the /v2/indicators endpoint with 25 indicators."""
+
+    count = 25
+    requests = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Return a page of indicators."""
+        query = parse_qs(urlparse(self.path).query)
+        result_start = int(query.get('resultStart')[0])
+        result_limit = int(query.get('resultLimit')[0])
+        self.requests.append(result_start)
+        indicators = [
+            {'id': i, 'summary': '1.1.1.{}'.format(i)}
+            for i in range(result_start, min(result_start + result_limit, self.count))
+        ]
+        data = {'resultCount': self.count, 'indicator': indicators}
+        body = json.dumps({'status': 'Success', 'data': data}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Suppress request logging."""
+
+
+# pylint: disable=R0201,W0201
+class TestTcRequestPaging:
+    """Test the TcEx Threat Intel paginated requests."""
+
+    def setup_class(self):
+        """Configure setup before all tests."""
+        self.server = LocalServer(IndicatorHandler)
+        self.tcex = StubTcEx(self.server.session())
+
+    def teardown_class(self):
+        """Stop the stub server."""
+        self.server.shutdown()
+
+    def tc_request(self, prefetch):
+        """Return a TiTcRequest using a small page size."""
+        IndicatorHandler.requests = []
+        tc_request = TiTcRequest(self.tcex, prefetch=prefetch)
+        tc_request.result_limit = 10
+        return tc_request
+
+    def test_sequential(self):
+        """Test results are retrieved one page at a time."""
+        tc_request = self.tc_request(1)
+        results = list(tc_request.many('indicators', None, 'indicator'))
+        assert [r.get('id') for r in results] == list(range(25))
+        assert IndicatorHandler.requests == [0, 10, 20]
+
+    def test_prefetch(self):
+        """Test prefetched results are yielded in order."""
+        tc_request = self.tc_request(4)
+        results = list(tc_request.many('indicators', None, 'indicator'))
+        assert [r.get('id') for r in results] == list(range(25))
+        assert sorted(IndicatorHandler.requests) == [0, 10, 20]
+
+    def test_incremental(self):
+        """Test entities are decoded from the response stream."""
+        tc_request = self.tc_request(1)
+        tc_request.incremental = True
+        results = list(tc_request.many('indicators', None, 'indicator'))
+        assert [r.get('id') for r in results] == list(range(25))
+        assert IndicatorHandler.requests == [0, 10, 20]
+
+    def test_many_overrides(self):
+        """Test the paging settings can be overridden for a single request."""
+        tc_request = self.tc_request(1)
+        results = list(
+            tc_request.many('indicators', None, 'indicator', prefetch=4, incremental=True)
+        )
+        assert [r.get('id') for r in results] == list(range(25))
+        assert sorted(IndicatorHandler.requests) == [0, 10, 20]
+        assert tc_request.prefetch == 1
+        assert tc_request.incremental is False
+
+    def test_prefetch_stop_early(self):
+        """Test the consumer can stop before all pages are consumed."""
+        tc_request = self.tc_request(2)
+        results = tc_request.many('indicators', None, 'indicator')
+        assert [next(results).get('id') for _ in range(12)] == list(range(12))
+        results.close()
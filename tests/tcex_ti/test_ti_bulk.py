@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Threat Intel bulk create."""
+import pytest
+
+from tcex.batch.group import Group
+from tcex.batch.indicator import Indicator
+from tcex.tcex_ti.tcex_ti import TcExTi
+
+from ..stubs import StubTcEx
+
+
+class StubBatch(object):
+    """Batch stand-in collecting the entities and returning the stubbed batch results."""
+
+    def __init__(self, results):
+        """Initialize Class Properties."""
+        self.groups = []
+        self.indicators = []
+        self.results = results
+
+    def close(self):
+        """Close the batch."""
+
+    def group(self, group_type, name, **kwargs):
+        """Add a group."""
+        self.groups.append(Group(group_type, name, **kwargs))
+        return self.groups[-1]
+
+    def indicator(self, indicator_type, summary, **kwargs):
+        """Add an indicator."""
+        self.indicators.append(Indicator(indicator_type, summary, **kwargs))
+        return self.indicators[-1]
+
+    def submit_all(self, halt_on_error=True):  # pylint: disable=unused-argument
+        """Return the batch results."""
+        return self.results
+
+
+# pylint: disable=R0201,W0201
+class TestTiBulk:
+    """Test the TcEx Threat Intel bulk create."""
+
+    @staticmethod
+    def ti(results):
+        """Return a TcExTi instance using a stub batch returning the results."""
+        batch = StubBatch(results)
+        return TcExTi(StubTcEx(batch=lambda owner: batch, indicator_types_data={})), batch
+
+    def test_summary_and_fields(self):
+        """Test the summary is built from the value fields and only batch fields are sent."""
+        ti, batch = self.ti([{'status': 'Completed', 'errorCount': 0}])
+        entities = [
+            {'type': 'Address', 'ip': '1.1.1.1', 'owner': 'MyOrg', 'webLink': 'link', 'rating': 3},
+            {'type': 'File', 'md5': 'a' * 32, 'sha256': 'b' * 64, 'id': 5},
+            {'type': 'URL', 'url': 'http://example.com/a?b=1', 'confidence': 50},
+            {
+                'type': 'Document',
+                'name': 'doc',
+                'fileName': 'doc.txt',
+                'fileContent': 'content',
+                'id': 6,
+                'webLink': 'link',
+            },
+        ]
+        responses = ti.create_entities(entities, 'MyOrg', bulk=True)
+
+        assert [i.summary for i in batch.indicators] == [
+            '1.1.1.1',
+            '{} : {}'.format('a' * 32, 'b' * 64),
+            'http://example.com/a?b=1',
+        ]
+        for indicator in batch.indicators:
+            assert not {'id', 'md5', 'owner', 'sha256', 'url', 'webLink'} & set(indicator.data)
+        assert batch.indicators[0].data.get('rating') == 3
+        document = batch.groups[0].data
+        assert document.get('fileName') == 'doc.txt'
+        assert 'id' not in document and 'webLink' not in document
+        assert responses[2].get('unique_id') == 'http%3A%2F%2Fexample.com%2Fa%3Fb%3D1'
+        assert [r.get('status_code') for r in responses] == [201, 201, 201, 201]
+
+    def test_status_from_errors(self):
+        """Test batch errors are attributed to an entity only by the exact xid."""
+        errors = [
+            {'errorReason': 'Invalid indicator.', 'errorSource': 'address-002'},
+            {'errorReason': 'Incident has an invalid status.', 'xid': 'incident-001'},
+        ]
+        ti, _ = self.ti([{'status': 'Completed', 'errorCount': 2, 'errors': errors}])
+        entities = [
+            {'type': 'Address', 'summary': '2.2.2.2', 'xid': 'address-002'},
+            {'type': 'Address', 'summary': '2.2.2.20', 'tag': [{'name': 'one'}]},
+            {'type': 'Incident', 'name': 'incident', 'xid': 'incident-001'},
+        ]
+        responses = ti.create_entities(entities, 'MyOrg', bulk=True)
+        # the status of the entity without an error is unknown since the job had errors
+        assert [r.get('status_code') for r in responses] == [400, None, 400]
+        assert responses[1].get('tags') == [{'status_code': None}]
+
+    def test_status_shared_word(self):
+        """Test an error mentioning a value shared by two entities is not attributed."""
+        md5 = 'a' * 32
+        errors = [{'errorReason': 'Invalid file {}.'.format(md5), 'errorSource': md5}]
+        ti, _ = self.ti([{'status': 'Completed', 'errorCount': 1, 'errors': errors}])
+        entities = [{'type': 'File', 'md5': md5}, {'type': 'File', 'md5': md5, 'sha1': 'b' * 40}]
+        responses = ti.create_entities(entities, 'MyOrg', bulk=True)
+        assert [r.get('status_code') for r in responses] == [None, None]
+
+    def test_status_unknown(self):
+        """Test the status is unknown for errors that can't be attributed to an entity."""
+        entities = [{'type': 'Address', 'summary': '1.1.1.1'}, {'type': 'Host', 'hostname': 'a.b'}]
+
+        errors = [{'errorReason': 'Unknown error.'}]
+        ti, _ = self.ti([{'status': 'Completed', 'errorCount': 1, 'errors': errors}])
+        responses = ti.create_entities(entities, 'MyOrg', bulk=True)
+        assert [r.get('status_code') for r in responses] == [None, None]
+
+        ti, _ = self.ti([{'status': 'Completed'}, {'status': 'Failed'}])
+        responses = ti.create_entities(entities, 'MyOrg', bulk=True)
+        assert [r.get('status_code') for r in responses] == [None, None]
+
+    def test_missing_type(self):
+        """Test an entity without a type is rejected before the batch is built."""
+        ti, batch = self.ti([])
+        with pytest.raises(RuntimeError):
+            ti.create_entities([{'summary': '1.1.1.1'}], 'MyOrg', bulk=True)
+        assert not batch.indicators
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Threat Intel response cache."""
+import time
+
+from tcex.tcex_ti.tcex_ti_cache import TiResponseCache
+from tcex.tcex_ti.tcex_ti_tc_request import TiTcRequest
+
+from ..stubs import StubSession, StubTcEx
+
+
+# pylint: disable=R0201,W0201
+class TestTiCache:
+    """Test the TcEx Threat Intel response cache."""
+
+    def tc_request(self, **kwargs):
+        """Return a TiTcRequest using a stub session and an enabled cache."""
+        cache = TiResponseCache(**kwargs)
+        session = StubSession()
+        session.hooks['response'].append(cache.response_hook)
+        return TiTcRequest(StubTcEx(session, ti_cache=cache))
+
+    def test_hit_miss(self):
+        """Test repeated reads are served from the cache."""
+        tc_request = self.tc_request()
+        r1 = tc_request.single('indicators', 'addresses', '1.1.1.1', owner='MyOrg')
+        r2 = tc_request.single('indicators', 'addresses', '1.1.1.1', owner='MyOrg')
+        tc_request.single('indicators', 'addresses', '1.1.1.1', owner='OtherOrg')
+        assert r1 is r2
+        assert len(tc_request.tcex.session.requests) == 2
+        assert tc_request.tcex.ti_cache.stats == {'hits': 1, 'misses': 2, 'size': 2}
+
+    def test_invalidate_on_write(self):
+        """Test writes to the same unique_id invalidate the cached responses."""
+        tc_request = self.tc_request()
+        tc_request.single('indicators', 'addresses', '1.1.1.1', owner='MyOrg')
+        tc_request.single('indicators', 'hosts', 'example.com', owner='MyOrg')
+        tc_request.add_tag('indicators', 'addresses', '1.1.1.1', 'My Tag', owner='MyOrg')
+        tc_request.single('indicators', 'addresses', '1.1.1.1', owner='MyOrg')
+        tc_request.single('indicators', 'hosts', 'example.com', owner='MyOrg')
+        assert tc_request.tcex.ti_cache.stats == {'hits': 1, 'misses': 3, 'size': 2}
+
+    def test_invalidate_url_indicator(self):
+        """Test writes to a URL indicator invalidate the responses cached for its unique_id."""
+        tc_request = self.tc_request()
+        unique_id = 'http%3A%2F%2Fexample.com%2Fa%3Fb%3D1'
+        tc_request.single('indicators', 'urls', unique_id, owner='MyOrg')
+        tc_request.single('indicators', 'urls', unique_id, owner='MyOrg')
+        assert tc_request.tcex.ti_cache.stats == {'hits': 1, 'misses': 1, 'size': 1}
+
+        tc_request.tcex.session.post('/v2/indicators/urls/{}/tags/foo'.format(unique_id))
+        assert len(tc_request.tcex.ti_cache) == 0
+        tc_request.single('indicators', 'urls', unique_id, owner='MyOrg')
+        assert tc_request.tcex.ti_cache.stats == {'hits': 1, 'misses': 2, 'size': 1}
+
+    def test_lru_ttl(self):
+        """Test the cache size is bounded and entries expire."""
+        cache = TiResponseCache(maxsize=2, ttl=0.05)
+        for unique_id in ['a', 'b', 'c']:
+            cache.set(cache.key('/v2/groups/adversaries/{}'.format(unique_id)), unique_id, 'r')
+        assert cache.get(cache.key('/v2/groups/adversaries/a')) is None
+        assert cache.get(cache.key('/v2/groups/adversaries/c')) == 'r'
+        time.sleep(0.1)
+        assert cache.get(cache.key('/v2/groups/adversaries/c')) is None
+        assert len(cache) == 1
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Threat Intel entity create."""
+import time
+
+import pytest
+
+from tcex.tcex_ti import tcex_ti
+from tcex.tcex_ti.tcex_ti import TcExTi
+
+from ..stubs import StubResponse, StubSession, StubTcEx
+
+
+def children_responder(method, url, params, **kwargs):  # pylint: disable=unused-argument
+    """Return the created address and a status code per child, slowest for the first child."""
+    if url == '/v2/indicators/addresses':
+        return StubResponse(201, {'address': {'ip': '1.1.1.1'}})
+    name = url.rsplit('/', 1)[-1]
+    if url.endswith('/attributes'):
+        name = kwargs.get('json').get('value')
+    if name == 'error':
+        raise RuntimeError('connection reset')
+    # the child name is the status code, earlier children respond later
+    status_code = int(name)
+    time.sleep((210 - status_code) * 0.005)
+    return StubResponse(status_code)
+
+
+# pylint: disable=R0201,W0201
+class TestTiCreateEntity:
+    """Test the TcEx Threat Intel entity create."""
+
+    @staticmethod
+    def ti():
+        """Return a TcExTi instance using a stub session."""
+        tcex = StubTcEx(StubSession(children_responder), indicator_types_data={})
+        return TcExTi(tcex)
+
+    def test_children_order(self):
+        """Test the child results are returned in input order when they complete out of order."""
+        ti = self.ti()
+        entity = {
+            'type': 'Address',
+            'ip': '1.1.1.1',
+            'attribute': [
+                {'type': 'Description', 'value': '201'},
+                {'type': 'Source', 'value': '202'},
+            ],
+            'tag': ['203', '204', '205'],
+            'securityLabel': ['206', '207'],
+        }
+        response = ti.create_entity(entity, 'MyOrg')
+
+        assert response.get('status_code') == 201
+        assert response.get('unique_id') == '1.1.1.1'
+        assert [a.get('status_code') for a in response.get('attributes')] == [201, 202]
+        assert [t.get('status_code') for t in response.get('tags')] == [203, 204, 205]
+        assert [sl.get('status_code') for sl in response.get('security_labels')] == [206, 207]
+        # the create request is sent before the child requests
+        assert len(ti.tcex.session.requests) == 8
+        assert ti.tcex.session.requests[0][1] == '/v2/indicators/addresses'
+
+    def test_children_error(self):
+        """Test an error adding a child is raised to the caller."""
+        entity = {'type': 'Address', 'ip': '1.1.1.1', 'tag': ['201', 'error', '202']}
+        with pytest.raises(RuntimeError, match='connection reset'):
+            self.ti().create_entity(entity, 'MyOrg')
+
+    def test_no_children(self, monkeypatch):
+        """Test no thread pool is used for an entity without child objects."""
+
+        def thread_pool(**kwargs):
+            raise AssertionError('unexpected thread pool {}'.format(kwargs))
+
+        monkeypatch.setattr(tcex_ti, 'ThreadPoolExecutor', thread_pool)
+        ti = self.ti()
+        response = ti.create_entity({'type': 'Address', 'ip': '1.1.1.1'}, 'MyOrg')
+        assert response.get('status_code') == 201
+        assert response.get('tags') == [] and response.get('associations') == []
+        assert len(ti.tcex.session.requests) == 1
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Threat Intel fan out iterator."""
+from types import SimpleNamespace
+
+from tcex.tcex_ti.tcex_ti_fan_out import OwnerBackoff, TiFanOut
+from tcex.tcex_ti.tcex_ti_tc_request import TiTcRequest
+
+from ..stubs import StubResponse, StubSession, StubTcEx
+
+
+def throttle_org_b():
+    """Return a responder returning 3 indicators per owner and throttling Org B once."""
+    throttled = []
+
+    def responder(method, url, params, **kwargs):  # pylint: disable=unused-argument
+        owner = params.get('owner')
+        if owner == 'Org B' and not throttled:
+            throttled.append(url)
+            return StubResponse(429, headers={'Retry-After': '0.05'})
+        indicators = [{'id': i, 'owner': owner} for i in range(params.get('resultStart'), 3)]
+        return StubResponse(200, {'indicator': indicators[: params.get('resultLimit')]})
+
+    return responder
+
+
+class StubTi(object):
+    """TcExTi stand-in returning indicator objects using the stub session."""
+
+    def __init__(self):
+        """Initialize Class Properties."""
+        self.tcex = StubTcEx(StubSession(throttle_org_b()))
+
+    def indicator(self, indicator_type, owner):
+        """Return an indicator object for the owner."""
+        tc_requests = TiTcRequest(self.tcex)
+        tc_requests.result_limit = 2
+
+        def many(filters=None):
+            return tc_requests.many('indicators', None, 'indicator', owner=owner, filters=filters)
+
+        return SimpleNamespace(many=many, tc_requests=tc_requests)
+
+
+# pylint: disable=R0201,W0201
+class TestTiFanOut:
+    """Test the TcEx Threat Intel fan out iterator."""
+
+    def test_fan_out(self):
+        """Test results from all sources are returned tagged with the source."""
+        backoff = OwnerBackoff()
+        sources = [('Address', 'Org A'), ('Address', 'Org B'), ('Host', 'Org C')]
+        results = list(TiFanOut(StubTi(), sources, max_workers=2, backoff=backoff))
+        assert len(results) == 9
+        for source, indicator in results:
+            assert source[1] == indicator.get('owner')
+            assert source[2] is None
+        org_b = [i.get('id') for s, i in results if s == ('Address', 'Org B', None)]
+        assert org_b == [0, 1, 2]
+        assert backoff.backoffs == {'Org B': 1}
+
+    def test_stop_early(self):
+        """Test the consumer can stop before all sources are consumed."""
+        sources = [('Address', 'Org {}'.format(i)) for i in range(10)]
+        results = iter(TiFanOut(StubTi(), sources, max_workers=2, queue_size=1))
+        assert len([next(results) for _ in range(4)]) == 4
+        results.close()
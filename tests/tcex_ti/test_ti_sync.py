@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx Threat Intel incremental sync."""
+from types import SimpleNamespace
+
+import pytest
+
+from tcex.tcex_ti.tcex_ti_sync import TiSync
+
+
+class StubTcRequests(object):
+    """TiTcRequest stand-in serving indicators from a dict."""
+
+    def __init__(self):
+        """Initialize Class Properties."""
+        self.error = None
+        self.indicators = {}
+        self.deleted_indicators = []
+        self.requests = []
+
+    def many(self, main_type, sub_type, api_entity, owner=None, params=None):
+        """Yield the indicators (modified since is not filtered by the stub)."""
+        self.requests.append(('many', sub_type, api_entity, owner, dict(params or {})))
+        for indicator in list(self.indicators.values()):
+            yield indicator
+            if self.error is not None:
+                raise self.error
+
+    def deleted(self, main_type, sub_type, deleted_since, owner=None):
+        """Return the deleted indicators."""
+        self.requests.append(('deleted', sub_type, deleted_since, owner))
+        return self.deleted_indicators
+
+
+# pylint: disable=R0201,W0201
+class TestTiSync:
+    """Test the TcEx Threat Intel incremental sync."""
+
+    @staticmethod
+    def tc_sync(path):
+        """Return a TiSync using the stub requests."""
+        ti = SimpleNamespace(api_type='indicators', api_branch='addresses', api_entity='address')
+        tcex = SimpleNamespace(
+            default_args=SimpleNamespace(tc_temp_path=path),
+            log=SimpleNamespace(debug=lambda msg: None),
+            ti=SimpleNamespace(indicator=lambda indicator_type: ti),
+        )
+        tc_sync = TiSync(tcex, 'My Org', 'Address')
+        tc_sync.tc_requests = StubTcRequests()
+        return tc_sync
+
+    def test_sync(self, tmpdir):
+        """Test the full and incremental syncs."""
+        tc_sync = self.tc_sync(str(tmpdir))
+        tc_sync.tc_requests.indicators = {
+            1: {'id': 1, 'ip': '1.1.1.1', 'rating': 1},
+            2: {'id': 2, 'ip': '2.2.2.2', 'rating': 1},
+        }
+        results = tc_sync.sync()
+        assert results['full'] and results['updated'] == 2
+        assert tc_sync.tc_requests.requests == [('many', 'addresses', 'address', 'My Org', {})]
+        tc_sync.close()
+
+        # the cursor is persisted and used for the next sync
+        tc_sync = self.tc_sync(str(tmpdir))
+        assert tc_sync.cursor == results['cursor']
+        tc_sync.tc_requests.indicators = {2: {'id': 2, 'ip': '2.2.2.2', 'rating': 5}}
+        tc_sync.tc_requests.deleted_indicators = [{'id': 1}, {'id': 3}]
+        results = tc_sync.sync()
+        assert not results['full']
+        assert results['updated'] == 1 and results['deleted'] == 1
+        cursor = tc_sync.tc_requests.requests[1][2]
+        assert tc_sync.tc_requests.requests[0][4] == {'modifiedSince': cursor}
+        assert 1 not in tc_sync and len(tc_sync) == 1
+        assert tc_sync.get(2).get('rating') == 5
+        tc_sync.close()
+
+    def test_failed_full_sync(self, tmpdir):
+        """Test a failed full sync keeps the previous snapshot and cursor."""
+        tc_sync = self.tc_sync(str(tmpdir))
+        tc_sync.tc_requests.indicators = {1: {'id': 1, 'ip': '1.1.1.1', 'rating': 1}}
+        cursor = tc_sync.sync()['cursor']
+
+        indicators = {
+            2: {'id': 2, 'ip': '2.2.2.2', 'rating': 1},
+            3: {'id': 3, 'ip': '3.3.3.3', 'rating': 1},
+        }
+        tc_sync.tc_requests.indicators = indicators
+        tc_sync.tc_requests.error = RuntimeError('connection reset')
+        with pytest.raises(RuntimeError):
+            tc_sync.sync(full=True)
+        tc_sync.close()
+
+        tc_sync = self.tc_sync(str(tmpdir))
+        assert tc_sync.cursor == cursor
+        assert dict(tc_sync.items()) == {'1': {'id': 1, 'ip': '1.1.1.1', 'rating': 1}}
+
+        # a successful full sync replaces the snapshot
+        tc_sync.tc_requests.indicators = indicators
+        results = tc_sync.sync(full=True)
+        assert results['full'] and results['updated'] == 2
+        assert sorted(k for k, _ in tc_sync.items()) == ['2', '3']
+        assert tc_sync.cursor == results['cursor']
+        tc_sync.close()
+        assert not [f for f in tmpdir.listdir() if '.full' in f.basename]
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Test the TcEx JSON Stream Module."""
+import json
+
+import pytest
+
+from tcex.utils import JsonArrayStream
+
+
+# pylint: disable=R0201,W0201
+class TestJsonStream:
+    """Test the TcEx JSON Stream Module."""
+
+    data = {
+        'status': 'Success',
+        'data': {
+            'resultCount': 3,
+            'indicator': [
+                {'id': 1, 'summary': u'éx\\"ample.com'},
+                {'id': 22222, 'attribute': [{'type': 'Description', 'value': None}]},
+                12345,
+            ],
+        },
+        'after': [1, 2],
+    }
+
+    @pytest.mark.parametrize('chunk_size', [1, 3, 64, 65536])
+    def test_array_stream(self, chunk_size):
+        """Test entities are decoded across any chunk boundary."""
+        raw = json.dumps(self.data, indent=2).encode('utf-8')
+        chunks = (raw[i : i + chunk_size] for i in range(0, len(raw), chunk_size))
+        stream = JsonArrayStream(chunks, ['data', 'indicator'])
+        assert list(stream) == self.data.get('data').get('indicator')
+        assert stream.metadata == {
+            'status': 'Success',
+            'data': {'resultCount': 3},
+            'after': [1, 2],
+        }
+
+    def test_missing_array(self):
+        """Test a response without the array yields no entities."""
+        stream = JsonArrayStream([b'{"status": "Failure", "message": "Error"}'], ['data', 'tag'])
+        assert not list(stream)
+        assert stream.metadata.get('status') == 'Failure'
+
+    def test_truncated(self):
+        """Test a truncated response raises an error."""
+        stream = JsonArrayStream([b'{"data": {"tag": [{"name": "a"}, {"name"'], ['data', 'tag'])
+        with pytest.raises(ValueError):
+            list(stream)
+
+    def test_large_entry(self):
+        """Test an entry spanning many chunks is decoded once it is complete."""
+        entry = {'id': 1, 'value': 'a\\"b' * 5000, 'tags': [{'name': '[{'}] * 100}
+        raw = json.dumps({'data': {'indicator': [entry, 2.5]}}).encode('utf-8')
+        chunks = (raw[i : i + 7] for i in range(0, len(raw), 7))
+        stream = JsonArrayStream(chunks, ['data', 'indicator'])
+        decodes = []
+        raw_decode = stream._json_decoder.raw_decode  # pylint: disable=protected-access
+
+        def counting_raw_decode(s, idx=0):
+            decodes.append(idx)
+            return raw_decode(s, idx)
+
+        stream._json_decoder.raw_decode = counting_raw_decode  # pylint: disable=protected-access
+        assert list(stream) == [entry, 2.5]
+        assert len(decodes) < 10
+
+    def test_start(self):
+        """Test the values before the array are decoded without consuming an entry."""
+        raw = b'{"status": "Success", "data": {"tag": [{"name": "a"}, {"name": "b"}]}}'
+        stream = JsonArrayStream([raw[:40], raw[40:]], ['data', 'tag'])
+        assert stream.start()
+        assert stream.metadata.get('status') == 'Success'
+        assert list(stream) == [{'name': 'a'}, {'name': 'b'}]
+
+        stream = JsonArrayStream([b'{"status": "Failure", "data": {"tag": []}}'], ['data', 'tag'])
+        assert not stream.start()
+        assert stream.metadata.get('status') == 'Failure'